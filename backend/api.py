@@ -0,0 +1,227 @@
+# Endpoints del API, comunes a los dos servidores (app.py con Flask y asgi.py
+# con Quart) para que no puedan comportarse distinto. Cada endpoint es un
+# generador: valida la petición, produce la operación que hay que ejecutar
+# (Call) y recibe su resultado (o su excepción), y termina devolviendo
+# (respuesta, código HTTP). Cada servidor sólo lee la petición y ejecuta las
+# operaciones con su runner (ver worker_pool): con respond() de forma
+# bloqueante y con respond_async() desde una corrutina.
+import json
+from collections import namedtuple
+
+import file_reader
+from cli import MAX_BATCH_COMMANDS
+from history import HISTORY_PAGE_SIZE, MAX_HISTORY_PAGE_SIZE
+from worker_pool import new_session_id
+
+# Operación del runner: runner.call(session_id, operation, *args)
+Call = namedtuple('Call', ['session_id', 'operation', 'args'])
+
+def respond(endpoint, call):
+    """
+    Ejecuta el endpoint con call(session_id, operation, *args). Devuelve
+    (respuesta, código HTTP); un error inesperado es un 500.
+    """
+    try:
+        request = next(endpoint)
+        while True:
+            try:
+                result = call(request.session_id, request.operation, *request.args)
+            except Exception as e:
+                request = endpoint.throw(e)
+            else:
+                request = endpoint.send(result)
+    except StopIteration as stop:
+        return stop.value
+    except Exception as e:
+        return {'error': str(e)}, 500
+
+async def respond_async(endpoint, call):
+    """
+    Igual que respond, con call una corrutina
+    """
+    try:
+        request = next(endpoint)
+        while True:
+            try:
+                result = await call(request.session_id, request.operation, *request.args)
+            except Exception as e:
+                request = endpoint.throw(e)
+            else:
+                request = endpoint.send(result)
+    except StopIteration as stop:
+        return stop.value
+    except Exception as e:
+        return {'error': str(e)}, 500
+
+def _session_id(data):
+    """
+    Id de sesión del cuerpo JSON de la petición (uno nuevo si no lo envía), o
+    None si no es un texto: se usa como clave y para elegir el proceso de trabajo
+    """
+    session_id = data.get('session_id')
+    if session_id is not None and not isinstance(session_id, str):
+        return None
+    return new_session_id(session_id)
+
+def execute(data):
+    command = data.get('command', '')
+
+    if not command:
+        return {'error': 'No command provided'}, 400
+
+    # Cada cliente trabaja en su propia sesión (cwd, historial, entorno)
+    session_id = _session_id(data)
+    if session_id is None:
+        return {'error': 'Invalid session_id'}, 400
+
+    # Procesar el comando usando la nueva función integrada
+    result = yield Call(session_id, 'execute', (command,))
+
+    response = {
+        'lexical_analysis': result['lexical_analysis'],
+        'execution_result': result['execution_result'],
+        'cwd': result['cwd'],
+        'session_id': session_id
+    }
+    if 'steps' in result:
+        # Resultado de cada paso de una secuencia (;, &&, ||)
+        response['steps'] = result['steps']
+    if 'job_id' in result:
+        # Número del trabajo lanzado en segundo plano (comando &)
+        response['job_id'] = result['job_id']
+    return response, 200
+
+def execute_batch(data):
+    """
+    Ejecuta una lista ordenada de comandos en una sola petición. Devuelve el
+    resultado de cada comando ejecutado y el cwd final de la sesión.
+    """
+    commands = data.get('commands')
+
+    if not isinstance(commands, list) or not commands:
+        return {'error': 'No commands provided'}, 400
+    if not all(isinstance(command, str) and command for command in commands):
+        return {'error': 'Commands must be non-empty strings'}, 400
+    if len(commands) > MAX_BATCH_COMMANDS:
+        return {'error': f'Too many commands (max {MAX_BATCH_COMMANDS})'}, 400
+
+    session_id = _session_id(data)
+    if session_id is None:
+        return {'error': 'Invalid session_id'}, 400
+    batch = yield Call(session_id, 'batch', (commands, bool(data.get('stop_on_error', False))))
+    results = batch['results']
+
+    return {
+        'results': results,
+        'stopped': len(results) < len(commands),
+        'cwd': batch['cwd'],
+        'session_id': session_id
+    }, 200
+
+def execute_stream(data):
+    """
+    Igual que /execute pero la salida se envía como Server-Sent Events a medida
+    que el comando la produce: un evento 'lexical', varios 'output' y un 'end'
+    final. Devuelve (Call, None) con la operación que el servidor transmite con
+    runner.stream, o (None, (respuesta, código)) si la petición no es válida.
+    """
+    command = data.get('command', '')
+
+    if not command:
+        return None, ({'error': 'No command provided'}, 400)
+
+    session_id = _session_id(data)
+    if session_id is None:
+        return None, ({'error': 'Invalid session_id'}, 400)
+
+    return Call(session_id, 'stream', (command,)), None
+
+def stream_headers(session_id):
+    return {
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # Evitar que un proxy acumule la respuesta
+        'X-Session-Id': session_id
+    }
+
+def sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def history(args):
+    """
+    Historial paginado de la sesión. Con q busca por subcadena (o por prefijo
+    con prefix=1), empezando por lo más reciente: es lo que usa Ctrl-R.
+    """
+    session_id = new_session_id(args.get('session_id'))
+    page = args.get('page', 0, type=int)
+    page_size = min(args.get('page_size', HISTORY_PAGE_SIZE, type=int), MAX_HISTORY_PAGE_SIZE)
+    if page < 0 or page_size <= 0:
+        return {'error': 'Invalid page'}, 400
+
+    result = yield Call(session_id, 'history', (page, page_size, args.get('q'), args.get('prefix') == '1'))
+
+    return dict(result, session_id=session_id), 200
+
+def read_file(args):
+    """
+    Lectura paginada de un archivo de la sesión (para recorrer archivos grandes
+    desde la interfaz). Acepta offset/length, head, tail o el token de la página anterior.
+    """
+    session_id = new_session_id(args.get('session_id'))
+    path = args.get('path')
+    if not path:
+        return {'error': 'No path provided'}, 400
+
+    options = dict(
+        offset=args.get('offset', 0, type=int),
+        length=args.get('length', type=int),
+        head=args.get('head', type=int),
+        tail=args.get('tail', type=int),
+        token=args.get('token'),
+        max_bytes=min(args.get('max_bytes', file_reader.MAX_READ_BYTES, type=int), file_reader.MAX_READ_BYTES))
+    try:
+        result = yield Call(session_id, 'read_file', (path, options))
+    except FileNotFoundError:
+        return {'error': 'Archivo no encontrado.'}, 404
+    except (ValueError, IsADirectoryError) as e:
+        return {'error': str(e)}, 400
+
+    return dict(result, session_id=session_id), 200
+
+def cancel(data):
+    """
+    Cancela el comando en curso de la sesión matando el grupo de cada uno de
+    sus procesos (el shell y todo lo que haya lanzado). Con job_id cancela ese
+    trabajo en segundo plano.
+    """
+    session_id = _session_id(data)
+    if session_id is None:
+        return {'error': 'Invalid session_id'}, 400
+    result = yield Call(session_id, 'cancel', (data.get('job_id'),))
+    if result is None:
+        return {'error': 'Job not found'}, 404
+    return dict(result, session_id=session_id), 200
+
+def list_jobs(args):
+    """
+    Trabajos en segundo plano de la sesión (sin su salida)
+    """
+    session_id = new_session_id(args.get('session_id'))
+    return {
+        'jobs': (yield Call(session_id, 'jobs', ())),
+        'session_id': session_id
+    }, 200
+
+def get_job(args, job_id):
+    """
+    Estado, código de salida y salida de un trabajo. Con since=N sólo se
+    devuelven las líneas a partir de la N: el cliente consulta periódicamente
+    pasando el `next` de la respuesta anterior.
+    """
+    session_id = new_session_id(args.get('session_id'))
+    since = args.get('since', 0, type=int)
+    if since < 0:
+        return {'error': 'Invalid since'}, 400
+    job = yield Call(session_id, 'job', (job_id, since))
+    if job is None:
+        return {'error': 'Job not found'}, 404
+    return dict(job, session_id=session_id), 200
@@ -1,30 +1,71 @@
 # app.py
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from cli import process_command
+import api
+from worker_pool import create_runner
 
 app = Flask(__name__)
 CORS(app)
 
+# Los comandos se ejecutan en el propio proceso o, con TERMINAL_WORKERS=N, en
+# procesos de trabajo (ver worker_pool); aquí sólo se validan y reparten las
+# peticiones. Los endpoints están en api.py, compartidos con asgi.py.
+runner = create_runner()
+
+def respond(endpoint):
+    response, status = api.respond(endpoint, runner.call)
+    return jsonify(response), status
+
 @app.route('/execute', methods=['POST'])
 def execute():
-    try:
-        data = request.get_json()
-        command = data.get('command', '')
-        
-        if not command:
-            return jsonify({'error': 'No command provided'}), 400
-        
-        # Procesar el comando usando la nueva función integrada
-        result = process_command(command)
-        
-        return jsonify({
-            'lexical_analysis': result['lexical_analysis'],
-            'execution_result': result['execution_result']
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return respond(api.execute(request.get_json(silent=True) or {}))
+
+@app.route('/execute/batch', methods=['POST'])
+def execute_batch():
+    return respond(api.execute_batch(request.get_json(silent=True) or {}))
+
+@app.route('/execute/stream', methods=['POST'])
+def execute_stream():
+    call, error = api.execute_stream(request.get_json(silent=True) or {})
+    if error is not None:
+        response, status = error
+        return jsonify(response), status
+
+    def generate():
+        for event, payload in runner.stream(call.session_id, call.operation, *call.args):
+            yield api.sse_event(event, payload)
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers=api.stream_headers(call.session_id))
+
+@app.route('/history', methods=['GET'])
+def history():
+    return respond(api.history(request.args))
+
+@app.route('/file', methods=['GET'])
+def read_file():
+    return respond(api.read_file(request.args))
+
+@app.route('/cancel', methods=['POST'])
+def cancel():
+    return respond(api.cancel(request.get_json(silent=True) or {}))
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    return respond(api.list_jobs(request.args))
+
+@app.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    return respond(api.get_job(request.args, job_id))
+
+@app.route('/stats/cache', methods=['GET'])
+def cache_stats():
+    """
+    Contadores de las cachés (aciertos, fallos, tamaño): análisis léxico, listados de ls
+    y salida de los comandos de solo lectura
+    """
+    return jsonify(runner.cache_stats()), 200
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0')
\ No newline at end of file
+    # Las sesiones no comparten estado de proceso, así que se pueden atender en paralelo
+    app.run(debug=True, host='0.0.0.0', threaded=True)
@@ -0,0 +1,71 @@
+# Servidor ASGI equivalente a app.py: los mismos endpoints (api.py) y el mismo
+# runner (worker_pool, también con TERMINAL_WORKERS=N). En el propio proceso,
+# los comandos de red (ping, dig, netstat, ipconfig) no bloquean un worker
+# mientras esperan: ejecutar con
+#   hypercorn asgi:app --bind 0.0.0.0:5000
+import asyncio
+from quart import Quart, Response, request, jsonify
+from quart_cors import cors
+import api
+from worker_pool import create_runner
+
+app = Quart(__name__)
+app = cors(app)
+
+runner = create_runner()
+
+async def respond(endpoint):
+    response, status = await api.respond_async(endpoint, runner.call_async)
+    return jsonify(response), status
+
+@app.route('/execute', methods=['POST'])
+async def execute():
+    return await respond(api.execute(await request.get_json(silent=True) or {}))
+
+@app.route('/execute/batch', methods=['POST'])
+async def execute_batch():
+    return await respond(api.execute_batch(await request.get_json(silent=True) or {}))
+
+@app.route('/execute/stream', methods=['POST'])
+async def execute_stream():
+    call, error = api.execute_stream(await request.get_json(silent=True) or {})
+    if error is not None:
+        response, status = error
+        return jsonify(response), status
+
+    async def generate():
+        async for event, payload in runner.stream_async(call.session_id, call.operation, *call.args):
+            yield api.sse_event(event, payload)
+
+    return Response(generate(), mimetype='text/event-stream', headers=api.stream_headers(call.session_id))
+
+@app.route('/history', methods=['GET'])
+async def history():
+    return await respond(api.history(request.args))
+
+@app.route('/file', methods=['GET'])
+async def read_file():
+    return await respond(api.read_file(request.args))
+
+@app.route('/cancel', methods=['POST'])
+async def cancel():
+    return await respond(api.cancel(await request.get_json(silent=True) or {}))
+
+@app.route('/jobs', methods=['GET'])
+async def list_jobs():
+    return await respond(api.list_jobs(request.args))
+
+@app.route('/jobs/<int:job_id>', methods=['GET'])
+async def get_job(job_id):
+    return await respond(api.get_job(request.args, job_id))
+
+@app.route('/stats/cache', methods=['GET'])
+async def cache_stats():
+    """
+    Contadores de las cachés (aciertos, fallos, tamaño): análisis léxico, listados de ls
+    y salida de los comandos de solo lectura
+    """
+    return jsonify(await asyncio.to_thread(runner.cache_stats)), 200
+
+if __name__ == '__main__':
+    app.run(debug=True, host='0.0.0.0')
@@ -1,4 +1,5 @@
 import subprocess
+import sys
 import os
 import shutil
 import socket
@@ -6,7 +7,7 @@ import platform
 import re
 from datetime import datetime
 
-from ply import lex, yacc
+import parse_tables
 
 # Lexer for command parsing
 tokens = (
@@ -44,7 +45,7 @@ def t_error(t):
     print(f"Illegal character '{t.value[0]}'")
     t.lexer.skip(1)
 
-lexer = lex.lex()
+lexer = parse_tables.build_lexer(sys.modules[__name__], 'ask')
 
 # Parsing rules
 def p_command(p):
@@ -75,7 +76,7 @@ def p_error(p):
     else:
         print("Syntax error at EOF")
 
-parser = yacc.yacc()
+parser = parse_tables.build_parser(sys.modules[__name__], 'ask')
 
 # Lista global para almacenar el historial de comandos
 command_history = []
@@ -0,0 +1,149 @@
+import asyncio
+
+import cli
+import jobs
+import output_cache
+import pipeline
+import procs
+import registry
+import sequence
+
+def _execute_tracked(parsed_command, session, history):
+    # session.lock ya lo tiene la corrutina (locked_async): aquí no se vuelve a tomar
+    with procs.track_processes(session.running):
+        return cli.execute_with_status(parsed_command, session, history)
+
+async def execute_command_async(parsed_command, session=None):
+    """
+    Versión asíncrona de cli.execute_command. Los comandos con variante asíncrona
+    (los de red usan sockets asyncio o asyncio.create_subprocess_exec) no
+    ocupan un hilo, así que cientos de ping/dig pueden estar en curso a la vez.
+    """
+    session = session or cli.default_session
+    if isinstance(parsed_command, jobs.Background):
+        # Lanzar el trabajo no bloquea: vuelve en el acto
+        return cli.execute_command(parsed_command, session)
+    if isinstance(parsed_command, sequence.Sequence):
+        return sequence.join_outputs(await execute_sequence_async(parsed_command, session))
+    return (await execute_with_status_async(parsed_command, session))[0]
+
+async def execute_with_status_async(parsed_command, session, history=True):
+    """
+    Versión asíncrona de cli.execute_with_status: devuelve (salida, si falló)
+    """
+    command, args = (None, None) if isinstance(parsed_command, pipeline.Pipeline) else parsed_command
+
+    spec = registry.get(command)
+    if spec is not None and spec.async_handler is not None:
+        if history:
+            cli.record_history(session, command, args)
+        timeout = spec.timeout or procs.DEFAULT_LIMITS.timeout
+
+        async def run(args, session):
+            usage_error = spec.check_args(args)
+            if usage_error:
+                raise registry.CommandError(usage_error)
+            try:
+                return await asyncio.wait_for(spec.async_handler(args, session), timeout)
+            except asyncio.TimeoutError:
+                raise registry.CommandError(procs.timeout_message(timeout))
+
+        try:
+            if spec.cache is not None:
+                output = await output_cache.run_cached_async(spec, args, session, run)
+            else:
+                output = await run(args, session)
+        except Exception as e:
+            return str(e), True
+        return output, False
+
+    # El resto de comandos (sistema de archivos, shell, tuberías) son rápidos o dependen del
+    # estado de la sesión: se ejecutan en un hilo para no bloquear el event loop
+    return await asyncio.to_thread(_execute_tracked, parsed_command, session, history)
+
+async def execute_sequence_async(parsed_sequence, session):
+    """
+    Versión asíncrona de cli.execute_sequence. Cada paso espera a que termine
+    el anterior; los de red no ocupan un hilo mientras tanto.
+    """
+    session.history.append(sequence.format_sequence(parsed_sequence))
+    results = []
+    last_failed = False
+    for step in parsed_sequence.steps:
+        if not sequence.should_run(step.operator, last_failed):
+            results.append(sequence.step_result(step, "", False, True, session.cwd))
+            continue
+        try:
+            output, last_failed = await execute_with_status_async(step.command, session, history=False)
+        except Exception as e:
+            output, last_failed = str(e), True
+        results.append(sequence.step_result(step, output, last_failed, False, session.cwd))
+    return results
+
+async def process_command_async(command_string, session=None):
+    """
+    Equivalente asíncrono de cli.process_command
+    """
+    session = session or cli.default_session
+    # Como en cli.process_command: la sesión queda bloqueada mientras dura el comando y
+    # sus procesos (también los de asyncio) quedan anotados para /cancel
+    async with session.locked_async():
+        with procs.track_processes(session.running):
+            return await _process_command_async(command_string, session)
+
+async def _process_command_async(command_string, session):
+    try:
+        lexical_analysis, parsed_command = cli.analyze_cached(command_string)
+
+        steps = None
+        job = None
+        if isinstance(parsed_command, jobs.Background):
+            job = cli.submit_background(parsed_command, session)
+            failed = isinstance(job, str)
+            execution_result = job if failed else job.announcement()
+        elif isinstance(parsed_command, sequence.Sequence):
+            steps = await execute_sequence_async(parsed_command, session)
+            execution_result = sequence.join_outputs(steps)
+            failed = sequence.failed(steps)
+        elif parsed_command:
+            execution_result, failed = await execute_with_status_async(parsed_command, session)
+        else:
+            execution_result = "Error: No se pudo parsear el comando correctamente."
+            failed = True
+
+        result = {
+            "lexical_analysis": lexical_analysis,
+            "execution_result": execution_result,
+            "cwd": session.cwd,
+            "error": failed
+        }
+        if steps is not None:
+            result["steps"] = steps
+        if isinstance(job, jobs.Job):
+            result["job_id"] = job.id
+        return result
+
+    except Exception as e:
+        return {
+            "lexical_analysis": [],
+            "execution_result": f"Error: {str(e)}",
+            "cwd": session.cwd,
+            "error": True
+        }
+
+async def process_batch_async(command_strings, session=None, stop_on_error=False):
+    """
+    Equivalente asíncrono de cli.process_batch. Los comandos se ejecutan en
+    orden, cada uno después de que termine el anterior.
+    """
+    session = session or cli.default_session
+    results = []
+    # La sesión queda bloqueada durante todo el lote: ningún otro comando se intercala
+    async with session.locked_async():
+        for command_string in command_strings:
+            result = await process_command_async(command_string, session)
+            result["command"] = command_string
+            results.append(result)
+            if stop_on_error and result["error"]:
+                break
+    return results
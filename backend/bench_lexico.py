@@ -0,0 +1,58 @@
+import sys
+import time
+
+import table_lexico
+
+# Comandos representativos de lo que escribe un usuario en el terminal
+CORPUS = [
+    "ls",
+    "ls -la /home/usuario/documentos",
+    "cd ../proyectos/web",
+    "cat README.md",
+    "mkdir nueva_carpeta",
+    "cp informe.pdf /tmp/copia.pdf",
+    "mv foto_2024.jpg ./imagenes/",
+    "rm -rf build/*.o",
+    "zip archivo.zip src/main.py src/util.py",
+    "unzip paquete.zip",
+    "echo \"Hola mundo\" > saludo.txt",
+    "echo $HOME | grep usuario",
+    "ping 192.168.1.1",
+    "ping google.com",
+    "dig example.org MX",
+    "netstat :8080 tcp",
+    "ipconfig",
+    "ssh admin@servidor.local",
+    "chmod 755 script.sh",
+    "curl https://api.github.com/repos",
+    "touch 2024-01-15 12:30:00 registro.log",
+    "history",
+]
+
+def run(engine, lines, repeat):
+    tokenize = table_lexico.tokenize
+    count = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for line in lines:
+            count += len(tokenize(line, engine))
+    return count, time.perf_counter() - start
+
+def main(repeat=2000):
+    # Ambos motores deben producir exactamente los mismos tokens
+    for line in CORPUS:
+        expected = table_lexico.tokenize(line, 'ply')
+        actual = table_lexico.tokenize(line, 'regex')
+        if expected != actual:
+            raise AssertionError(f"Resultados distintos para {line!r}:\n  ply:   {expected}\n  regex: {actual}")
+
+    results = {}
+    for engine in table_lexico.ENGINES:
+        count, elapsed = run(engine, CORPUS, repeat)
+        results[engine] = count / elapsed
+        print(f"{engine:>6}: {count} tokens en {elapsed:.3f}s -> {results[engine]:,.0f} tokens/s")
+    print(f"Aceleración regex/ply: {results['regex'] / results['ply']:.2f}x")
+
+# Uso: python bench_lexico.py [repeticiones]
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
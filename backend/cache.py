@@ -0,0 +1,76 @@
+import sys
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Caché LRU limitada por número de entradas y por tamaño aproximado en bytes.
+    `sizeof(key, value)` estima lo que ocupa cada entrada; al superar
+    cualquiera de los dos límites se descartan las entradas menos usadas.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=4 * 1024 * 1024, sizeof=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda key, value: sys.getsizeof(key) + sys.getsizeof(value))
+        self._data = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None, valid=None):
+        """
+        Valor de la clave. Si valid(valor) es falso (una entrada caducada, por
+        ejemplo) la búsqueda cuenta como fallo y la entrada se descarta.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and valid is not None and not valid(item[0]):
+                del self._data[key]
+                self._bytes -= item[1]
+                item = None
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = self.sizeof(key, value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return  # No cabe: no vale la pena vaciar la caché por ella
+            self._data[key] = (value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
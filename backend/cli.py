@@ -1,600 +1,483 @@
-import subprocess
+import sys
 import os
-import shutil
 import socket
-import platform
-import re
 from datetime import datetime
 import table_lexico  # Importamos el módulo de análisis léxico
+import commands  # Registra los comandos disponibles
+import jobs
+import output_cache
+import pipeline
+import procs
+import registry
+import sequence
+import streaming
+from session import Session
+from cache import LRUCache
 
-from ply import lex, yacc
+import parse_tables
+from ply.lex import LexToken
 
-# Lexer for command parsing
+# Tokens de la gramática. No hay un lexer propio: los tokens se obtienen de
+# table_lexico (una sola pasada por comando) y se traducen con TokenStream
 tokens = (
     'COMMAND',
-    'ARGUMENT'
+    'ARGUMENT',
+    'PIPE',
+    'REDIRECT',
+    'AND',
+    'OR',
+    'SEMI',
+    'AMP'
 )
 
-# Lista de comandos válidos actualizada
-commands_list = [
-    'cat', 'ls', 'echo', 'mkdir', 'pwd', 'cd', 'help', 
-    'history', 'clear', 'cls', 'unzip', 'rm', 'mv', 'cp', 'zip',
-    'ping', 'ipconfig', 'netstat', 'dig'  # Agregados comandos de red
-]
-
-# Define the command tokens
-def t_COMMAND(t):
-    r'[a-zA-Z][a-zA-Z0-9]*'  # Permite letras y números, pero debe comenzar con letra
-    if t.value in commands_list:
-        return t
-    else:
-        t.type = 'ARGUMENT'  # Si no es un comando válido, debe ser un argumento
-        return t
+# Tokens de table_lexico que son operadores por sí mismos (nunca forman parte de una palabra)
+OPERATOR_TOKENS = {'PIPE': 'PIPE', 'REDIRECCION': 'REDIRECT'}
+
+# Valores de OPERADOR que separan comandos (|| llega como dos PIPE seguidos)
+# y & final, que lanza el comando en segundo plano
+SEQUENCE_OPERATORS = {';': 'SEMI', '&&': 'AND', '&': 'AMP'}
+
+# Operadores tras los que empieza un comando nuevo
+STAGE_SEPARATORS = {'PIPE', 'AND', 'OR', 'SEMI'}
+
+class TokenStream:
+    """
+    Alimenta al parser con los tokens de table_lexico. Los tokens contiguos (sin
+    espacios entre ellos) forman una palabra, igual que hacía el lexer de cli:
+    la primera palabra de cada etapa es COMMAND si es un comando registrado y el
+    resto ARGUMENT, con el texto original (comillas incluidas) como valor.
+    `|`, `||`, `&&`, `;`, `&` y las redirecciones son tokens propios aunque vayan
+    pegados a una palabra; un descriptor pegado a la redirección (2>) forma
+    parte de ella.
+    """
 
-# Define the argument tokens
-t_ARGUMENT = r'[a-zA-Z0-9./_\-~@:]+|"[^"]*"|\'[^\']*\''  # Cualquier secuencia no separada por espacios (incluye puntos, guiones, etc.)
+    def __init__(self, command_string, lexical_tokens):
+        self.lineno = 1
+        self.lexpos = 0
+        self._tokens = iter(self._words(command_string, lexical_tokens))
 
-# Ignored characters
-t_ignore = ' \t'
+    @staticmethod
+    def _words(command_string, lexical_tokens):
+        words = []  # [inicio, fin, tipo]
+        for tok in lexical_tokens:
+            operator = OPERATOR_TOKENS.get(tok.type)
+            if tok.type == 'OPERADOR':
+                operator = SEQUENCE_OPERATORS.get(tok.value)
+            previous = words[-1] if words else None
+            if operator == 'PIPE' and previous and previous[2] == 'PIPE' and previous[1] == tok.start:
+                previous[1:] = [tok.end, 'OR']
+            elif operator == 'REDIRECT' and previous and previous[2] is None and previous[1] == tok.start \
+                    and command_string[previous[0]:previous[1]] in ('1', '2'):
+                previous[1:] = [tok.end, operator]
+            elif operator is None and previous and previous[2] is None and tok.start == previous[1]:
+                previous[1] = tok.end
+            else:
+                words.append([tok.start, tok.end, operator])
 
-def t_newline(t):
-    r'\n+'
-    t.lexer.lineno += len(t.value)
+        grammar_tokens = []
+        stage_start = True
+        for start, end, operator in words:
+            grammar_token = LexToken()
+            grammar_token.value = command_string[start:end]
+            if operator is not None:
+                grammar_token.type = operator
+            elif stage_start and grammar_token.value in registry.registry:
+                grammar_token.type = 'COMMAND'
+            else:
+                grammar_token.type = 'ARGUMENT'
+            stage_start = operator in STAGE_SEPARATORS
+            grammar_token.lineno = 1
+            grammar_token.lexpos = start
+            grammar_tokens.append(grammar_token)
+        return grammar_tokens
 
-def t_error(t):
-    print(f"Illegal character '{t.value[0]}'")
-    t.lexer.skip(1)
+    def input(self, data):
+        pass
 
-lexer = lex.lex()
+    def token(self):
+        tok = next(self._tokens, None)
+        if tok is not None:
+            self.lexpos = tok.lexpos
+        return tok
 
 # Parsing rules
-def p_command(p):
+def p_command_line(p):
     '''
-    command : COMMAND
-            | COMMAND ARGUMENTS
+    command_line : sequence
+                 | sequence SEMI
+                 | sequence AMP
     '''
-    if len(p) > 2:
-        print(f"Command: {p[1]}, Arguments: {p[2]}")
-        p[0] = (p[1], p[2])
+    steps = p[1]
+    if len(p) == 3 and p[2] == '&':
+        command = steps[0].command if len(steps) == 1 else sequence.Sequence(tuple(steps))
+        p[0] = jobs.Background(command)
+        print(f"Background: {sequence.format_command(command)}")
+        return
+    if len(steps) > 1:
+        p[0] = sequence.Sequence(tuple(steps))
+        print(f"Sequence: {sequence.format_sequence(p[0])}")
+        return
+    command = steps[0].command
+    if isinstance(command, pipeline.Pipeline):
+        print(f"Pipeline: {pipeline.format_pipeline(command)}")
+    elif command[1]:
+        print(f"Command: {command[0]}, Arguments: {command[1]}")
     else:
-        print(f"Command: {p[1]}, No arguments")
-        p[0] = (p[1], [])
+        print(f"Command: {command[0]}, No arguments")
+    p[0] = command
+
+def p_sequence(p):
+    '''
+    sequence : pipeline
+             | sequence SEMI pipeline
+             | sequence AND pipeline
+             | sequence OR pipeline
+    '''
+    if len(p) == 2:
+        p[0] = [sequence.Step(None, _command_node(p[1]))]
+    else:
+        p[0] = p[1] + [sequence.Step(p[2], _command_node(p[3]))]
+
+def _command_node(stages):
+    """
+    Un comando simple sin redirecciones queda como (comando, argumentos), como
+    siempre; el resto como pipeline.Pipeline
+    """
+    if len(stages) == 1 and not stages[0].redirects:
+        command, args, _ = stages[0]
+        return (command, list(args))
+    return pipeline.Pipeline(tuple(stages))
+
+def p_pipeline(p):
+    '''
+    pipeline : stage
+             | pipeline PIPE stage
+    '''
+    p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
 
-def p_arguments(p):
+def p_stage(p):
     '''
-    ARGUMENTS : ARGUMENT
-              | ARGUMENT ARGUMENTS
+    stage : COMMAND
+          | ARGUMENT
+          | stage ARGUMENT
+          | stage REDIRECT ARGUMENT
     '''
-    if len(p) > 2:
-        p[0] = [p[1]] + p[2]
+    if len(p) == 2:
+        # Los comandos no registrados se ejecutan como programas externos
+        p[0] = pipeline.Stage(p[1], (), ())
+    elif len(p) == 3:
+        p[0] = p[1]._replace(args=p[1].args + (p[2],))
     else:
-        p[0] = [p[1]]
+        p[0] = p[1]._replace(redirects=p[1].redirects + (pipeline.parse_redirect(p[2], p[3]),))
 
 def p_error(p):
     if p:
         print(f"Syntax error at '{p.value}'")
+        # Sin recuperación: descartar el resto para que `| ls` no se ejecute como `ls`
+        while parser.token() is not None:
+            pass
+        parser.restart()
     else:
         print("Syntax error at EOF")
 
-parser = yacc.yacc()
+parser = parse_tables.build_parser(sys.modules[__name__], 'cli')
 
-# Lista global para almacenar el historial de comandos
-command_history = []
+# Sesión usada cuando no se indica ninguna (CLI local, scripts de prueba)
+default_session = Session('local')
 
-def execute_command(parsed_command):
-    command, args = parsed_command
+def record_history(session, command, args):
+    """
+    Guarda el comando en el historial de la sesión
+    """
     full_command = f"{command} {' '.join(args)}"
+    session.history.append(full_command)
+    return full_command
+
+def execute_command(parsed_command, session=None):
+    session = session or default_session
+    if isinstance(parsed_command, jobs.Background):
+        job = submit_background(parsed_command, session)
+        return job if isinstance(job, str) else job.announcement()
+    if isinstance(parsed_command, sequence.Sequence):
+        return sequence.join_outputs(execute_sequence(parsed_command, session))
+    return execute_with_status(parsed_command, session)[0]
+
+def execute_with_status(parsed_command, session, history=True):
+    """
+    Ejecuta un comando simple o una tubería y devuelve (salida, si falló). Los
+    comandos internos fallan si lanzan una excepción (registry.CommandError con
+    su salida); los externos y las tuberías, según el código de salida.
+    """
+    if isinstance(parsed_command, pipeline.Pipeline):
+        if history:
+            session.history.append(pipeline.format_pipeline(parsed_command))
+        status = {}
+        try:
+            output, truncated = _collect(pipeline.run_pipeline(parsed_command, session, status))
+        except Exception as e:
+            return str(e), True
+        return output, truncated or status.get('failed', True)
+
+    command, args = parsed_command
     
-    # Guardar el comando en el historial
-    command_history.append(full_command)
+    if history:
+        full_command = record_history(session, command, args)
+    else:
+        full_command = f"{command} {' '.join(args)}"
     
     try:
-        if command == "cd":
-            if not args:
-                # Si no hay argumentos, ir al directorio home del usuario
-                home_dir = os.path.expanduser("~")
-                os.chdir(home_dir)
-                return f"Changed directory to {home_dir}"
-            
-            path = args[0]
-            # Manejar cd .. y otras rutas relativas
-            if path == "..":
-                os.chdir("..")
-            elif path.startswith("~"):
-                # Expandir ~ al directorio home del usuario
-                expanded_path = os.path.expanduser(path)
-                os.chdir(expanded_path)
-            else:
-                os.chdir(path)
-            return f"Changed directory to {os.getcwd()}"
-        
-        elif command == "ping":
-            if not args:
-                return "Error: Debe especificar un host"
-                
-            # Unir todos los argumentos para formar el nombre del host completo
-            host = ''.join(args)
-            
-            try:
-                # Ejecutar el comando ping
-                if platform.system().lower() == "windows":
-                    process = subprocess.Popen(['ping', host], 
-                                            stdout=subprocess.PIPE, 
-                                            stderr=subprocess.PIPE)
-                else:
-                    # En sistemas Unix/Linux, usar -c 4 para limitar a 4 pings
-                    process = subprocess.Popen(['ping', '-c', '4', host], 
-                                            stdout=subprocess.PIPE, 
-                                            stderr=subprocess.PIPE)
-                    
-                output, error = process.communicate()
-                
-                if process.returncode == 0:
-                    return output.decode('utf-8', errors='ignore')
-                else:
-                    return f"Error al hacer ping a {host}: {error.decode('utf-8', errors='ignore')}"
-                    
-            except Exception as e:
-                return f"Error al ejecutar ping: {str(e)}"
-
-        elif command == "ipconfig":
-            try:
-                # Adaptar el comando según el sistema operativo
-                if os.name == "nt":  # Windows
-                    result = subprocess.run(["ipconfig"], capture_output=True, text=True)
-                else:  # Linux/Unix
-                    # Intentar ifconfig primero, si no está disponible usar ip addr
-                    try:
-                        result = subprocess.run(["ifconfig"], capture_output=True, text=True)
-                    except FileNotFoundError:
-                        result = subprocess.run(["ip", "addr"], capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    # Formatear la salida para que sea más legible
-                    output = result.stdout
-                    # Eliminar líneas vacías múltiples
-                    output = re.sub(r'\n\s*\n', '\n\n', output)
-                    return output
-                else:
-                    return f"Error al obtener información de red: {result.stderr}"
-            except Exception as e:
-                return f"Error al ejecutar el comando: {str(e)}"
-
-        elif command == "netstat":
-            try:
-                # Adaptar el comando según el sistema operativo
-                if os.name == "nt":  # Windows
-                    result = subprocess.run(["netstat", "-an"], capture_output=True, text=True)
-                else:  # Linux/Unix
-                    # En Linux, añadimos -tulpn para mostrar servicios y PID
-                    result = subprocess.run(["netstat", "-tulpn"], capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    # Formatear la salida para que sea más legible
-                    output = result.stdout
-                    # Filtrar y ordenar la información más relevante
-                    lines = output.split('\n')
-                    # Mantener el encabezado y las conexiones activas
-                    filtered_lines = [line for line in lines if line.strip() and 
-                                    ('Proto' in line or 'ESTABLISHED' in line or 'LISTEN' in line)]
-                    return '\n'.join(filtered_lines)
-                else:
-                    return f"Error al obtener estadísticas de red: {result.stderr}"
-            except Exception as e:
-                return f"Error al ejecutar netstat: {str(e)}"
-
-        elif command == "dig":
-            if not args:
-                return "Error: Debe especificar un dominio. Ejemplo: dig google.com"
-            
-            # Unir todos los argumentos para formar el nombre del host completo
-            domain = ''.join(args)
-            record_type = "A"  # Tipo de registro predeterminado
-            
-            # Si se especifica un tipo de registro
-            if len(args) > 1 and args[-1].upper() in ["A", "AAAA", "MX", "NS", "TXT", "SOA"]:
-                record_type = args[-1].upper()
-                domain = ''.join(args[:-1])
-            
-            try:
-                # En Windows, no existe dig, usamos nslookup
-                if os.name == "nt":
-                    if record_type == "A":
-                        result = subprocess.run(["nslookup", domain], capture_output=True, text=True)
-                    else:
-                        result = subprocess.run(["nslookup", "-type=" + record_type, domain], 
-                                                capture_output=True, text=True)
-                else:
-                    # En Linux/Unix, intentar usar dig
-                    try:
-                        result = subprocess.run(["dig", domain, record_type], 
-                                                capture_output=True, text=True)
-                    except FileNotFoundError:
-                        # Si dig no está disponible, usar nslookup como alternativa
-                        result = subprocess.run(["nslookup", "-type=" + record_type, domain], 
-                                                capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    # Formatear la salida para que sea más legible
-                    output = result.stdout
-                    # Filtrar las líneas más relevantes
-                    lines = output.split('\n')
-                    filtered_lines = [line for line in lines if line.strip() and 
-                                    not line.startswith(';') and 
-                                    not line.startswith('_')]
-                    return '\n'.join(filtered_lines)
-                else:
-                    return f"Error al realizar la búsqueda DNS: {result.stderr}"
-            except Exception as e:
-                return f"Error al ejecutar la búsqueda DNS: {str(e)}"
-        
-        elif command == "mv":
-            if len(args) < 2:
-                return "Error: mv requiere origen y destino"
-            
-            # Procesar argumentos para origen y destino
-            source_args = []
-            dest_args = []
-            found_source = False
-            
-            for i, arg in enumerate(args):
-                if not found_source:
-                    source_args.append(arg)
-                    if '.' in ''.join(source_args):  # Buscamos si encontramos una extensión
-                        found_source = True
+        spec = registry.get(command)
+        if spec is not None:
+            # Despacho directo al manejador registrado
+            # Tiempo máximo propio del comando para los procesos que lance
+            with procs.limited(timeout=spec.timeout):
+                if spec.cache is not None:
+                    output = output_cache.run_cached(spec, args, session, spec.run)
                 else:
-                    dest_args.append(arg)
-            
-            # Unir los argumentos para formar los nombres completos
-            source = ''.join(source_args)
-            destination = ''.join(dest_args)
-            
-            try:
-                # Expandir ~ si está presente en las rutas
-                if source.startswith('~'):
-                    source = os.path.expanduser(source)
-                if destination.startswith('~'):
-                    destination = os.path.expanduser(destination)
-                
-                # Realizar el movimiento/renombrado
-                shutil.move(source, destination)
-                return f"Movido/renombrado: {source} -> {destination}"
-            except FileNotFoundError:
-                return f"Error: Archivo o directorio no encontrado: {source}"
-            except PermissionError:
-                return "Error: Sin permisos suficientes"
-            except shutil.Error as e:
-                return f"Error al mover/renombrar: {str(e)}"
-                
-        elif command == "cp":
-            if len(args) < 2:
-                return "Error: cp requiere origen y destino"
-            
-            recursive = False
-            start_idx = 0
-            
-            # Verificar si hay flag -r
-            if args[0].startswith('-') and 'r' in args[0]:
-                recursive = True
-                start_idx += 1
-                
-            if len(args) < start_idx + 2:
-                return "Error: cp requiere origen y destino"
-            
-            # Procesar argumentos para origen y destino
-            source_args = []
-            dest_args = []
-            found_source = False
-            
-            for i, arg in enumerate(args[start_idx:], start=start_idx):
-                if not found_source:
-                    source_args.append(arg)
-                    if '.' in ''.join(source_args):  # Buscamos si encontramos una extensión
-                        found_source = True
-                else:
-                    dest_args.append(arg)
-            
-            # Unir los argumentos para formar los nombres completos
-            source = ''.join(source_args)
-            destination = ''.join(dest_args)
-            
-            if not '.' in destination:
-                return "Error: El archivo destino debe tener una extensión"
-            
-            try:
-                # Expandir ~ si está presente
-                if source.startswith('~'):
-                    source = os.path.expanduser(source)
-                if destination.startswith('~'):
-                    destination = os.path.expanduser(destination)
-                
-                if os.path.isdir(source):
-                    if not recursive:
-                        return "Error: Para copiar directorios use -r"
-                    shutil.copytree(source, destination)
-                    return f"Directorio copiado: {source} -> {destination}"
-                else:
-                    shutil.copy2(source, destination)
-                    return f"Archivo copiado: {source} -> {destination}"
-            except FileNotFoundError:
-                return f"Error: Archivo o directorio no encontrado: {source}"
-            except PermissionError:
-                return "Error: Sin permisos suficientes"
-            except shutil.Error as e:
-                return f"Error al copiar: {str(e)}"
-                        
-        elif command == "zip":
-            if not args:
-                return "Error: Debe especificar nombre del archivo zip y archivos a comprimir"
-            
-            # Procesar argumentos
-            recursive = False
-            start_idx = 0
-            
-            # Verificar flags si existen
-            if args[0].startswith('-'):
-                if 'r' in args[0]:
-                    recursive = True
-                start_idx += 1
-            
-            # Necesitamos al menos el nombre del zip y un archivo para comprimir
-            if len(args) < start_idx + 2:
-                return "Error: Debe especificar nombre del archivo zip y archivos a comprimir"
-            
-            # Obtener el nombre del archivo zip (primer argumento o segundo si hay flag)
-            zip_args = []
-            file_args = []
-            found_zip = False
-            
-            for i, arg in enumerate(args[start_idx:], start=start_idx):
-                if not found_zip:
-                    zip_args.append(arg)
-                    if '.zip' in ''.join(zip_args):
-                        found_zip = True
-                else:
-                    file_args.append(arg)
-            
-            # Unir los argumentos para formar los nombres completos
-            zip_name = ''.join(zip_args)
-            if not zip_name.endswith('.zip'):
-                zip_name += '.zip'
-            
-            # Unir los argumentos para el archivo a comprimir
-            files_to_zip = ''.join(file_args)
-            
-            try:
-                import zipfile
-                
-                with zipfile.ZipFile(zip_name, 'w', compression=zipfile.ZIP_DEFLATED) as zipf:
-                    if os.path.isdir(files_to_zip):
-                        if not recursive:
-                            return f"Error: {files_to_zip} es un directorio. Use -r para comprimir directorios"
-                        for root, dirs, files in os.walk(files_to_zip):
-                            for file in files:
-                                full_path = os.path.join(root, file)
-                                arcname = os.path.relpath(full_path, os.path.dirname(files_to_zip))
-                                zipf.write(full_path, arcname)
-                    else:
-                        if os.path.exists(files_to_zip):
-                            zipf.write(files_to_zip, os.path.basename(files_to_zip))
-                        else:
-                            return f"Error: Archivo no encontrado: {files_to_zip}"
-                
-                return f"Archivo zip creado exitosamente: {zip_name}"
-                
-            except FileNotFoundError:
-                return "Error: Uno o más archivos no encontrados"
-            except PermissionError:
-                return "Error: Sin permisos suficientes"
-            except Exception as e:
-                return f"Error al crear el archivo zip: {str(e)}"
-        
-        elif command == "unzip":
-            if not args:
-                return "Error: Debe especificar un archivo zip"
-            
-            # Procesar argumentos para manejar la opción -d
-            zip_file = None
-            extract_dir = None
-            i = 0
-            temp_args = []  # Para almacenar temporalmente los argumentos del nombre del archivo
-            
-            while i < len(args):
-                if args[i] == '-d':
-                    # Si encontramos -d, procesamos el directorio y salimos del bucle
-                    if i + 1 >= len(args):
-                        return "Error: La opción -d requiere especificar un directorio"
-                    extract_dir = ''.join(args[i+1:])
-                    break
-                else:
-                    # Acumulamos los argumentos hasta encontrar -d
-                    temp_args.append(args[i])
-                i += 1
-            
-            # Unir todos los argumentos acumulados para formar el nombre del archivo
-            zip_file = ''.join(temp_args) if temp_args else None
-            
-            if not zip_file:
-                return "Error: Debe especificar un archivo zip"
-            
-            if not zip_file.endswith('.zip'):
-                return "Error: El archivo debe tener extensión .zip"
-            
-            try:
-                import zipfile
-                
-                # Si se especificó un directorio de destino, verificar/crear el directorio
-                if extract_dir:
-                    # Expandir ~ si está presente
-                    if extract_dir.startswith('~'):
-                        extract_dir = os.path.expanduser(extract_dir)
-                    
-                    # Crear el directorio si no existe
-                    os.makedirs(extract_dir, exist_ok=True)
-                
-                with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-                    # Extraer al directorio especificado o al actual si no se especificó
-                    zip_ref.extractall(path=extract_dir)
-                
-                extract_location = extract_dir if extract_dir else "directorio actual"
-                return f"Archivo {zip_file} descomprimido exitosamente en {extract_location}"
-                
-            except zipfile.BadZipFile:
-                return "Error: Archivo zip corrupto o inválido"
-            except FileNotFoundError:
-                return "Error: Archivo zip no encontrado"
-            except PermissionError:
-                return "Error: Sin permisos suficientes para extraer en el directorio especificado"
-                
-        elif command == "rm":
-            if not args:
-                return "Error: Debe especificar al menos un archivo o directorio"
-            
-            # Procesar flags
-            recursive = False
-            force = False
-            targets = []
-            
-            for arg in args:
-                if arg.startswith('-'):
-                    if 'r' in arg:
-                        recursive = True
-                    if 'f' in arg:
-                        force = True
-                else:
-                    targets.append(arg)
-            
-            if not targets:
-                return "Error: Debe especificar al menos un archivo o directorio para eliminar"
-            
-            # Unir los argumentos para formar los nombres completos
-            targets = [''.join(targets)]
-            
-            results = []
-            for target in targets:
-                try:
-                    if os.path.isdir(target):
-                        if not recursive:
-                            results.append(f"Error: {target} es un directorio. Use -r para eliminar directorios")
-                            continue
-                        shutil.rmtree(target, ignore_errors=force)
-                    else:
-                        os.remove(target)
-                    results.append(f"Eliminado: {target}")
-                except FileNotFoundError:
-                    if not force:
-                        results.append(f"Error: {target} no encontrado")
-                except PermissionError:
-                    if not force:
-                        results.append(f"Error: Sin permisos para eliminar {target}")
-            
-            return "\n".join(results)
-        
-        elif command == "help":
-            return (
-                "Comandos disponibles:\n"
-                "help - Muestra la lista de comandos.\n"
-                "ls - Lista archivos en el directorio actual.\n"
-                "echo - Muestra texto. Ejemplo: echo \"Hola Mundo\"\n"
-                "cat - Muestra el contenido de un archivo. Ejemplo: cat archivo.txt\n"
-                "mkdir - Crea un nuevo directorio.\n"
-                "pwd - Muestra el directorio actual.\n"
-                "cd - Cambia el directorio actual. Ejemplo: cd /ruta/destino\n"
-                "unzip - Extrae archivos de un zip. Ejemplo: unzip archivo.zip [-d directorio]\n"
-                "rm - Elimina archivos o directorios. Ejemplo: rm archivo.txt o rm -rf directorio\n"
-                "mv - Mueve o renombra archivos y directorios. Ejemplo: mv origen destino\n"
-                "cp - Copia archivos y directorios. Ejemplo: cp archivo1.txt archivo2.txt o cp -r dir1 dir2\n"
-                "zip - Comprime archivos en formato ZIP. Ejemplo: zip archivo.zip archivo.txt o zip -r archivo.zip directorio\n"
-                "history - Muestra el historial de comandos ejecutados.\n"
-                "clear - Limpia la pantalla del terminal.\n"
-                "ping - Verifica la conectividad con un servidor. Ejemplo: ping google.com\n"
-                "ipconfig - Muestra la configuración de red del sistema\n"
-                "netstat - Muestra información de conexiones de red activas\n"
-                "dig - Realiza búsquedas DNS. Ejemplo: dig google.com [A|MX|NS|TXT]\n"
-            )
-            
-        elif command == "ls":
-            result = subprocess.run("dir" if os.name == "nt" else "ls", shell=True, capture_output=True, text=True)
-            return result.stdout if result.returncode == 0 else result.stderr
-        elif command == "echo":
-            return ' '.join(args)
-        elif command == "cat":
-            if not args:
-                return "Error: No se especificó un archivo."
-            try:
-                filename = ''.join(args)  # Une los argumentos para formar el nombre completo del archivo
-                with open(filename, 'r') as file:
-                    return file.read()
-            except FileNotFoundError:
-                return "Archivo no encontrado."
-        elif command == "mkdir":
-            try:
-                os.mkdir(args[0])
-                return "Directorio creado."
-            except FileExistsError:
-                return "El directorio ya existe."
-        elif command == "pwd":
-            return os.getcwd()
-        elif command == "history":
-            history_output = ["  Id CommandLine", "  -- -----------"]
-            for idx, cmd in enumerate(command_history, start=1):
-                history_output.append(f"   {idx} {cmd}")
-            return "\n".join(history_output)
-        elif command == "clear" or command == "cls":
-            return "CLEAR_SCREEN"  # Special signal to clear the screen
+                    output = spec.run(args, session)
+            return output, False
         else:
-            result = subprocess.run(full_command, shell=True, capture_output=True, text=True)
-            return result.stdout if result.returncode == 0 else result.stderr
+            result = procs.run(full_command, session, shell=True)
+            if result.error:
+                return result.error, True
+            return (result.stdout, False) if result.returncode == 0 else (result.stderr, True)
     except Exception as e:
-        return str(e)
+        return str(e), True
+
+def submit_background(background, session):
+    """
+    Lanza el comando como trabajo en segundo plano sin esperar a que termine.
+    Devuelve el jobs.Job o un mensaje de error.
+    """
+    command_text = sequence.format_command(background.command)
+    session.history.append(f"{command_text} &")
+    return jobs.manager.submit(
+        session, command_text,
+        lambda session, status: streaming.stream_command(background.command, session, status, history=False))
+
+def _collect(lines):
+    """
+    Une la salida de una tubería hasta el límite de salida de los procesos;
+    devuelve (texto, si se cortó). Al cortar se cierra la tubería.
+    """
+    max_bytes = procs.current_limits().output_bytes
+    collected = []
+    size = 0
+    for line in lines:
+        size += len(line) + 1
+        if max_bytes and size > max_bytes:
+            lines.close()
+            collected.append(procs.output_limit_message(max_bytes))
+            return "\n".join(collected), True
+        collected.append(line)
+    return "\n".join(collected), False
+
+def execute_sequence(parsed_sequence, session):
+    """
+    Ejecuta los pasos de una secuencia (;, &&, ||) en orden sobre la sesión y
+    devuelve el resultado de cada uno, incluidos los omitidos. El historial
+    guarda la línea completa una sola vez.
+    """
+    session.history.append(sequence.format_sequence(parsed_sequence))
+    results = []
+    last_failed = False
+    for step in parsed_sequence.steps:
+        if not sequence.should_run(step.operator, last_failed):
+            results.append(sequence.step_result(step, "", False, True, session.cwd))
+            continue
+        output, last_failed = execute_with_status(step.command, session, history=False)
+        results.append(sequence.step_result(step, output, last_failed, False, session.cwd))
+    return results
+
+def analyze(command_string):
+    """
+    Analiza el comando en una sola pasada léxica: devuelve los tokens de
+    table_lexico y el comando parseado a partir de esos mismos tokens
+    """
+    lexical_tokens = table_lexico.tokenize(command_string)
+    parsed_command = parser.parse(lexer=TokenStream(command_string, lexical_tokens))
+    return lexical_tokens, parsed_command
+
+def parse_command(command_string):
+    return analyze(command_string)[1]
+
+def format_tokens(lexical_analysis):
+    """
+    Formatea los tokens del análisis léxico para JSON
+    """
+    return [
+        {
+            "numero": idx + 1,
+            "valor": token[0],
+            "tipo": token[1]
+        }
+        for idx, token in enumerate(lexical_analysis)
+    ]
+
+def _analysis_size(command_string, analysis):
+    formatted_tokens, parsed_command = analysis
+    size = sys.getsizeof(command_string) + sys.getsizeof(formatted_tokens)
+    for token in formatted_tokens:
+        size += sys.getsizeof(token) + sys.getsizeof(token["valor"])
+    for command in _simple_commands(parsed_command):
+        if isinstance(command, pipeline.Pipeline):
+            size += sum(sys.getsizeof(arg) for stage in command.stages for arg in stage.args)
+        else:
+            size += sum(sys.getsizeof(arg) for arg in command[1])
+    return size
+
+def _simple_commands(parsed_command):
+    """
+    Comandos simples y tuberías que forman el comando parseado
+    """
+    if isinstance(parsed_command, jobs.Background):
+        return _simple_commands(parsed_command.command)
+    if isinstance(parsed_command, sequence.Sequence):
+        return [step.command for step in parsed_command.steps]
+    return [parsed_command] if parsed_command else []
 
-def process_command(command_string):
+def _copy_args(parsed_command):
+    # Copia de los argumentos: los manejadores no deben alterar la entrada cacheada
+    # (las tuberías son tuplas inmutables)
+    if isinstance(parsed_command, jobs.Background):
+        return parsed_command._replace(command=_copy_args(parsed_command.command))
+    if isinstance(parsed_command, sequence.Sequence):
+        return parsed_command._replace(steps=tuple(step._replace(command=_copy_args(step.command))
+                                                   for step in parsed_command.steps))
+    if isinstance(parsed_command, pipeline.Pipeline):
+        return parsed_command
+    return (parsed_command[0], list(parsed_command[1]))
+
+# Análisis (tabla de tokens ya formateada y comando parseado) por texto exacto del
+# comando. Sólo se cachea el análisis: la ejecución se repite siempre.
+analysis_cache = LRUCache(max_entries=2048, max_bytes=8 * 1024 * 1024, sizeof=_analysis_size)
+
+def analyze_cached(command_string):
     """
-    Procesa un comando y retorna tanto el análisis léxico como el resultado de la ejecución
+    Devuelve (tokens formateados, comando parseado) reutilizando el análisis de
+    una ejecución anterior del mismo texto si está en la caché
+    """
+    analysis = analysis_cache.get(command_string)
+    if analysis is None:
+        lexical_tokens, parsed_command = analyze(command_string)
+        analysis = (format_tokens(lexical_tokens), parsed_command)
+        analysis_cache.put(command_string, analysis)
+    formatted_tokens, parsed_command = analysis
+    if parsed_command:
+        parsed_command = _copy_args(parsed_command)
+    return formatted_tokens, parsed_command
+
+def _command_timeout(command):
     """
+    Segundos que puede durar un comando simple o una tubería (sus etapas se
+    ejecutan a la vez)
+    """
+    if isinstance(command, pipeline.Pipeline):
+        return max(_command_timeout((stage.command, stage.args)) for stage in command.stages)
+    spec = registry.get(command[0])
+    return (spec.timeout if spec is not None else None) or procs.DEFAULT_LIMITS.timeout
+
+def command_timeout(command_string):
+    """
+    Tiempo máximo que puede tardar el comando según el límite de cada paso: la
+    suma de los pasos de una secuencia. Lanzar un trabajo en segundo plano no
+    espera a que termine.
+    """
+    try:
+        _, parsed_command = analyze_cached(command_string)
+    except Exception:
+        parsed_command = None  # El error lo dará la ejecución, en el acto
+    if isinstance(parsed_command, sequence.Sequence):
+        return sum(_command_timeout(step.command) for step in parsed_command.steps)
+    if parsed_command and not isinstance(parsed_command, jobs.Background):
+        return _command_timeout(parsed_command)
+    return procs.DEFAULT_LIMITS.timeout
+
+def process_command(command_string, session=None):
+    """
+    Procesa un comando y retorna tanto el análisis léxico como el resultado de la ejecución.
+    Los comandos se ejecutan en el contexto de la sesión indicada (cwd, historial y entorno).
+    `error` indica si el comando falló (el último paso, en una secuencia).
+    """
+    session = session or default_session
     try:
-        # Realizar análisis léxico usando table_lexico
-        lexical_analysis = table_lexico.analyze_command(command_string)
+        # Análisis léxico (table_lexico) y parsing con los mismos tokens, o su copia en caché
+        lexical_analysis, parsed_command = analyze_cached(command_string)
         
-        # Realizar el parsing y ejecución normal del comando
-        parsed_command = parser.parse(command_string)
-        if parsed_command:
-            execution_result = execute_command(parsed_command)
+        # Ejecución normal del comando
+        steps = None
+        job = None
+        if isinstance(parsed_command, jobs.Background):
+            with session.lock:
+                job = submit_background(parsed_command, session)
+            failed = isinstance(job, str)
+            execution_result = job if failed else job.announcement()
+        elif isinstance(parsed_command, sequence.Sequence):
+            # La sesión queda bloqueada durante toda la secuencia
+            with session.lock, procs.track_processes(session.running):
+                steps = execute_sequence(parsed_command, session)
+            execution_result = sequence.join_outputs(steps)
+            failed = sequence.failed(steps)
+        elif parsed_command:
+            # Los procesos quedan anotados en la sesión para poder cancelarlos (/cancel)
+            with session.lock, procs.track_processes(session.running):
+                execution_result, failed = execute_with_status(parsed_command, session)
         else:
             execution_result = "Error: No se pudo parsear el comando correctamente."
+            failed = True
         
-        # Formatear los tokens para JSON
-        formatted_tokens = [
-            {
-                "numero": idx + 1,
-                "valor": token[0],
-                "tipo": token[1]
-            }
-            for idx, token in enumerate(lexical_analysis)
-        ]
-        
-        return {
-            "lexical_analysis": formatted_tokens,
-            "execution_result": execution_result
+        result = {
+            "lexical_analysis": lexical_analysis,
+            "execution_result": execution_result,
+            "cwd": session.cwd,
+            "error": failed
         }
+        if steps is not None:
+            result["steps"] = steps
+        if isinstance(job, jobs.Job):
+            result["job_id"] = job.id
+        return result
         
     except Exception as e:
         return {
             "lexical_analysis": [],
-            "execution_result": f"Error: {str(e)}"
+            "execution_result": f"Error: {str(e)}",
+            "cwd": session.cwd,
+            "error": True
         }
 
+# Máximo de comandos aceptados en un lote (/execute/batch)
+MAX_BATCH_COMMANDS = 100
+
+def process_batch(command_strings, session=None, stop_on_error=False):
+    """
+    Procesa varios comandos en orden sobre la misma sesión. Cada resultado tiene
+    la misma forma que el de process_command más el comando. Con stop_on_error
+    no se ejecuta nada después del primer comando que falle.
+    """
+    session = session or default_session
+    results = []
+    # La sesión queda bloqueada durante todo el lote: ningún otro comando se intercala
+    with session.lock:
+        for command_string in command_strings:
+            result = process_command(command_string, session)
+            result["command"] = command_string
+            results.append(result)
+            if stop_on_error and result["error"]:
+                break
+    return results
+
 # Ejemplo de uso
 if __name__ == "__main__":
     while True:
         try:
-            command_input = input(f"{os.getcwd()}> ")
+            command_input = input(f"{default_session.cwd}> ")
             if command_input.lower() == 'exit':
                 break
             
-            parsed_command = parser.parse(command_input)
+            parsed_command = parse_command(command_input)
             if parsed_command:
-                result = execute_command(parsed_command)
+                result = execute_command(parsed_command, default_session)
                 if result == "CLEAR_SCREEN":
                     os.system('cls' if os.name == 'nt' else 'clear')
                 else:
@@ -0,0 +1,1111 @@
+import asyncio
+import json
+import os
+import shutil
+import zipfile
+
+import copy_engine
+import delete_engine
+import dns_resolver
+import file_reader
+import jobs
+import listing
+import netinfo
+import ping_engine
+import pipeline
+import procs
+import zip_engine
+import network_commands
+from history import HISTORY_PAGE_SIZE
+from output_cache import CachePolicy
+from registry import CommandError, collect, command, render_help
+
+# Catálogo de comandos del terminal. Cada comando se registra con sus metadatos;
+# el lexer, `help` y frontend/components/commands.ts se generan a partir de aquí.
+# Para regenerar el catálogo del frontend: python commands.py
+
+@command("help",
+         help="Muestra la lista de comandos.",
+         description="Muestra la lista completa de comandos disponibles con sus descripciones.",
+         example="help",
+         category="system",
+         bound="cpu",
+         cache=CachePolicy(ttl=300))
+def help_command(args, session):
+    return render_help()
+
+# Opciones de ls de una letra, que se pueden combinar (-la, -ltr...)
+LS_FLAGS = {
+    "l": ("long", True),
+    "a": ("show_all", True),
+    "R": ("recursive", True),
+    "r": ("reverse", True),
+    "S": ("sort", "size"),
+    "t": ("sort", "time"),
+    "X": ("sort", "extension"),
+}
+
+def _parse_ls_args(args, session):
+    options = {}
+    paths = []
+    as_json = False
+    for arg in args:
+        if arg == "--json":
+            as_json = True
+        elif arg.startswith("--sort="):
+            sort = arg[len("--sort="):]
+            if sort not in listing.SORT_KEYS:
+                raise ValueError(f"Orden no válido: {sort} (opciones: {', '.join(listing.SORT_KEYS)})")
+            options["sort"] = sort
+        elif arg.startswith("-") and len(arg) > 1:
+            for flag in arg[1:]:
+                if flag not in LS_FLAGS:
+                    raise ValueError(f"Opción no válida: -{flag}")
+                key, value = LS_FLAGS[flag]
+                options[key] = value
+        else:
+            paths.append(arg)
+    targets = [(path, session.resolve(path)) for path in paths] or [(".", session.cwd)]
+    return targets, options, as_json
+
+@command("ls",
+         help="Lista archivos en el directorio actual.",
+         description="Lista archivos y directorios. Opciones: -l (detalle), -a (ocultos), -R (recursivo), "
+                     "-S/-t/-X o --sort=name|size|time|extension (orden), -r (invertir), --json.",
+         example="ls -la",
+         category="navigation",
+         usage="ls [-laRrStX] [--sort=criterio] [--json] [ruta...]",
+         bound="io")
+def ls_command(args, session):
+    return collect(ls_stream(args, session))
+
+@ls_command.streamer
+def ls_stream(args, session):
+    try:
+        targets, options, as_json = _parse_ls_args(args, session)
+    except ValueError as e:
+        raise CommandError(f"Error: {str(e)}")
+    if as_json:
+        options.pop("long", None)
+        yield listing.listing_json(targets, **options)
+        return
+    errors = []
+    yield from listing.iter_listing(targets, errors, **options)
+    if errors:
+        # Como ls: se lista lo que se puede y el comando falla por el resto
+        raise CommandError("\n".join(errors))
+
+@command("echo",
+         help='Muestra texto. Ejemplo: echo "Hola Mundo"',
+         description="Muestra texto en la terminal.",
+         example='echo "Hola Mundo"',
+         category="file",
+         bound="cpu")
+def echo_command(args, session):
+    return ' '.join(args)
+
+# Opciones de cat que reciben un valor, con el nombre del argumento de read_file
+CAT_OPTIONS = {
+    "-n": "head", "--head": "head",
+    "--tail": "tail",
+    "--offset": "offset",
+    "--length": "length",
+    "--from": "token",
+}
+
+def _parse_cat_args(args):
+    """
+    Separa las opciones de rango del nombre del archivo
+    """
+    options = {}
+    names = []
+    args = iter(args)
+    for arg in args:
+        option = CAT_OPTIONS.get(arg)
+        if option is None:
+            names.append(arg)
+            continue
+        value = next(args, None)
+        if value is None:
+            raise ValueError(f"Falta el valor de {arg}")
+        if option == "token":
+            options[option] = value
+        else:
+            try:
+                options[option] = int(value)
+            except ValueError:
+                raise ValueError(f"El valor de {arg} debe ser un número: {value}")
+            if options[option] < 0:
+                raise ValueError(f"El valor de {arg} no puede ser negativo")
+    if not names:
+        raise ValueError("No se especificó un archivo.")
+    return ''.join(names), options  # Une los argumentos para formar el nombre completo del archivo
+
+def _read_cat(args, session):
+    """
+    Devuelve (texto, aviso de continuación o None)
+    """
+    try:
+        filename, options = _parse_cat_args(args)
+        result = file_reader.read_file(session.resolve(filename), **options)
+    except FileNotFoundError:
+        raise CommandError("Archivo no encontrado.")
+    except IsADirectoryError:
+        raise CommandError("Error: Es un directorio")
+    except ValueError as e:
+        raise CommandError(f"Error: {str(e)}")
+    if result.next_token is None:
+        return result.content, None
+    remaining = result.size - result.end
+    return result.content, (f"[... quedan {remaining} bytes. Continuar con: "
+                            f"cat {filename} --from {result.next_token}]")
+
+@command("cat",
+         help="Muestra el contenido de un archivo. Ejemplo: cat archivo.txt",
+         description="Muestra el contenido de un archivo de texto. Opciones: --head N (-n N), --tail N, "
+                     "--offset BYTES, --length BYTES, --from TOKEN (continuar una lectura cortada).",
+         example="cat archivo.txt",
+         category="file",
+         usage="cat [--head N | --tail N | --offset B --length B | --from TOKEN] archivo",
+         min_args=1,
+         usage_error="Error: No se especificó un archivo.",
+         bound="io")
+def cat_command(args, session):
+    content, notice = _read_cat(args, session)
+    if notice is None:
+        return content
+    separator = "" if content.endswith("\n") else "\n"
+    return f"{content}{separator}{notice}"
+
+@cat_command.streamer
+def cat_stream(args, session):
+    content, notice = _read_cat(args, session)
+    # El contenido ya está limitado a file_reader.MAX_READ_BYTES
+    for line in content.splitlines():
+        yield line
+    if notice:
+        yield notice
+
+@cat_command.piped
+def cat_pipe(args, session, stdin):
+    """
+    En una tubería el archivo se pasa entero, por bloques (sin el límite de
+    MAX_READ_BYTES). Sin archivo, cat pasa su entrada tal cual.
+    """
+    if not args:
+        if stdin is None:
+            raise CommandError("Error: No se especificó un archivo.")
+        return stdin
+    pipeline.discard_input(stdin)  # Con archivo, la entrada no se lee
+    try:
+        filename, options = _parse_cat_args(args)
+        if options:
+            # Con opciones de rango, el mismo fragmento que fuera de la tubería
+            content, _ = _read_cat(args, session)
+            return pipeline.encode_lines(content.splitlines())
+        return pipeline.read_chunks(open(session.resolve(filename), 'rb'))
+    except FileNotFoundError:
+        raise CommandError("Archivo no encontrado.")
+    except IsADirectoryError:
+        raise CommandError("Error: Es un directorio")
+    except PermissionError:
+        raise CommandError(f"Error: Sin permisos para leer: {''.join(args)}")
+    except ValueError as e:
+        raise CommandError(f"Error: {str(e)}")
+
+@command("mkdir",
+         help="Crea un nuevo directorio.",
+         description="Crea un nuevo directorio en la ubicación actual.",
+         example="mkdir nuevo_directorio",
+         category="file",
+         usage="mkdir directorio",
+         min_args=1,
+         usage_error="Error: Debe especificar el nombre del directorio",
+         bound="io")
+def mkdir_command(args, session):
+    try:
+        os.mkdir(session.resolve(args[0]))
+        return "Directorio creado."
+    except FileExistsError:
+        raise CommandError("El directorio ya existe.")
+
+@command("pwd",
+         help="Muestra el directorio actual.",
+         description="Muestra la ruta del directorio actual de trabajo.",
+         example="pwd",
+         category="navigation",
+         bound="cpu")
+def pwd_command(args, session):
+    return session.cwd
+
+@command("cd",
+         help="Cambia el directorio actual. Ejemplo: cd /ruta/destino",
+         description="Cambia el directorio actual. Usar '..' para subir un nivel o '~' para ir al directorio home.",
+         example="cd /ruta/destino",
+         category="navigation",
+         usage="cd [directorio]",
+         bound="cpu")
+def cd_command(args, session):
+    if not args:
+        # Si no hay argumentos, ir al directorio home del usuario
+        home_dir = session.chdir("~")
+        return f"Changed directory to {home_dir}"
+
+    # Las rutas relativas (incluido ..) y ~ se resuelven contra el cwd de la sesión
+    session.chdir(args[0])
+    return f"Changed directory to {session.cwd}"
+
+def _parse_unzip_args(args):
+    """
+    Devuelve (nombre del zip, directorio destino, patrones, solo listar)
+    """
+    zip_parts = []  # Para almacenar temporalmente los argumentos del nombre del archivo
+    extract_dir = None
+    patterns = []
+    list_only = False
+    args = iter(args)
+    for arg in args:
+        if arg == '-d':
+            extract_dir = next(args, None)
+            if not extract_dir:
+                raise CommandError("Error: La opción -d requiere especificar un directorio")
+        elif arg == '-l':
+            list_only = True
+        elif not ''.join(zip_parts).endswith('.zip'):
+            # Acumulamos los argumentos hasta completar el nombre del archivo
+            zip_parts.append(arg)
+        else:
+            # El resto son patrones de los archivos a extraer ("*.txt", docs/*)
+            patterns.append(arg.strip('"\''))
+
+    # Unir todos los argumentos acumulados para formar el nombre del archivo
+    zip_file = ''.join(zip_parts)
+    if not zip_file:
+        raise CommandError("Error: Debe especificar un archivo zip")
+    if not zip_file.endswith('.zip'):
+        raise CommandError("Error: El archivo debe tener extensión .zip")
+    return zip_file, extract_dir, patterns, list_only
+
+@command("unzip",
+         help="Extrae archivos de un zip. Ejemplo: unzip archivo.zip [-d directorio]",
+         description="Extrae archivos de un archivo ZIP. Opcionalmente especifica un directorio de destino con -d, "
+                     "los archivos a extraer con patrones (*.txt) o lista el contenido con -l.",
+         example="unzip archivo.zip -d directorio_destino",
+         category="compression",
+         usage="unzip [-l] archivo.zip [patrón...] [-d directorio]",
+         min_args=1,
+         usage_error="Error: Debe especificar un archivo zip",
+         bound="io")
+def unzip_command(args, session):
+    output = None
+    for output in unzip_stream(args, session):
+        pass
+    return output
+
+@unzip_command.streamer
+def unzip_stream(args, session):
+    zip_file, extract_dir, patterns, list_only = _parse_unzip_args(args)
+
+    try:
+        members = zip_engine.select_members(zip_engine.list_members(session.resolve(zip_file)), patterns)
+        if patterns and not members:
+            raise CommandError(f"Error: Ningún archivo coincide con: {' '.join(patterns)}")
+        if list_only:
+            yield zip_engine.format_listing(members)
+            return
+
+        # Si se especificó un directorio de destino, verificar/crear el directorio
+        if extract_dir:
+            # Crear el directorio si no existe (las rutas con ~ se expanden al resolverlas)
+            os.makedirs(session.resolve(extract_dir), exist_ok=True)
+
+        # Extraer al directorio especificado o al actual de la sesión
+        reported = 0
+        for progress in zip_engine.extract_members(session.resolve(zip_file),
+                                                   session.resolve(extract_dir or '.'), members):
+            # Informar del avance cada 10% (sólo se ve en la variante por streaming)
+            percent = progress.bytes_done * 100 // progress.bytes_total if progress.bytes_total else 100
+            if percent >= reported + 10 and progress.files_done < progress.files_total:
+                reported = percent - percent % 10
+                yield f"Extrayendo: {reported}% ({progress.files_done}/{progress.files_total} archivos)"
+
+        extract_location = extract_dir if extract_dir else "directorio actual"
+        if patterns:
+            yield (f"{len(members)} archivo(s) de {zip_file} descomprimidos exitosamente "
+                   f"en {extract_location}")
+        else:
+            yield f"Archivo {zip_file} descomprimido exitosamente en {extract_location}"
+
+    except zipfile.BadZipFile:
+        raise CommandError("Error: Archivo zip corrupto o inválido")
+    except FileNotFoundError:
+        raise CommandError("Error: Archivo zip no encontrado")
+    except PermissionError:
+        raise CommandError("Error: Sin permisos suficientes para extraer en el directorio especificado")
+
+def _results(lines, failed):
+    """
+    Salida de un comando que procesa varios objetivos: falla si falló alguno,
+    con el resultado de todos
+    """
+    output = "\n".join(lines)
+    if failed:
+        raise CommandError(output)
+    return output
+
+def _expand_targets(args, session, long_options=None):
+    """
+    Separa las opciones (-rf) de las rutas y expande los patrones glob.
+    long_options traduce las opciones largas a su letra ({'--force': 'f'});
+    cualquier otra opción larga es un error. Después de -- todo son rutas.
+    """
+    flags = set()
+    targets = []
+    options_ended = False
+    for arg in args:
+        if options_ended or not arg.startswith('-') or arg == '-':
+            targets.extend(session.glob(arg))
+        elif arg == '--':
+            options_ended = True
+        elif arg.startswith('--'):
+            flag = (long_options or {}).get(arg)
+            if flag is None:
+                raise CommandError(f"Error: Opción no reconocida: {arg}")
+            flags.add(flag)
+        else:
+            flags.update(arg[1:])
+    return flags, targets
+
+@command("rm",
+         help="Elimina archivos o directorios. Ejemplo: rm archivo.txt o rm -rf directorio",
+         description="Elimina archivos o directorios (admite varios y patrones como *.log). "
+                     "Usa -r para directorios y -f para forzar la eliminación.",
+         example="rm archivo.txt | rm -rf directorio",
+         category="file",
+         usage="rm [-rf] archivo...",
+         min_args=1,
+         usage_error="Error: Debe especificar al menos un archivo o directorio",
+         bound="io")
+def rm_command(args, session):
+    # Procesar flags
+    flags, targets = _expand_targets(args, session, {'--recursive': 'r', '--force': 'f'})
+    recursive = 'r' in flags or 'R' in flags
+    force = 'f' in flags
+
+    if not targets:
+        raise CommandError("Error: Debe especificar al menos un archivo o directorio para eliminar")
+
+    results = []
+    failed = False
+    for target in targets:
+        try:
+            target_path = session.resolve(target)
+            if os.path.isdir(target_path) and not os.path.islink(target_path):
+                if not recursive:
+                    results.append(f"Error: {target} es un directorio. Use -r para eliminar directorios")
+                    failed = True
+                    continue
+                # Borrado en paralelo; los fallos de archivos sueltos no detienen el resto
+                errors = delete_engine.remove_tree(target_path)
+                if errors and not force:
+                    failed_path, message = errors[0]
+                    results.append(f"Error: No se pudo eliminar todo {target} "
+                                   f"({len(errors)} errores, primero: {failed_path}: {message})")
+                    failed = True
+                    continue
+            else:
+                os.remove(target_path)
+            results.append(f"Eliminado: {target}")
+        except FileNotFoundError:
+            if not force:
+                results.append(f"Error: {target} no encontrado")
+                failed = True
+        except PermissionError:
+            if not force:
+                results.append(f"Error: Sin permisos para eliminar {target}")
+                failed = True
+
+    return _results(results, failed)
+
+@command("mv",
+         help="Mueve o renombra archivos y directorios. Ejemplo: mv origen destino",
+         description="Mueve o renombra archivos y directorios. Con varios orígenes (o patrones como *.txt) "
+                     "el destino debe ser un directorio; -n no sobrescribe archivos existentes.",
+         example="mv origen.txt destino.txt",
+         category="file",
+         usage="mv [-n] origen... destino",
+         min_args=2,
+         usage_error="Error: mv requiere origen y destino",
+         bound="io")
+def mv_command(args, session):
+    flags, paths = _expand_targets(args, session, {'--no-clobber': 'n'})
+    no_clobber = 'n' in flags
+    if len(paths) < 2:
+        raise CommandError("Error: mv requiere origen y destino")
+
+    *sources, destination = paths
+    destination_path = session.resolve(destination)
+    into_directory = os.path.isdir(destination_path)
+    if len(sources) > 1 and not into_directory:
+        raise CommandError(f"Error: El destino no es un directorio: {destination}")
+
+    results = []
+    failed = False
+    for source in sources:
+        try:
+            target = destination_path
+            if into_directory:
+                target = os.path.join(destination_path, os.path.basename(session.resolve(source)))
+            if no_clobber and os.path.lexists(target):
+                results.append(f"Omitido (ya existe): {source}")
+                continue
+            # Realizar el movimiento/renombrado
+            shutil.move(session.resolve(source), target)
+            results.append(f"Movido/renombrado: {source} -> {destination}")
+        except FileNotFoundError:
+            results.append(f"Error: Archivo o directorio no encontrado: {source}")
+            failed = True
+        except PermissionError:
+            results.append("Error: Sin permisos suficientes")
+            failed = True
+        except shutil.Error as e:
+            results.append(f"Error al mover/renombrar: {str(e)}")
+            failed = True
+
+    return _results(results, failed)
+
+@command("cp",
+         help="Copia archivos y directorios. Ejemplo: cp archivo1.txt archivo2.txt o cp -r dir1 dir2",
+         description="Copia archivos y directorios. Usa -r para copiar directorios de forma recursiva, "
+                     "--progress para ver el avance y --resume para continuar una copia interrumpida "
+                     "(omite los archivos con el mismo tamaño y fecha).",
+         example="cp archivo1.txt archivo2.txt | cp -r dir1 dir2",
+         category="file",
+         usage="cp [-r] [--progress] [--resume] origen... destino",
+         min_args=2,
+         usage_error="Error: cp requiere origen y destino",
+         bound="io")
+def cp_command(args, session):
+    output = None
+    for output in cp_stream(args, session):
+        pass
+    return output
+
+@cp_command.streamer
+def cp_stream(args, session):
+    recursive = False
+    show_progress = False
+    resume = False
+    paths = []
+    for arg in args:
+        if arg == "--progress":
+            show_progress = True
+        elif arg == "--resume":
+            resume = True
+        elif arg.startswith('-') and len(arg) > 1 and not arg.startswith('--'):
+            # -r, -R y combinaciones como -rv
+            if 'r' in arg or 'R' in arg:
+                recursive = True
+        else:
+            paths.append(arg)
+
+    if len(paths) < 2:
+        raise CommandError("Error: cp requiere origen y destino")
+    *sources, destination = paths
+    destination_path = session.resolve(destination)
+    into_directory = os.path.isdir(destination_path)
+    if len(sources) > 1 and not into_directory:
+        raise CommandError(f"Error: El destino no es un directorio: {destination}")
+
+    source = sources[0]
+    try:
+        copied_dirs = 0
+        skipped = 0
+        for source in sources:
+            source_path = session.resolve(source)
+            if not os.path.lexists(source_path):
+                raise FileNotFoundError(source)
+            is_dir = os.path.isdir(source_path)
+            if is_dir and not recursive:
+                raise CommandError("Error: Para copiar directorios use -r")
+            target = destination_path
+            # Con --resume un directorio existente es la copia que se interrumpió, no donde ponerla
+            if into_directory and not (is_dir and resume and len(sources) == 1):
+                target = os.path.join(destination_path, os.path.basename(source_path.rstrip(os.sep)))
+            if is_dir and os.path.exists(target) and not resume:
+                raise CommandError(f"Error: El destino ya existe: {target} (use --resume para continuar la copia)")
+
+            reported = 0
+            progress = None
+            for progress in copy_engine.copy_path(source_path, target, resume):
+                # Avance cada 10% con --progress (sólo se ve en la variante por streaming)
+                percent = progress.bytes_done * 100 // progress.bytes_total if progress.bytes_total else 100
+                if show_progress and percent >= reported + 10 and progress.files_done < progress.files_total:
+                    reported = percent - percent % 10
+                    yield f"Copiando {source}: {reported}% ({progress.files_done}/{progress.files_total} archivos)"
+            skipped += progress.skipped if progress else 0
+            copied_dirs += is_dir
+
+        summary = f" ({skipped} archivos sin cambios omitidos)" if resume else ""
+        if copied_dirs:
+            yield f"Directorio copiado: {' '.join(sources)} -> {destination}{summary}"
+        else:
+            yield f"Archivo copiado: {' '.join(sources)} -> {destination}{summary}"
+    except FileNotFoundError:
+        raise CommandError(f"Error: Archivo o directorio no encontrado: {source}")
+    except PermissionError:
+        raise CommandError("Error: Sin permisos suficientes")
+    except shutil.Error as e:
+        raise CommandError(f"Error al copiar: {str(e)}")
+
+def _parse_zip_args(args):
+    """
+    Devuelve (recursivo, nivel, nombre del zip, ruta a comprimir)
+    """
+    # Procesar argumentos
+    recursive = False
+    level = zip_engine.DEFAULT_LEVEL
+    start_idx = 0
+
+    # Verificar flags si existen (-r, -0 a -9, o combinados: -r9)
+    while start_idx < len(args) and args[start_idx].startswith('-'):
+        for flag in args[start_idx][1:]:
+            if flag == 'r':
+                recursive = True
+            elif flag.isdigit():
+                level = int(flag)
+            else:
+                raise CommandError(f"Error: Opción no válida: -{flag}")
+        start_idx += 1
+
+    # Necesitamos al menos el nombre del zip y un archivo para comprimir
+    if len(args) < start_idx + 2:
+        raise CommandError("Error: Debe especificar nombre del archivo zip y archivos a comprimir")
+
+    # Obtener el nombre del archivo zip (primer argumento o segundo si hay flag)
+    zip_args = []
+    file_args = []
+    found_zip = False
+
+    for arg in args[start_idx:]:
+        if not found_zip:
+            zip_args.append(arg)
+            if '.zip' in ''.join(zip_args):
+                found_zip = True
+        else:
+            file_args.append(arg)
+
+    # Unir los argumentos para formar los nombres completos
+    zip_name = ''.join(zip_args)
+    if not zip_name.endswith('.zip'):
+        zip_name += '.zip'
+
+    # Unir los argumentos para el archivo a comprimir
+    return recursive, level, zip_name, ''.join(file_args)
+
+@command("zip",
+         help="Comprime archivos en formato ZIP. Ejemplo: zip archivo.zip archivo.txt o zip -r archivo.zip directorio",
+         description="Comprime archivos en formato ZIP. Usa -r para comprimir directorios de forma recursiva "
+                     "y -0 a -9 para elegir el nivel de compresión.",
+         example="zip archivo.zip archivo.txt | zip -r9 archivo.zip directorio",
+         category="compression",
+         usage="zip [-r] [-0..-9] archivo.zip archivo",
+         min_args=1,
+         usage_error="Error: Debe especificar nombre del archivo zip y archivos a comprimir",
+         bound="cpu")
+def zip_command(args, session):
+    output = None
+    for output in zip_stream(args, session):
+        pass
+    return output
+
+@zip_command.streamer
+def zip_stream(args, session):
+    recursive, level, zip_name, files_to_zip = _parse_zip_args(args)
+
+    try:
+        source_path = session.resolve(files_to_zip)
+        zip_path = session.resolve(zip_name)
+        if not os.path.exists(source_path):
+            raise CommandError(f"Error: Archivo no encontrado: {files_to_zip}")
+        if os.path.isdir(source_path) and not recursive:
+            raise CommandError(f"Error: {files_to_zip} es un directorio. Use -r para comprimir directorios")
+
+        sources = zip_engine.collect_sources(source_path, recursive, exclude=[zip_path])
+        reported = 0
+        for progress in zip_engine.create_zip(zip_path, sources, level):
+            # Informar del avance cada 10% (sólo se ve en la variante por streaming)
+            percent = progress.bytes_done * 100 // progress.bytes_total if progress.bytes_total else 100
+            if percent >= reported + 10 and progress.files_done < progress.files_total:
+                reported = percent - percent % 10
+                yield (f"Comprimiendo: {reported}% ({progress.files_done}/{progress.files_total} "
+                       f"archivos)")
+
+        yield f"Archivo zip creado exitosamente: {zip_name}"
+
+    except CommandError:
+        raise
+    except FileNotFoundError:
+        raise CommandError("Error: Uno o más archivos no encontrados")
+    except PermissionError:
+        raise CommandError("Error: Sin permisos suficientes")
+    except Exception as e:
+        raise CommandError(f"Error al crear el archivo zip: {str(e)}")
+
+@command("history",
+         help="Muestra el historial de comandos ejecutados.",
+         description="Muestra el historial de comandos ejecutados en la sesión actual. "
+                     "Opciones: N (últimos N), -p PÁGINA, -s TEXTO (buscar), --prefix TEXTO, -c (borrar).",
+         example="history -s cd",
+         category="system",
+         usage="history [N] [-p página] [-s texto | --prefix texto] [-c]",
+         bound="cpu")
+def history_command(args, session):
+    page_size = HISTORY_PAGE_SIZE
+    page = 0
+    text = None
+    prefix = False
+    options = iter(args)
+    try:
+        for arg in options:
+            if arg == "-c":
+                session.history.clear()
+                return ""
+            elif arg == "-p":
+                page = int(next(options))
+            elif arg in ("-s", "--prefix"):
+                prefix = arg == "--prefix"
+                text = next(options)
+            else:
+                page_size = int(arg)
+    except (StopIteration, ValueError):
+        raise CommandError("Error: Uso: history [N] [-p página] [-s texto | --prefix texto] [-c]")
+    if page < 0 or page_size <= 0:
+        raise CommandError("Error: La página y el número de entradas deben ser positivos")
+
+    if text is None:
+        entries = session.history.page(page, page_size)
+    else:
+        # Las búsquedas devuelven primero lo más reciente; se muestran en orden cronológico
+        entries = session.history.search(text, prefix, page, page_size)[::-1]
+
+    history_output = ["  Id CommandLine", "  -- -----------"]
+    for entry in entries:
+        history_output.append(f"   {entry.number} {entry.command}")
+    return "\n".join(history_output)
+
+@command("clear",
+         help="Limpia la pantalla del terminal.",
+         description="Limpia la pantalla del terminal.",
+         example="clear",
+         category="system",
+         bound="cpu",
+         aliases=("cls",))
+def clear_command(args, session):
+    return "CLEAR_SCREEN"  # Special signal to clear the screen
+
+@command("jobs",
+         help="Muestra los trabajos en segundo plano.",
+         description="Muestra los trabajos lanzados en segundo plano (comando &) con su estado y código de "
+                     "salida. Opciones: --json.",
+         example="jobs",
+         category="system",
+         usage="jobs [--json]",
+         bound="cpu")
+def jobs_command(args, session):
+    session_jobs = jobs.manager.list(session.id)
+    if "--json" in args:
+        return json.dumps([job.to_dict(since=job.lines) for job in session_jobs], ensure_ascii=False)
+    return "\n".join(job.status_line() for job in session_jobs)
+
+def _find_job(args, session):
+    """
+    Trabajo indicado en args[0] (1 o %1) o el último lanzado
+    """
+    if not args:
+        job = jobs.manager.latest(session.id)
+        if job is None:
+            raise CommandError("Error: No hay trabajos en segundo plano")
+        return job
+    job_id = jobs.parse_job_id(args[0])
+    job = jobs.manager.get(session.id, job_id) if job_id is not None else None
+    if job is None:
+        raise CommandError(f"Error: No existe el trabajo: {args[0]}")
+    return job
+
+def _job_end(job):
+    # Línea final de fg cuando el trabajo no terminó bien
+    if job.state == jobs.DONE:
+        return None
+    return job.status_line()
+
+@command("fg",
+         help="Espera a un trabajo en segundo plano y muestra su salida.",
+         description="Trae al primer plano un trabajo lanzado con &: muestra su salida y espera a que termine. "
+                     "Sin número, el último trabajo lanzado.",
+         example="fg 1",
+         category="system",
+         usage="fg [número]",
+         bound="io",
+         timeout=procs.BACKGROUND_LIMITS.timeout)
+def fg_command(args, session):
+    return collect(fg_stream(args, session))
+
+@fg_command.streamer
+def fg_stream(args, session):
+    job = _find_job(args, session)
+    yield from job.follow()
+    end = _job_end(job)
+    if end:
+        # Como en el shell, fg termina con el estado del trabajo
+        raise CommandError(end)
+
+@command("kill",
+         help="Termina un trabajo en segundo plano. Ejemplo: kill 1",
+         description="Termina trabajos lanzados en segundo plano (comando &) y los procesos que hayan iniciado.",
+         example="kill %1",
+         category="system",
+         usage="kill número...",
+         min_args=1,
+         bound="cpu")
+def kill_command(args, session):
+    lines = []
+    failed = False
+    for arg in args:
+        try:
+            job = _find_job([arg], session)
+        except CommandError as e:
+            lines.append(str(e))
+            failed = True
+            continue
+        if jobs.manager.kill(job):
+            lines.append(job.status_line())
+        else:
+            lines.append(f"El trabajo [{job.id}] ya había terminado")
+    return _results(lines, failed)
+
+def _parse_ping_args(args):
+    """
+    Devuelve (hosts, opciones de ping_engine, salida JSON)
+    """
+    hosts = []
+    options = {}
+    as_json = False
+    limits = {"-c": ("count", int, 1, 1000), "-W": ("timeout", float, 0.01, 60),
+              "-i": ("interval", float, ping_engine.MIN_INTERVAL, 60)}
+    args = iter(args)
+    for arg in args:
+        if arg in limits:
+            name, convert, low, high = limits[arg]
+            value = next(args, "")
+            try:
+                value = convert(value)
+            except ValueError:
+                raise CommandError(f"Error: La opción {arg} requiere un número")
+            if not low <= value <= high:
+                raise CommandError(f"Error: El valor de {arg} debe estar entre {low} y {high}")
+            options[name] = value
+        elif arg == "--json":
+            as_json = True
+        else:
+            hosts.append(arg)
+    if not hosts:
+        raise CommandError("Error: Debe especificar un host")
+    # Sin repetir hosts, conservando el orden
+    return list(dict.fromkeys(hosts)), options, as_json
+
+def _format_ping_reply(reply):
+    if reply.rtt is None:
+        return f"Sin respuesta de {reply.host} ({reply.address}): icmp_seq={reply.seq} tiempo de espera agotado"
+    return f"Respuesta de {reply.host} ({reply.address}): icmp_seq={reply.seq} tiempo={reply.rtt:.3f} ms"
+
+def _format_ping_stats(stats):
+    if stats.error:
+        return f"Error al hacer ping a {stats.host}: {stats.error}"
+    line = (f"{stats.host} ({stats.address}): {stats.sent} enviados, {stats.received} recibidos, "
+            f"{stats.loss:g}% perdidos")
+    if stats.received:
+        line += f", rtt min/avg/max = {stats.min:.3f}/{stats.avg:.3f}/{stats.max:.3f} ms"
+    return line
+
+def _format_ping_summary(results):
+    reachable = sum(1 for stats in results if stats.received)
+    return f"{reachable} de {len(results)} hosts responden"
+
+def _ping_failed(results):
+    # Como ping, falla si algún host no respondió
+    return any(stats.error or not stats.received for stats in results)
+
+def _format_ping_results(hosts, results, as_json):
+    # Los resultados se muestran en el orden en que se pidieron los hosts
+    results.sort(key=lambda stats: hosts.index(stats.host))
+    if as_json:
+        output = json.dumps([stats._asdict() for stats in results], ensure_ascii=False)
+    else:
+        lines = [_format_ping_stats(stats) for stats in results]
+        if len(hosts) > 1:
+            lines.append(_format_ping_summary(results))
+        output = "\n".join(lines)
+    if _ping_failed(results):
+        raise CommandError(output)
+    return output
+
+@command("ping",
+         help="Verifica la conectividad con uno o varios servidores. Ejemplo: ping google.com",
+         description="Verifica la conectividad con uno o varios servidores a la vez mediante paquetes ICMP "
+                     "y muestra pérdidas y rtt min/avg/max de cada uno según van terminando. "
+                     "Opciones: -c número, -W espera, -i intervalo (segundos), --json.",
+         example="ping google.com github.com",
+         category="network",
+         usage="ping [-c número] [-W segundos] [-i segundos] [--json] host...",
+         min_args=1,
+         usage_error="Error: Debe especificar un host",
+         bound="io",
+         timeout=600)
+def ping_command(args, session):
+    hosts, options, as_json = _parse_ping_args(args)
+    try:
+        results = list(ping_engine.iter_ping_hosts(hosts, max_time=ping_command.timeout, **options))
+    except ping_engine.PingError as e:
+        raise CommandError(str(e))
+    return _format_ping_results(hosts, results, as_json)
+
+@ping_command.streamer
+def ping_stream(args, session):
+    hosts, options, as_json = _parse_ping_args(args)
+    # Con un solo host se muestra cada respuesta, como ping; con varios, el
+    # resumen de cada host en cuanto termina
+    single = len(hosts) == 1 and not as_json
+    results = []
+    try:
+        for event in ping_engine.iter_ping_hosts(hosts, max_time=ping_command.timeout, replies=single, **options):
+            if isinstance(event, ping_engine.Reply):
+                yield _format_ping_reply(event)
+                continue
+            results.append(event)
+            yield json.dumps(event._asdict(), ensure_ascii=False) if as_json else _format_ping_stats(event)
+    except ping_engine.PingError as e:
+        raise CommandError(str(e))
+    if len(hosts) > 1 and not as_json:
+        yield _format_ping_summary(results)
+    if _ping_failed(results):
+        raise CommandError()  # El resumen de cada host ya indica cuál no respondió
+
+@ping_command.asynchronous
+async def ping_async(args, session):
+    hosts, options, as_json = _parse_ping_args(args)
+    results = [event async for event in ping_engine.ping_hosts(hosts, **options)]
+    return _format_ping_results(hosts, results, as_json)
+
+def _parse_ipconfig_args(args):
+    """
+    Devuelve (interfaz o None, salida JSON)
+    """
+    names = [arg for arg in args if arg != "--json"]
+    if len(names) > 1:
+        raise CommandError("Error: Solo se puede indicar una interfaz")
+    return (names[0] if names else None), "--json" in args
+
+def _ipconfig(args):
+    name, as_json = _parse_ipconfig_args(args)
+    try:
+        items = netinfo.interfaces(name)
+    except OSError as e:
+        raise CommandError(f"Error al obtener información de red: {str(e)}")
+    if name is not None and not items:
+        raise CommandError(f"Error: No existe la interfaz: {name}")
+    return netinfo.interfaces_json(items) if as_json else netinfo.format_interfaces(items)
+
+@command("ipconfig",
+         help="Muestra la configuración de red del sistema",
+         description="Muestra las interfaces de red con sus direcciones IPv4/IPv6, MTU, estado y "
+                     "contadores de tráfico. Acepta el nombre de una interfaz y --json.",
+         example="ipconfig",
+         category="network",
+         usage="ipconfig [interfaz] [--json] [--no-cache]",
+         bound="io",
+         cache=CachePolicy(ttl=2),
+         timeout=10)
+def ipconfig_command(args, session):
+    if not netinfo.AVAILABLE:
+        return network_commands.execute("ipconfig", args, session)
+    return _ipconfig(args)
+
+@ipconfig_command.asynchronous
+async def ipconfig_async(args, session):
+    if not netinfo.AVAILABLE:
+        return await network_commands.execute_async("ipconfig", args, session)
+    # Solo lee archivos de /proc: no hace falta un hilo
+    return _ipconfig(args)
+
+# Opciones cortas de netstat (se pueden combinar: -tulpn)
+NETSTAT_FLAGS = set("tulapn")
+
+def _parse_netstat_args(args):
+    """
+    Devuelve (protocolos, estados, puerto, salida JSON)
+    """
+    flags = set()
+    states = None
+    port = None
+    as_json = False
+    for arg in args:
+        if arg == "--json":
+            as_json = True
+        elif arg.startswith("--state="):
+            states = {state.upper() for state in arg[len("--state="):].split(",") if state}
+            unknown = states - set(netinfo.TCP_STATES.values()) - netinfo.LISTENING_STATES
+            if unknown:
+                raise CommandError(f"Error: Estado no válido: {', '.join(sorted(unknown))}")
+        elif arg.startswith("--port="):
+            value = arg[len("--port="):]
+            if not value.isdigit() or not 0 < int(value) < 65536:
+                raise CommandError(f"Error: Puerto no válido: {value}")
+            port = int(value)
+        elif arg.startswith("-") and len(arg) > 1 and set(arg[1:]) <= NETSTAT_FLAGS:
+            flags.update(arg[1:])
+        else:
+            raise CommandError(f"Error: Opción no reconocida: {arg}")
+
+    protocols = tuple(proto for proto in netinfo.PROTOCOLS
+                      if not flags & {"t", "u"} or proto[0] in flags)
+    if states is None:
+        if "a" in flags:
+            states = None
+        elif "l" in flags:
+            states = netinfo.LISTENING_STATES
+        else:
+            # Como antes (netstat -tulpn filtrado): puertos en escucha y conexiones establecidas
+            states = netinfo.LISTENING_STATES | {"ESTABLISHED"}
+    return protocols, states, port, as_json
+
+def _netstat(args):
+    protocols, states, port, as_json = _parse_netstat_args(args)
+    items = netinfo.connections(protocols, states, port)
+    return netinfo.connections_json(items) if as_json else netinfo.format_connections(items)
+
+@command("netstat",
+         help="Muestra información de conexiones de red activas",
+         description="Muestra las conexiones de red activas y los puertos en escucha con el PID y el "
+                     "programa de cada socket. Opciones: -t (TCP), -u (UDP), -l (solo en escucha), "
+                     "-a (todos los estados), --state=ESTADO[,...], --port=N y --json.",
+         example="netstat -an",
+         category="network",
+         usage="netstat [-tula] [--state=ESTADO] [--port=N] [--json] [--no-cache]",
+         bound="io",
+         cache=CachePolicy(ttl=2),
+         timeout=10)
+def netstat_command(args, session):
+    if not netinfo.AVAILABLE:
+        return network_commands.execute("netstat", args, session)
+    return _netstat(args)
+
+@netstat_command.asynchronous
+async def netstat_async(args, session):
+    if not netinfo.AVAILABLE:
+        return await network_commands.execute_async("netstat", args, session)
+    # Recorrer /proc/<pid>/fd puede tardar con muchos procesos: en un hilo
+    return await asyncio.to_thread(_netstat, args)
+
+def _parse_dig_args(args):
+    """
+    Devuelve (consultas, opciones del resolver, salida corta, salida JSON)
+    """
+    names = []
+    types = []
+    options = {}
+    short = as_json = False
+    args = iter(args)
+    for arg in args:
+        if arg.startswith('@') and len(arg) > 1:
+            options["servers"] = [arg[1:]]
+        elif arg == '-p':
+            port = next(args, '')
+            if not port.isdigit():
+                raise CommandError("Error: La opción -p requiere un número de puerto")
+            options["port"] = int(port)
+        elif arg == '-t':
+            types.append(next(args, '').upper())
+        elif arg == '+tcp':
+            options["tcp"] = True
+        elif arg == '+short':
+            short = True
+        elif arg in ('+json', '--json'):
+            as_json = True
+        elif arg.upper() in dns_resolver.DNS_RECORD_TYPES:
+            types.append(arg.upper())
+        else:
+            names.append(arg)
+
+    if not names:
+        raise CommandError("Error: Debe especificar un dominio. Ejemplo: dig google.com")
+    for record_type in types:
+        if record_type not in dns_resolver.DNS_RECORD_TYPES:
+            raise CommandError(f"Error: Tipo de registro no soportado: {record_type}")
+    # Todas las combinaciones de nombre y tipo (tipo predeterminado: A)
+    questions = [(name, record_type) for name in names for record_type in types or ["A"]]
+    return questions, options, short, as_json
+
+def _dig_output(questions, responses, short, as_json):
+    # Falla si alguna consulta no tuvo respuesta o el servidor devolvió un error
+    output = _format_dig(questions, responses, short, as_json)
+    if any(isinstance(response, Exception) or response.rcode != "NOERROR" for response in responses):
+        raise CommandError(output)
+    return output
+
+def _format_dig(questions, responses, short, as_json):
+    if as_json:
+        results = []
+        for (name, record_type), response in zip(questions, responses):
+            if isinstance(response, Exception):
+                results.append({"name": name, "type": record_type, "error": str(response)})
+            else:
+                results.append({"name": response.name, "type": response.type, "rcode": response.rcode,
+                                "server": response.server,
+                                "answers": [record._asdict() for record in response.answers]})
+        return json.dumps(results, ensure_ascii=False)
+
+    lines = []
+    for (name, record_type), response in zip(questions, responses):
+        if isinstance(response, Exception):
+            lines.append(f"Error al realizar la búsqueda DNS: {name} {record_type}: {str(response)}")
+        elif response.rcode != "NOERROR":
+            lines.append(f"Error al realizar la búsqueda DNS: {name} {record_type}: {response.rcode}")
+        elif short:
+            lines.extend(record.data for record in response.answers)
+        elif not response.answers:
+            lines.append(f"{response.name}\t{record_type}: sin registros")
+        else:
+            lines.extend(f"{record.name}\t{record.ttl}\tIN\t{record.type}\t{record.data}"
+                         for record in response.answers)
+    return "\n".join(lines)
+
+@command("dig",
+         help="Realiza búsquedas DNS. Ejemplo: dig google.com [A|MX|NS|TXT]",
+         description="Realiza búsquedas DNS. Soporta diferentes tipos de registros (A, AAAA, MX, NS, TXT, SOA), "
+                     "varios dominios y tipos a la vez, @servidor, -p puerto, +tcp, +short y --json.",
+         example="dig google.com A",
+         category="network",
+         usage="dig [@servidor] [-p puerto] [+tcp] [+short] [--json] [--no-cache] dominio... [A|AAAA|MX|NS|TXT|SOA]...",
+         min_args=1,
+         usage_error="Error: Debe especificar un dominio. Ejemplo: dig google.com",
+         bound="io",
+         cache=CachePolicy(ttl=5),
+         timeout=30)
+def dig_command(args, session):
+    questions, options, short, as_json = _parse_dig_args(args)
+    return _dig_output(questions, dns_resolver.resolve(questions, **options), short, as_json)
+
+@dig_command.asynchronous
+async def dig_async(args, session):
+    questions, options, short, as_json = _parse_dig_args(args)
+    return _dig_output(questions, await dns_resolver.query_many(questions, **options), short, as_json)
+
+if __name__ == "__main__":
+    from registry import generate_commands_ts
+
+    target = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          '..', 'frontend', 'components', 'commands.ts')
+    with open(target, 'w', encoding='utf-8') as f:
+        f.write(generate_commands_ts())
+    print(f"Catálogo generado en {os.path.normpath(target)}")
@@ -0,0 +1,7 @@
+import os
+
+# Las pruebas no guardan el historial en disco
+os.environ.setdefault('TERMINAL_HISTORY_DIR', '')
+
+# Script de prueba manual (python test_process_command.py "comando"), no de pytest
+collect_ignore = ['test_process_command.py']
@@ -0,0 +1,215 @@
+import errno
+import os
+import shutil
+import stat
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl de Linux que clona un archivo compartiendo sus bloques (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+# Bytes que se piden al kernel en cada llamada a copy_file_range/sendfile
+KERNEL_CHUNK = 64 * 1024 * 1024
+
+# Errores con los que el kernel indica que un método de copia no está disponible
+# para estos archivos (otro sistema de archivos, tipo de archivo no soportado...)
+_UNSUPPORTED = {errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTTY,
+                errno.EBADF, errno.EPERM, errno.ETXTBSY}
+
+# Avance de una copia: archivos y bytes copiados u omitidos (por estar ya al día)
+Progress = namedtuple('Progress', ['files_done', 'files_total', 'bytes_done', 'bytes_total',
+                                   'skipped', 'current'])
+
+def _reflink(src_fd, dst_fd, size):
+    if fcntl is None:
+        return False
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    return True
+
+def _copy_file_range(src_fd, dst_fd, size):
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    copied = 0
+    while copied < size:
+        sent = os.copy_file_range(src_fd, dst_fd, min(KERNEL_CHUNK, size - copied))
+        if sent == 0:
+            break
+        copied += sent
+    return copied == size
+
+def _sendfile(src_fd, dst_fd, size):
+    if not hasattr(os, 'sendfile'):
+        return False
+    copied = 0
+    while copied < size:
+        sent = os.sendfile(dst_fd, src_fd, copied, min(KERNEL_CHUNK, size - copied))
+        if sent == 0:
+            break
+        copied += sent
+    return copied == size
+
+# Métodos de copia, del más rápido al más general. Todos copian en el kernel sin
+# pasar los datos por Python; si ninguno sirve se usa shutil.copyfileobj.
+KERNEL_METHODS = (
+    ('reflink', _reflink),
+    ('copy_file_range', _copy_file_range),
+    ('sendfile', _sendfile),
+)
+
+def _same_file(src_stat, dst):
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    return (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino)
+
+def copy_file(src, dst, src_stat=None):
+    """
+    Copia el contenido y los metadatos (como shutil.copy2) con el método más
+    rápido disponible. Devuelve el nombre del método usado. Si dst es un
+    directorio se copia dentro, con el mismo nombre; copiar un archivo sobre
+    sí mismo lanza shutil.SameFileError (abrir el destino lo vaciaría).
+    """
+    src_stat = src_stat or os.stat(src)
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    if _same_file(src_stat, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    if stat.S_ISFIFO(src_stat.st_mode):
+        raise shutil.SpecialFileError(f"`{src}` is a named pipe")
+    # El tamaño de los pseudo-archivos (/proc) es 0 y el de los dispositivos no
+    # cuenta: los métodos del kernel copiarían sólo st_size bytes
+    kernel_methods = KERNEL_METHODS if stat.S_ISREG(src_stat.st_mode) and src_stat.st_size else ()
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        method = None
+        for name, kernel_copy in kernel_methods:
+            try:
+                if kernel_copy(src_fd, dst_fd, src_stat.st_size):
+                    method = name
+                    break
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED:
+                    raise
+            # Descartar lo que un intento parcial haya podido escribir
+            os.ftruncate(dst_fd, 0)
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+        if method is None:
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+            method = 'copyfileobj'
+    shutil.copystat(src, dst)
+    return method
+
+def is_up_to_date(src_stat, dst):
+    """
+    El destino ya es una copia del origen: mismo tamaño y misma fecha de modificación
+    (con precisión de segundos, como rsync)
+    """
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    return (stat.S_ISREG(dst_stat.st_mode) and dst_stat.st_size == src_stat.st_size
+            and int(dst_stat.st_mtime) == int(src_stat.st_mtime))
+
+def _plan_tree(src, dst):
+    """
+    Recorre el árbol de origen: devuelve los directorios a crear (origen, destino),
+    los enlaces simbólicos y los archivos a copiar (origen, destino, stat)
+    """
+    directories = []
+    symlinks = []
+    files = []
+    pending = [(src, dst)]
+    while pending:
+        src_dir, dst_dir = pending.pop()
+        directories.append((src_dir, dst_dir))
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                target = os.path.join(dst_dir, entry.name)
+                if entry.is_symlink():
+                    # Como cp -r: los enlaces se copian como enlaces, sin seguirlos
+                    symlinks.append((entry.path, target))
+                elif entry.is_dir():
+                    pending.append((entry.path, target))
+                else:
+                    files.append((entry.path, target, entry.stat()))
+    return directories, symlinks, files
+
+def copy_tree(src, dst, resume=False, workers=None):
+    """
+    Copia el árbol `src` en `dst` con un pool de hilos (las llamadas de copia al
+    kernel no retienen el GIL). Con resume se omiten los archivos cuyo destino ya
+    tiene el mismo tamaño y fecha, para continuar una copia interrumpida.
+    Es un generador de Progress; los errores de archivos sueltos se acumulan y
+    se lanzan al final como shutil.Error.
+    """
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    directories, symlinks, files = _plan_tree(src, dst)
+    for _, dst_dir in directories:
+        os.makedirs(dst_dir, exist_ok=True)
+    errors = []
+    for link_src, link_dst in symlinks:
+        try:
+            if os.path.lexists(link_dst):
+                os.remove(link_dst)
+            os.symlink(os.readlink(link_src), link_dst)
+        except OSError as e:
+            errors.append((link_src, link_dst, str(e)))
+
+    files_total = len(files)
+    bytes_total = sum(st.st_size for _, _, st in files)
+    files_done = bytes_done = skipped = 0
+
+    def copy_one(file_src, file_dst, src_stat):
+        if resume and is_up_to_date(src_stat, file_dst):
+            return False
+        copy_file(file_src, file_dst, src_stat)
+        return True
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(copy_one, *item): item for item in files}
+        try:
+            for future in as_completed(futures):
+                file_src, file_dst, src_stat = futures[future]
+                try:
+                    if not future.result():
+                        skipped += 1
+                except OSError as e:
+                    errors.append((file_src, file_dst, str(e)))
+                files_done += 1
+                bytes_done += src_stat.st_size
+                yield Progress(files_done, files_total, bytes_done, bytes_total, skipped, file_src)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    # Las fechas de los directorios al final, cuando ya no se van a modificar
+    for src_dir, dst_dir in reversed(directories):
+        try:
+            shutil.copystat(src_dir, dst_dir)
+        except OSError as e:
+            errors.append((src_dir, dst_dir, str(e)))
+    if errors:
+        raise shutil.Error(errors)
+
+def copy_path(src, dst, resume=False):
+    """
+    Copia un archivo o un árbol; generador de Progress como copy_tree
+    """
+    if os.path.isdir(src):
+        yield from copy_tree(src, dst, resume)
+        return
+    src_stat = os.stat(src)
+    skipped = 0
+    if resume and is_up_to_date(src_stat, dst):
+        skipped = 1
+    else:
+        copy_file(src, dst, src_stat)
+    yield Progress(1, 1, src_stat.st_size, src_stat.st_size, skipped, src)
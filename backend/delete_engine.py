@@ -0,0 +1,77 @@
+import os
+import shutil
+import stat
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Borrado de árboles de directorios en paralelo. Cada directorio se abre una sola
+# vez y sus archivos se eliminan con unlink relativo a ese descriptor (dir_fd), sin
+# resolver la ruta completa en cada llamada. Los directorios se recorren en un pool
+# de hilos y al final se eliminan de los más profundos a la raíz.
+
+# unlink/rmdir relativos a un descriptor no existen en todas las plataformas
+SUPPORTS_DIR_FD = os.unlink in os.supports_dir_fd and os.scandir in os.supports_fd
+
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_NOFOLLOW', 0)
+
+def _clear_directory(path):
+    """
+    Elimina todo lo que no es un directorio dentro de `path` y devuelve
+    (subdirectorios, errores)
+    """
+    subdirs = []
+    errors = []
+    fd = os.open(path, _OPEN_FLAGS)
+    try:
+        with os.scandir(fd) as it:
+            for entry in it:
+                try:
+                    # Los enlaces a directorios se eliminan como enlaces, sin recorrerlos
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(os.path.join(path, entry.name))
+                    else:
+                        os.unlink(entry.name, dir_fd=fd)
+                except OSError as e:
+                    errors.append((os.path.join(path, entry.name), str(e)))
+    finally:
+        os.close(fd)
+    return subdirs, errors
+
+def remove_tree(path, workers=None):
+    """
+    Elimina el directorio `path` y todo su contenido. Devuelve la lista de
+    errores (ruta, mensaje); vacía si se eliminó todo.
+    """
+    if os.path.islink(path) or not stat.S_ISDIR(os.lstat(path).st_mode):
+        raise NotADirectoryError(path)
+    if not SUPPORTS_DIR_FD:
+        errors = []
+        shutil.rmtree(path, onerror=lambda func, failed, exc: errors.append((failed, str(exc[1]))))
+        return errors
+
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    directories = [path]
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {pool.submit(_clear_directory, path): path}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                failed_dir = running.pop(future)
+                try:
+                    subdirs, dir_errors = future.result()
+                except OSError as e:
+                    errors.append((failed_dir, str(e)))
+                    continue
+                errors.extend(dir_errors)
+                directories.extend(subdirs)
+                for subdir in subdirs:
+                    running[pool.submit(_clear_directory, subdir)] = subdir
+
+    # Los subdirectorios siempre aparecen después de su padre: al revés, primero los más profundos
+    for directory in reversed(directories):
+        try:
+            os.rmdir(directory)
+        except OSError as e:
+            if not any(failed.startswith(directory + os.sep) for failed, _ in errors):
+                errors.append((directory, str(e)))
+    return errors
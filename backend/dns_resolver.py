@@ -0,0 +1,292 @@
+import asyncio
+import ipaddress
+import random
+import struct
+import time
+from collections import namedtuple
+
+from cache import LRUCache
+
+# Cliente DNS en proceso: construye y analiza los paquetes en formato de red
+# (RFC 1035) y los envía por UDP, repitiendo por TCP si la respuesta llega truncada.
+
+RECORD_TYPES = {
+    'A': 1,
+    'NS': 2,
+    'CNAME': 5,
+    'SOA': 6,
+    'MX': 15,
+    'TXT': 16,
+    'AAAA': 28,
+}
+TYPE_NAMES = {code: name for name, code in RECORD_TYPES.items()}
+
+# Tipos que se pueden pedir con dig
+DNS_RECORD_TYPES = ["A", "AAAA", "MX", "NS", "TXT", "SOA"]
+
+RCODES = {0: 'NOERROR', 1: 'FORMERR', 2: 'SERVFAIL', 3: 'NXDOMAIN', 4: 'NOTIMP', 5: 'REFUSED'}
+
+CLASS_IN = 1
+DNS_PORT = 53
+
+# Espera por intento y número de intentos por servidor
+QUERY_TIMEOUT = 2.0
+QUERY_ATTEMPTS = 2
+
+# Servidores usados si no hay /etc/resolv.conf (Windows, contenedores mínimos)
+FALLBACK_NAMESERVERS = ['1.1.1.1', '8.8.8.8']
+
+# TTL máximo que se respeta en caché y TTL de las respuestas sin registros
+MAX_CACHE_TTL = 3600
+NEGATIVE_CACHE_TTL = 60
+
+Record = namedtuple('Record', ['name', 'type', 'ttl', 'data'])
+Response = namedtuple('Response', ['name', 'type', 'rcode', 'answers', 'authority', 'server'])
+
+class DNSError(Exception):
+    pass
+
+# (nombre, tipo, servidor, puerto) -> (caduca_en, Response)
+response_cache = LRUCache(max_entries=4096, max_bytes=8 * 1024 * 1024,
+                          sizeof=lambda key, value: 256 + 128 * (len(value[1].answers) + len(value[1].authority)))
+
+def system_nameservers(path='/etc/resolv.conf'):
+    servers = []
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == 'nameserver':
+                    servers.append(parts[1])
+    except OSError:
+        pass
+    return servers or list(FALLBACK_NAMESERVERS)
+
+# ---------------------------------------------------------------------------
+# Formato de los paquetes
+# ---------------------------------------------------------------------------
+
+def encode_name(name):
+    labels = [label for label in name.rstrip('.').split('.') if label] if name != '.' else []
+    out = bytearray()
+    for label in labels:
+        encoded = label.encode('idna') if not label.isascii() else label.encode('ascii')
+        if len(encoded) > 63:
+            raise DNSError(f"Etiqueta demasiado larga: {label}")
+        out.append(len(encoded))
+        out += encoded
+    out.append(0)
+    if len(out) > 255:
+        raise DNSError(f"Nombre demasiado largo: {name}")
+    return bytes(out)
+
+def build_query(name, qtype, query_id):
+    # Cabecera: id, flags (RD: recursión deseada), 1 pregunta, 0 respuestas
+    header = struct.pack('!HHHHHH', query_id, 0x0100, 1, 0, 0, 0)
+    return header + encode_name(name) + struct.pack('!HH', RECORD_TYPES[qtype], CLASS_IN)
+
+def decode_name(data, offset):
+    """
+    Lee un nombre (con punteros de compresión) y devuelve (nombre, siguiente offset)
+    """
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(data):
+            raise DNSError("Respuesta DNS truncada")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(data):
+                raise DNSError("Respuesta DNS truncada")
+            if end is None:
+                end = offset + 2
+            jumps += 1
+            if jumps > 64:
+                raise DNSError("Bucle de compresión en la respuesta DNS")
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            continue
+        offset += 1
+        if length == 0:
+            break
+        if offset + length > len(data):
+            raise DNSError("Respuesta DNS truncada")
+        labels.append(data[offset:offset + length].decode('ascii', errors='replace'))
+        offset += length
+    return '.'.join(labels) + '.', end if end is not None else offset
+
+def _decode_rdata(data, rtype, offset, length):
+    rdata = data[offset:offset + length]
+    if rtype == RECORD_TYPES['A'] and length == 4:
+        return str(ipaddress.IPv4Address(rdata))
+    if rtype == RECORD_TYPES['AAAA'] and length == 16:
+        return str(ipaddress.IPv6Address(rdata))
+    if rtype in (RECORD_TYPES['NS'], RECORD_TYPES['CNAME']):
+        return decode_name(data, offset)[0]
+    if rtype == RECORD_TYPES['MX']:
+        if length < 3:
+            raise DNSError("Registro MX incompleto")
+        preference = struct.unpack('!H', rdata[:2])[0]
+        return f"{preference} {decode_name(data, offset + 2)[0]}"
+    if rtype == RECORD_TYPES['TXT']:
+        strings = []
+        pos = 0
+        while pos < length:
+            size = rdata[pos]
+            if pos + 1 + size > length:
+                raise DNSError("Registro TXT incompleto")
+            strings.append('"' + rdata[pos + 1:pos + 1 + size].decode('utf-8', errors='replace') + '"')
+            pos += 1 + size
+        return ' '.join(strings)
+    if rtype == RECORD_TYPES['SOA']:
+        mname, pos = decode_name(data, offset)
+        rname, pos = decode_name(data, pos)
+        if pos + 20 > offset + length:
+            raise DNSError("Registro SOA incompleto")
+        serial, refresh, retry, expire, minimum = struct.unpack('!IIIII', data[pos:pos + 20])
+        return f"{mname} {rname} {serial} {refresh} {retry} {expire} {minimum}"
+    return rdata.hex()
+
+def _read_records(data, offset, count):
+    records = []
+    for _ in range(count):
+        name, offset = decode_name(data, offset)
+        if offset + 10 > len(data):
+            raise DNSError("Respuesta DNS truncada")
+        rtype, rclass, ttl, length = struct.unpack('!HHIH', data[offset:offset + 10])
+        offset += 10
+        if offset + length > len(data):
+            raise DNSError("Respuesta DNS truncada")
+        records.append(Record(name, TYPE_NAMES.get(rtype, str(rtype)), ttl,
+                              _decode_rdata(data, rtype, offset, length)))
+        offset += length
+    return records, offset
+
+def parse_response(data, query_id, name, qtype, server=None):
+    """
+    Devuelve (Response, truncada)
+    """
+    if len(data) < 12:
+        raise DNSError("Respuesta DNS demasiado corta")
+    response_id, flags, qdcount, ancount, nscount, _ = struct.unpack('!HHHHHH', data[:12])
+    if response_id != query_id or not flags & 0x8000:
+        raise DNSError("La respuesta no corresponde a la consulta")
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = decode_name(data, offset)
+        offset += 4
+    truncated = bool(flags & 0x0200)
+    answers, offset = _read_records(data, offset, ancount)
+    authority, offset = _read_records(data, offset, nscount)
+    rcode = RCODES.get(flags & 0x000F, str(flags & 0x000F))
+    return Response(name, qtype, rcode, answers, authority, server), truncated
+
+# ---------------------------------------------------------------------------
+# Transporte
+# ---------------------------------------------------------------------------
+
+class _UDPQuery(asyncio.DatagramProtocol):
+    def __init__(self, packet):
+        self.packet = packet
+        self.future = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport):
+        transport.sendto(self.packet)
+
+    def datagram_received(self, data, addr):
+        if not self.future.done():
+            self.future.set_result(data)
+
+    def error_received(self, exc):
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+async def _query_udp(packet, server, port, timeout):
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: _UDPQuery(packet), remote_addr=(server, port))
+    try:
+        return await asyncio.wait_for(protocol.future, timeout)
+    finally:
+        transport.close()
+
+async def _query_tcp(packet, server, port, timeout):
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(server, port), timeout)
+    try:
+        writer.write(struct.pack('!H', len(packet)) + packet)
+        await writer.drain()
+        length = struct.unpack('!H', await asyncio.wait_for(reader.readexactly(2), timeout))[0]
+        return await asyncio.wait_for(reader.readexactly(length), timeout)
+    finally:
+        writer.close()
+
+def _cache_ttl(response):
+    ttls = [record.ttl for record in response.answers]
+    if not ttls:
+        # Respuesta negativa: el mínimo del SOA de la autoridad (RFC 2308)
+        ttls = [min(record.ttl, int(record.data.split()[-1]))
+                for record in response.authority if record.type == 'SOA'] or [NEGATIVE_CACHE_TTL]
+        ttls = [min(ttl, NEGATIVE_CACHE_TTL) for ttl in ttls]
+    return min(min(ttls), MAX_CACHE_TTL)
+
+async def query(name, qtype='A', servers=None, port=DNS_PORT, tcp=False,
+                timeout=QUERY_TIMEOUT, use_cache=True):
+    """
+    Resuelve un nombre y tipo. Prueba los servidores en orden y respeta el TTL
+    de las respuestas en la caché.
+    """
+    qtype = qtype.upper()
+    if qtype not in RECORD_TYPES:
+        raise DNSError(f"Tipo de registro no soportado: {qtype}")
+    if not name.endswith('.'):
+        name += '.'
+    servers = servers or system_nameservers()
+
+    key = (name.lower(), qtype, tuple(servers), port)
+    if use_cache:
+        cached = response_cache.get(key, valid=lambda cached: cached[0] > time.monotonic())
+        if cached is not None:
+            return cached[1]
+
+    last_error = None
+    for server in servers:
+        for _ in range(QUERY_ATTEMPTS):
+            query_id = random.getrandbits(16)
+            packet = build_query(name, qtype, query_id)
+            try:
+                if tcp:
+                    data = await _query_tcp(packet, server, port, timeout)
+                    response, _ = parse_response(data, query_id, name, qtype, server)
+                else:
+                    data = await _query_udp(packet, server, port, timeout)
+                    response, truncated = parse_response(data, query_id, name, qtype, server)
+                    if truncated:
+                        data = await _query_tcp(packet, server, port, timeout)
+                        response, _ = parse_response(data, query_id, name, qtype, server)
+            except (asyncio.TimeoutError, OSError, DNSError, asyncio.IncompleteReadError) as e:
+                last_error = e
+                continue
+            if response.rcode in ('SERVFAIL', 'REFUSED'):
+                last_error = DNSError(f"{server} respondió {response.rcode}")
+                break  # Probar con el siguiente servidor
+            if use_cache:
+                response_cache.put(key, (time.monotonic() + _cache_ttl(response), response))
+            return response
+
+    if isinstance(last_error, asyncio.TimeoutError):
+        raise DNSError(f"Sin respuesta de {', '.join(servers)}")
+    raise DNSError(str(last_error) if last_error else "Sin servidores DNS")
+
+async def query_many(questions, **options):
+    """
+    Resuelve varias (nombre, tipo) a la vez. Devuelve, en el mismo orden, una
+    Response o la excepción DNSError de cada consulta.
+    """
+    return await asyncio.gather(*(query(name, qtype, **options) for name, qtype in questions),
+                                return_exceptions=True)
+
+def resolve(questions, **options):
+    """
+    Versión bloqueante de query_many (para el servidor Flask y la CLI)
+    """
+    return asyncio.run(query_many(questions, **options))
@@ -0,0 +1,148 @@
+import mmap
+import os
+import stat as stat_module
+from collections import namedtuple
+from contextlib import contextmanager
+
+# Máximo de bytes que se devuelven en una sola lectura; el resto se pide con el
+# token de continuación
+MAX_READ_BYTES = 1024 * 1024
+
+# Los archivos regulares más pequeños se leen con read(); sólo los mayores se
+# proyectan con mmap
+MMAP_MIN_BYTES = 4 * MAX_READ_BYTES
+
+# Máximo que se lee de lo que no tiene un tamaño fiable: pseudo-archivos de
+# /proc y /sys (tamaño 0 o fijo), dispositivos y FIFOs
+MAX_SPECIAL_FILE_BYTES = 8 * MAX_READ_BYTES
+
+# content       -> texto leído
+# next_token    -> token para continuar la lectura, o None si se llegó al final pedido
+# offset, end   -> posición en bytes del fragmento dentro del archivo
+# size          -> tamaño total del archivo
+ReadResult = namedtuple('ReadResult', ['content', 'next_token', 'offset', 'end', 'size'])
+
+def make_token(offset, stop, stat):
+    """
+    Token de continuación: posición siguiente, fin del rango pedido e inodo del
+    archivo (para detectar que se ha reemplazado entre dos páginas)
+    """
+    return f"{offset:x}-{stop:x}-{stat.st_ino:x}"
+
+def parse_token(token, stat, size):
+    try:
+        offset, stop, inode = (int(part, 16) for part in token.split('-'))
+    except ValueError:
+        raise ValueError("Token de continuación no válido")
+    if inode != stat.st_ino or stop > size:
+        raise ValueError("El archivo ha cambiado desde la lectura anterior")
+    return offset, stop
+
+def _utf8_boundary(mm, end, start):
+    """
+    Retrocede `end` hasta no partir un carácter UTF-8 de varios bytes
+    """
+    pos = end
+    while pos > start + 1 and end - pos < 3 and (mm[pos] & 0xC0) == 0x80:
+        pos -= 1
+    return pos if (mm[pos] & 0xC0) != 0x80 else end
+
+def _line_start_offset(mm, size, lines):
+    """
+    Posición en que empiezan las últimas `lines` líneas
+    """
+    pos = size
+    # Un salto de línea final no abre una línea nueva
+    if size and mm[size - 1] == 0x0A:
+        pos -= 1
+    for _ in range(lines):
+        pos = mm.rfind(b'\n', 0, pos)
+        if pos < 0:
+            return 0
+    return pos + 1
+
+def _line_end_offset(mm, start, size, lines):
+    """
+    Posición en que terminan las `lines` líneas a partir de `start`
+    """
+    pos = start
+    for _ in range(lines):
+        pos = mm.find(b'\n', pos, size)
+        if pos < 0:
+            return size
+        pos += 1
+    return pos
+
+@contextmanager
+def _contents(f, stat):
+    """
+    Contenido del archivo abierto como objeto indexable (bytes o mmap) y su tamaño
+    """
+    if not stat_module.S_ISREG(stat.st_mode) or stat.st_size < MMAP_MIN_BYTES:
+        # Con tamaño 0 (/proc) o sin tamaño (dispositivos) se lee hasta el límite
+        limit = stat.st_size if stat.st_size and stat_module.S_ISREG(stat.st_mode) else MAX_SPECIAL_FILE_BYTES
+        data = f.read(limit)
+        yield data, len(data)
+        return
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Sistemas de archivos que no admiten mmap
+        data = f.read(MAX_SPECIAL_FILE_BYTES)
+        yield data, len(data)
+        return
+    with mm:
+        yield mm, stat.st_size
+
+def _copy(data, f, start, end):
+    """
+    Copia data[start:end]. En un mmap, leer más allá del final de un archivo que
+    se ha truncado mientras tanto termina el proceso (SIGBUS): antes de copiar
+    se comprueba que el archivo sigue teniendo ese tamaño.
+    """
+    if isinstance(data, mmap.mmap) and os.fstat(f.fileno()).st_size < end:
+        raise ValueError("El archivo ha cambiado durante la lectura")
+    return data[start:end]
+
+def read_file(path, offset=0, length=None, head=None, tail=None, token=None, max_bytes=MAX_READ_BYTES):
+    """
+    Lee un rango del archivo sin cargarlo entero en memoria:
+      - offset/length: rango en bytes
+      - head: primeras N líneas desde offset
+      - tail: últimas N líneas
+      - token: continúa una lectura anterior que se cortó por max_bytes
+    Nunca devuelve más de max_bytes; si el rango pedido es mayor, next_token
+    permite pedir el resto. Los archivos pequeños y los que no son regulares
+    (/proc, /sys, dispositivos) se leen con read(), con un máximo de
+    MAX_SPECIAL_FILE_BYTES para estos últimos.
+    """
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        with _contents(f, stat) as (data, size):
+            stop = None
+            if token is not None:
+                offset, stop = parse_token(token, stat, size)
+            if offset < 0 or offset > size:
+                raise ValueError(f"Posición fuera del archivo (tamaño {size} bytes)")
+            if size == 0:
+                return ReadResult("", None, 0, 0, 0)
+
+            if stop is not None:
+                pass  # Continuación: el rango ya viene en el token
+            elif tail is not None:
+                offset = max(offset, _line_start_offset(data, size, tail))
+                stop = size
+            elif head is not None:
+                stop = _line_end_offset(data, offset, size, head)
+            elif length is not None:
+                stop = min(size, offset + length)
+            else:
+                stop = size
+
+            end = min(stop, offset + max_bytes)
+            if end < stop:
+                end = _utf8_boundary(data, end, offset)
+            content = _copy(data, f, offset, end).decode('utf-8', errors='replace')
+
+    next_token = make_token(end, stop, stat) if end < stop else None
+    return ReadResult(content, next_token, offset, end, size)
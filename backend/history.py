@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+# Directorio con el historial persistente de cada sesión (un archivo JSONL por
+# sesión). Por defecto el historial sólo se guarda en memoria; para conservarlo
+# entre reinicios hay que indicarlo, por ejemplo:
+#   TERMINAL_HISTORY_DIR=instance/history python app.py
+HISTORY_DIR = os.environ.get('TERMINAL_HISTORY_DIR', '')
+
+# Comandos que se conservan por sesión (los más antiguos se descartan)
+HISTORY_CAPACITY = 1000
+
+# Entradas por página cuando no se indica otro tamaño
+HISTORY_PAGE_SIZE = 50
+
+# Tamaño máximo de página aceptado por /history
+MAX_HISTORY_PAGE_SIZE = 500
+
+# number: posición del comando en el historial completo de la sesión (no cambia
+# aunque las entradas más antiguas salgan del buffer)
+HistoryEntry = namedtuple('HistoryEntry', ['number', 'command', 'timestamp'])
+
+def _history_path(session_id):
+    # El id lo elige el cliente: no se usa directamente como nombre de archivo
+    digest = hashlib.sha256(session_id.encode('utf-8')).hexdigest()[:32]
+    return os.path.join(HISTORY_DIR, f"{digest}.jsonl")
+
+class HistoryStore:
+    """
+    Historial de comandos de una sesión: buffer circular de tamaño fijo en
+    memoria y, opcionalmente, un archivo JSONL al que sólo se añaden líneas.
+    Las consultas recorren únicamente las entradas que devuelven.
+    """
+
+    def __init__(self, session_id, capacity=HISTORY_CAPACITY, path=None):
+        self.capacity = capacity
+        self.path = path if path is not None else (_history_path(session_id) if HISTORY_DIR else None)
+        self._slots = [None] * capacity
+        self._next = 1  # Número que recibirá el próximo comando
+        self._lock = threading.Lock()
+        self._file = None
+        if self.path:
+            self._load()
+
+    def _load(self):
+        """
+        Recupera las últimas entradas del archivo y lo compacta si ha crecido
+        mucho más que la capacidad del buffer
+        """
+        lines = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        number, command, timestamp = json.loads(line)
+                    except ValueError:
+                        continue  # Línea incompleta (por ejemplo, tras un corte)
+                    lines += 1
+                    self._slots[number % self.capacity] = HistoryEntry(number, command, timestamp)
+                    self._next = max(self._next, number + 1)
+        except FileNotFoundError:
+            pass
+        if lines > 2 * self.capacity:
+            self._compact()
+
+    def _compact(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self._range(self._first(), self._next):
+                f.write(json.dumps(list(entry), ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def _first(self):
+        return max(1, self._next - self.capacity)
+
+    def _range(self, start, stop, step=1):
+        for number in range(start, stop, step):
+            entry = self._slots[number % self.capacity]
+            if entry is not None and entry.number == number:
+                yield entry
+
+    def append(self, command):
+        with self._lock:
+            entry = HistoryEntry(self._next, command, time.time())
+            self._slots[entry.number % self.capacity] = entry
+            self._next += 1
+            if self.path:
+                try:
+                    if self._file is None:
+                        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                        self._file = open(self.path, 'a', encoding='utf-8')
+                    self._file.write(json.dumps(list(entry), ensure_ascii=False) + "\n")
+                    self._file.flush()
+                except OSError:
+                    pass  # Sin disco disponible el historial sigue funcionando en memoria
+            return entry
+
+    def __len__(self):
+        return self._next - self._first()
+
+    def __iter__(self):
+        """
+        Comandos del más antiguo al más reciente
+        """
+        with self._lock:
+            return iter([entry.command for entry in self._range(self._first(), self._next)])
+
+    def page(self, page=0, page_size=HISTORY_PAGE_SIZE):
+        """
+        Página `page` contando desde el final (0 = los comandos más recientes),
+        en orden cronológico
+        """
+        with self._lock:
+            stop = max(self._next - page * page_size, self._first())
+            start = max(stop - page_size, self._first())
+            return list(self._range(start, stop))
+
+    def search(self, text, prefix=False, page=0, page_size=HISTORY_PAGE_SIZE):
+        """
+        Coincidencias con `text` (como prefijo o subcadena), de la más reciente a
+        la más antigua, saltando las `page * page_size` primeras
+        """
+        skip = page * page_size
+        matches = []
+        with self._lock:
+            for entry in self._range(self._next - 1, self._first() - 1, -1):
+                command = entry.command
+                if command.startswith(text) if prefix else text in command:
+                    if skip:
+                        skip -= 1
+                        continue
+                    matches.append(entry)
+                    if len(matches) == page_size:
+                        break
+        return matches
+
+    def close(self):
+        """
+        Cierra el archivo del historial (se vuelve a abrir si se añade otro comando)
+        """
+        with self._lock:
+            self._close_file()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        with self._lock:
+            self._slots = [None] * self.capacity
+            self._next = 1
+            self._close_file()
+            if self.path:
+                try:
+                    os.remove(self.path)
+                except FileNotFoundError:
+                    pass
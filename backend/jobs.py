@@ -0,0 +1,249 @@
+import signal
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import procs
+
+# Trabajos en segundo plano (comando &). Se ejecutan en un grupo de hilos
+# acotado; cada trabajo guarda su estado, las últimas líneas de salida y el
+# código de salida, que se consultan con jobs/fg o con /jobs/<id>.
+
+# Trabajos ejecutándose a la vez (el resto esperan en cola)
+MAX_RUNNING_JOBS = 4
+
+# Trabajos sin terminar por sesión
+MAX_ACTIVE_JOBS = 16
+
+# Trabajos terminados que se conservan por sesión (se descartan los más antiguos)
+MAX_FINISHED_JOBS = 32
+
+# Líneas de salida que se guardan de cada trabajo (las más recientes)
+MAX_OUTPUT_LINES = 5000
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+KILLED = 'killed'
+
+FINISHED_STATES = (DONE, FAILED, KILLED)
+
+STATE_LABELS = {
+    PENDING: 'En cola',
+    RUNNING: 'Ejecutando',
+    DONE: 'Hecho',
+    FAILED: 'Salida',
+    KILLED: 'Terminado',
+}
+
+# Comando a ejecutar en segundo plano: (comando, argumentos), pipeline.Pipeline
+# o sequence.Sequence
+Background = namedtuple('Background', ['command'])
+
+class Job:
+    """
+    Trabajo en segundo plano de una sesión
+    """
+
+    def __init__(self, job_id, session_id, command, cwd):
+        self.id = job_id
+        self.session_id = session_id
+        self.command = command
+        self.cwd = cwd
+        self.state = PENDING
+        self.exit_code = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.output = deque(maxlen=MAX_OUTPUT_LINES)
+        self.lines = 0  # Líneas producidas en total (incluidas las descartadas)
+        self.processes = procs.ProcessSet()  # Procesos en curso del trabajo (para kill)
+        self.cancelled = threading.Event()
+        self.changed = threading.Condition()
+
+    @property
+    def finished_state(self):
+        return self.state in FINISHED_STATES
+
+    def append(self, chunk):
+        with self.changed:
+            for line in chunk.split('\n'):
+                self.output.append(line)
+                self.lines += 1
+            self.changed.notify_all()
+
+    def finish(self, state, exit_code):
+        with self.changed:
+            if self.state != KILLED:
+                self.state = state
+                self.exit_code = exit_code
+            self.finished = time.time()
+            self.changed.notify_all()
+
+    def lines_since(self, since):
+        """
+        Devuelve (líneas a partir de la número `since`, número de la siguiente).
+        Las líneas que ya no se guardan se omiten.
+        """
+        with self.changed:
+            first = self.lines - len(self.output)
+            start = max(since, first) - first
+            return list(self.output)[start:], self.lines
+
+    def wait(self, since=0, timeout=None):
+        """
+        Espera a que haya líneas nuevas o a que termine el trabajo
+        """
+        with self.changed:
+            self.changed.wait_for(lambda: self.lines > since or self.finished_state, timeout)
+
+    def follow(self):
+        """
+        Salida del trabajo (la guardada y la que vaya produciendo) hasta que termine
+        """
+        since = 0
+        while True:
+            self.wait(since)
+            lines, since = self.lines_since(since)
+            if lines:
+                yield '\n'.join(lines)
+            elif self.finished_state:
+                return
+
+    def announcement(self):
+        """
+        Respuesta al lanzar el trabajo, como en el shell: [1] comando
+        """
+        return f"[{self.id}] {self.command}"
+
+    def status_line(self):
+        label = STATE_LABELS[self.state]
+        if self.state == FAILED:
+            label = f"{label} {self.exit_code}"
+        return f"[{self.id}] {label.ljust(12)} {self.command}"
+
+    def to_dict(self, since=0):
+        lines, next_line = self.lines_since(since)
+        return {
+            'id': self.id,
+            'command': self.command,
+            'cwd': self.cwd,
+            'state': self.state,
+            'exit_code': self.exit_code,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'output': lines,
+            'next': next_line,
+        }
+
+
+class JobManager:
+    """
+    Trabajos de todas las sesiones y el grupo de hilos que los ejecuta
+    """
+
+    def __init__(self, max_running=MAX_RUNNING_JOBS):
+        self.executor = ThreadPoolExecutor(max_workers=max_running, thread_name_prefix='job')
+        self.lock = threading.Lock()
+        self.jobs = {}  # session_id -> {id: Job}
+        self.counters = {}  # session_id -> último id asignado
+
+    def submit(self, session, command, run):
+        """
+        Encola `run(session, status)` (iterador de fragmentos de salida; al
+        terminar status['failed'] indica si falló) y devuelve el Job, o un
+        mensaje de error si la sesión tiene demasiados trabajos activos.
+        El trabajo trabaja sobre una copia de la sesión: un cd dentro de él no
+        cambia el directorio de la sesión.
+        """
+        with self.lock:
+            session_jobs = self.jobs.setdefault(session.id, {})
+            if sum(1 for job in session_jobs.values() if not job.finished_state) >= MAX_ACTIVE_JOBS:
+                return f"Error: Demasiados trabajos en segundo plano (máximo {MAX_ACTIVE_JOBS})"
+            self._prune(session_jobs)
+            job_id = self.counters.get(session.id, 0) + 1
+            self.counters[session.id] = job_id
+            job = Job(job_id, session.id, command, session.cwd)
+            session_jobs[job_id] = job
+        self.executor.submit(self._run, job, session.fork(), run)
+        return job
+
+    @staticmethod
+    def _prune(session_jobs):
+        finished = [job_id for job_id, job in session_jobs.items() if job.finished_state]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS + 1)]:
+            del session_jobs[job_id]
+
+    @staticmethod
+    def _run(job, session, run):
+        with job.changed:
+            if job.cancelled.is_set():
+                # Cancelado mientras esperaba en la cola
+                job.finished = time.time()
+                return
+            job.state = RUNNING
+            job.started = time.time()
+        status = {}
+        output = run(session, status)
+        try:
+            with procs.track_processes(job.processes), procs.limited(procs.BACKGROUND_LIMITS):
+                for chunk in output:
+                    if job.cancelled.is_set():
+                        break
+                    job.append(chunk)
+        except Exception as e:
+            job.append(str(e))
+            status['failed'] = True
+        finally:
+            # Cierra el generador: los procesos que queden se terminan
+            output.close()
+        failed = status.get('failed', True)
+        job.finish(FAILED if failed else DONE, status.get('returncode', 1 if failed else 0))
+
+    def get(self, session_id, job_id):
+        with self.lock:
+            return self.jobs.get(session_id, {}).get(job_id)
+
+    def list(self, session_id):
+        with self.lock:
+            return list(self.jobs.get(session_id, {}).values())
+
+    def active_count(self):
+        """
+        Trabajos sin terminar de todas las sesiones
+        """
+        with self.lock:
+            return sum(1 for session_jobs in self.jobs.values()
+                       for job in session_jobs.values() if not job.finished_state)
+
+    def latest(self, session_id):
+        jobs = self.list(session_id)
+        return jobs[-1] if jobs else None
+
+    def kill(self, job):
+        """
+        Cancela el trabajo y termina sus procesos. Los comandos internos se
+        detienen al producir el siguiente fragmento de salida.
+        """
+        with job.changed:
+            if job.finished_state:
+                return False
+            job.cancelled.set()
+            job.state = KILLED
+            job.exit_code = 128 + signal.SIGTERM  # Como un proceso terminado con SIGTERM en el shell
+            job.changed.notify_all()
+        job.processes.kill(signal.SIGTERM)
+        return True
+
+
+manager = JobManager()
+
+def parse_job_id(text):
+    """
+    Número de trabajo de `1` o `%1`, o None si no es válido
+    """
+    text = text[1:] if text.startswith('%') else text
+    return int(text) if text.isdigit() else None
@@ -0,0 +1,175 @@
+import json
+import os
+import stat
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from cache import LRUCache
+
+try:
+    import grp
+    import pwd
+except ImportError:  # Windows
+    grp = pwd = None
+
+# Segundos que se reutiliza el listado de un directorio si su mtime no ha cambiado.
+# El mtime del directorio no cambia cuando se modifica un archivo que ya existía
+# (su tamaño o fecha), por eso el listado caduca igualmente pasado este tiempo.
+LISTING_CACHE_TTL = 2.0
+
+Entry = namedtuple('Entry', ['name', 'path', 'is_dir', 'is_symlink', 'mode', 'nlink',
+                             'uid', 'gid', 'size', 'mtime'])
+
+# path -> (mtime_ns del directorio, caduca_en, entradas)
+listing_cache = LRUCache(max_entries=256, max_bytes=32 * 1024 * 1024,
+                         sizeof=lambda path, value: len(path) + 200 * len(value[2]))
+
+SORT_KEYS = {
+    'name': lambda entry: entry.name.lower(),
+    'size': lambda entry: -entry.size,
+    'time': lambda entry: -entry.mtime,
+    'extension': lambda entry: (os.path.splitext(entry.name)[1].lower(), entry.name.lower()),
+}
+
+def _entry(dir_entry):
+    st = dir_entry.stat(follow_symlinks=False)
+    return Entry(dir_entry.name, dir_entry.path, dir_entry.is_dir(), dir_entry.is_symlink(),
+                 st.st_mode, st.st_nlink, st.st_uid, st.st_gid, st.st_size, st.st_mtime)
+
+def scan_directory(path):
+    """
+    Entradas del directorio (incluidas las ocultas), desde la caché si el
+    directorio no ha cambiado
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = listing_cache.get(path, valid=lambda cached: cached[0] == mtime_ns and cached[1] > time.monotonic())
+    if cached is not None:
+        return cached[2]
+    entries = []
+    with os.scandir(path) as it:
+        for dir_entry in it:
+            try:
+                entries.append(_entry(dir_entry))
+            except FileNotFoundError:
+                pass  # Borrado mientras se recorría el directorio
+    listing_cache.put(path, (mtime_ns, time.monotonic() + LISTING_CACHE_TTL, entries))
+    return entries
+
+def _file_entry(path):
+    st = os.lstat(path)
+    return Entry(os.path.basename(path), path, os.path.isdir(path), stat.S_ISLNK(st.st_mode),
+                 st.st_mode, st.st_nlink, st.st_uid, st.st_gid, st.st_size, st.st_mtime)
+
+def _owner(uid):
+    if pwd is not None:
+        try:
+            return pwd.getpwuid(uid).pw_name
+        except KeyError:
+            pass
+    return str(uid)
+
+def _group(gid):
+    if grp is not None:
+        try:
+            return grp.getgrgid(gid).gr_name
+        except KeyError:
+            pass
+    return str(gid)
+
+def _long_format(entries):
+    """
+    Formato de `ls -l`: permisos, enlaces, dueño, grupo, tamaño, fecha y nombre
+    """
+    rows = [(stat.filemode(e.mode), str(e.nlink), _owner(e.uid), _group(e.gid), str(e.size),
+             datetime.fromtimestamp(e.mtime).strftime('%b %d %H:%M'),
+             f"{e.name} -> {os.readlink(e.path)}" if e.is_symlink else e.name)
+            for e in entries]
+    widths = [max((len(row[i]) for row in rows), default=0) for i in range(5)]
+    return [f"{mode} {nlink.rjust(widths[1])} {owner.ljust(widths[2])} {group.ljust(widths[3])} "
+            f"{size.rjust(widths[4])} {date} {name}"
+            for mode, nlink, owner, group, size, date, name in rows]
+
+def _as_json(entry):
+    return {
+        'name': entry.name,
+        'type': 'symlink' if entry.is_symlink else 'directory' if entry.is_dir else 'file',
+        'size': entry.size,
+        'mtime': entry.mtime,
+        'mode': stat.filemode(entry.mode),
+    }
+
+def list_directory(path, show_all=False, sort='name', reverse=False):
+    entries = [e for e in scan_directory(path) if show_all or not e.name.startswith('.')]
+    # Orden estable: primero por nombre y después por el criterio pedido
+    entries.sort(key=SORT_KEYS['name'])
+    if sort != 'name':
+        entries.sort(key=SORT_KEYS[sort])
+    if reverse:
+        entries.reverse()
+    return entries
+
+def iter_listing(targets, errors, long=False, show_all=False, recursive=False, sort='name', reverse=False):
+    """
+    Produce el listado de `targets` (pares (ruta mostrada, ruta absoluta)) por
+    bloques de texto: uno por directorio. Los mensajes de las rutas que no se
+    pueden listar se añaden a la lista `errors`, no a la salida.
+    """
+    files = []
+    directories = []
+    for shown, path in targets:
+        if not os.path.lexists(path):
+            errors.append(f"Error: No existe el archivo o directorio: {shown}")
+        elif os.path.isdir(path):
+            directories.append((shown, path))
+        else:
+            files.append(_file_entry(path)._replace(name=shown))
+
+    if files:
+        yield "\n".join(_long_format(files) if long else [e.name for e in files])
+
+    with_headers = recursive or len(directories) > 1 or bool(files)
+    first = not files
+    pending = list(reversed(directories))
+    while pending:
+        shown, path = pending.pop()
+        try:
+            entries = list_directory(path, show_all, sort, reverse)
+        except PermissionError:
+            errors.append(f"Error: Sin permisos para acceder a: {shown}")
+            continue
+        # Como ls: una línea en blanco separa el bloque de cada directorio
+        lines = ([] if first else [""]) + ([f"{shown}:"] if with_headers else [])
+        first = False
+        lines.extend(_long_format(entries) if long else [e.name for e in entries])
+        yield "\n".join(lines)
+        if recursive:
+            # Los enlaces a directorios no se recorren (podrían formar ciclos)
+            subdirs = [(os.path.join(shown, e.name), e.path) for e in entries
+                       if e.is_dir and not e.is_symlink]
+            pending.extend(reversed(subdirs))
+
+def listing_json(targets, show_all=False, recursive=False, sort='name', reverse=False):
+    """
+    Listado estructurado: [{path, entries: [...]}] por cada ruta (y subdirectorio con -R)
+    """
+    result = []
+    pending = list(reversed(targets))
+    while pending:
+        shown, path = pending.pop()
+        if not os.path.lexists(path):
+            result.append({'path': shown, 'entries': [], 'error': 'No existe el archivo o directorio'})
+            continue
+        if not os.path.isdir(path):
+            result.append({'path': shown, 'entries': [_as_json(_file_entry(path))]})
+            continue
+        try:
+            entries = list_directory(path, show_all, sort, reverse)
+        except PermissionError:
+            result.append({'path': shown, 'entries': [], 'error': 'Sin permisos'})
+            continue
+        result.append({'path': shown, 'entries': [_as_json(e) for e in entries]})
+        if recursive:
+            pending.extend(reversed([(os.path.join(shown, e.name), e.path) for e in entries
+                                     if e.is_dir and not e.is_symlink]))
+    return json.dumps(result, ensure_ascii=False)
@@ -0,0 +1,277 @@
+import json
+import os
+import socket
+import struct
+from collections import namedtuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# netstat e ipconfig leyendo directamente /proc/net y las interfaces del kernel,
+# sin lanzar procesos (funciona en contenedores sin net-tools ni iproute2)
+
+PROC_NET = '/proc/net'
+
+# Disponible solo en Linux; en otros sistemas se usan las herramientas externas
+AVAILABLE = os.path.isfile(os.path.join(PROC_NET, 'tcp'))
+
+TCP_STATES = {
+    0x01: 'ESTABLISHED',
+    0x02: 'SYN_SENT',
+    0x03: 'SYN_RECV',
+    0x04: 'FIN_WAIT1',
+    0x05: 'FIN_WAIT2',
+    0x06: 'TIME_WAIT',
+    0x07: 'CLOSE',
+    0x08: 'CLOSE_WAIT',
+    0x09: 'LAST_ACK',
+    0x0A: 'LISTEN',
+    0x0B: 'CLOSING',
+}
+
+PROTOCOLS = ('tcp', 'tcp6', 'udp', 'udp6')
+
+# Estados que cuentan como "en escucha": LISTEN en TCP y los sockets UDP sin
+# conectar (que /proc/net/udp marca como CLOSE)
+LISTENING_STATES = {'LISTEN', 'UNCONN'}
+
+Connection = namedtuple('Connection', ['proto', 'local_address', 'local_port', 'remote_address',
+                                       'remote_port', 'state', 'recv_q', 'send_q', 'uid', 'inode',
+                                       'pid', 'program'])
+
+Interface = namedtuple('Interface', ['index', 'name', 'flags', 'mtu', 'mac', 'ipv4', 'ipv6', 'stats'])
+
+# ioctl de Linux para consultar una interfaz (linux/sockios.h)
+SIOCGIFFLAGS = 0x8913
+SIOCGIFADDR = 0x8915
+SIOCGIFNETMASK = 0x891B
+SIOCGIFMTU = 0x8921
+
+IFF_FLAGS = [(0x1, 'UP'), (0x2, 'BROADCAST'), (0x8, 'LOOPBACK'), (0x10, 'POINTOPOINT'),
+             (0x40, 'RUNNING'), (0x100, 'PROMISC'), (0x1000, 'MULTICAST')]
+
+IPV6_SCOPES = {0x00: 'global', 0x10: 'host', 0x20: 'link', 0x40: 'site'}
+
+# ---------------------------------------------------------------------------
+# Conexiones
+# ---------------------------------------------------------------------------
+
+def _decode_address(hex_address, ipv6):
+    """
+    Dirección de /proc/net/{tcp,udp}{,6}: palabras de 32 bits en el orden de bytes del host
+    """
+    address, port = hex_address.split(':')
+    raw = bytes.fromhex(address)
+    if ipv6:
+        raw = b''.join(struct.pack('@I', *struct.unpack('>I', raw[i:i + 4])) for i in range(0, 16, 4))
+        return socket.inet_ntop(socket.AF_INET6, raw), int(port, 16)
+    return socket.inet_ntop(socket.AF_INET, struct.pack('@I', int(address, 16))), int(port, 16)
+
+def _state(proto, code):
+    if proto.startswith('udp'):
+        return 'ESTABLISHED' if code == 0x01 else 'UNCONN'
+    return TCP_STATES.get(code, str(code))
+
+def read_connections(protocols=PROTOCOLS):
+    connections = []
+    for proto in protocols:
+        try:
+            with open(os.path.join(PROC_NET, proto)) as f:
+                lines = f.readlines()[1:]
+        except OSError:
+            continue  # Sin soporte de IPv6, por ejemplo
+        ipv6 = proto.endswith('6')
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            local_address, local_port = _decode_address(fields[1], ipv6)
+            remote_address, remote_port = _decode_address(fields[2], ipv6)
+            send_q, recv_q = (int(value, 16) for value in fields[4].split(':'))
+            connections.append(Connection(proto, local_address, local_port, remote_address,
+                                          remote_port, _state(proto, int(fields[3], 16)),
+                                          recv_q, send_q, int(fields[7]), int(fields[9]), None, None))
+    return connections
+
+def socket_owners(inodes):
+    """
+    inodo -> (pid, programa) de los sockets pedidos, recorriendo /proc/<pid>/fd.
+    Los procesos de otros usuarios no se pueden leer sin privilegios y se omiten.
+    """
+    owners = {}
+    wanted = {f'socket:[{inode}]': inode for inode in inodes if inode}
+    if not wanted:
+        return owners
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        fd_dir = f'/proc/{pid}/fd'
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                target = os.readlink(os.path.join(fd_dir, fd))
+            except OSError:
+                continue
+            inode = wanted.get(target)
+            if inode is not None and inode not in owners:
+                owners[inode] = (int(pid), _program(pid))
+        if len(owners) == len(wanted):
+            break
+    return owners
+
+def _program(pid):
+    try:
+        with open(f'/proc/{pid}/comm') as f:
+            return f.read().strip()
+    except OSError:
+        return '?'
+
+def connections(protocols=PROTOCOLS, states=None, port=None, owners=True):
+    """
+    Conexiones filtradas por protocolo, estado (conjunto de nombres) y puerto
+    (local o remoto), con el pid y el programa de cada socket si owners=True
+    """
+    result = [c for c in read_connections(protocols)
+              if (states is None or c.state in states)
+              and (port is None or port in (c.local_port, c.remote_port))]
+    if owners:
+        found = socket_owners(c.inode for c in result)
+        result = [c._replace(pid=found[c.inode][0], program=found[c.inode][1]) if c.inode in found else c
+                  for c in result]
+    return result
+
+def _endpoint(address, port):
+    return f"{address}:{port if port else '*'}"
+
+def format_connections(items, owners=True):
+    header = ('Proto', 'Recv-Q', 'Send-Q', 'Local Address', 'Foreign Address', 'State')
+    rows = []
+    for c in items:
+        row = (c.proto, str(c.recv_q), str(c.send_q), _endpoint(c.local_address, c.local_port),
+               _endpoint(c.remote_address, c.remote_port), c.state)
+        if owners:
+            row += (f"{c.pid}/{c.program}" if c.pid else '-',)
+        rows.append(row)
+    if owners:
+        header += ('PID/Program name',)
+    widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+    return '\n'.join('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+                     for row in [header] + rows)
+
+def connections_json(items):
+    return json.dumps([c._asdict() for c in items], ensure_ascii=False)
+
+# ---------------------------------------------------------------------------
+# Interfaces
+# ---------------------------------------------------------------------------
+
+def read_interface_stats():
+    """
+    nombre -> contadores de /proc/net/dev
+    """
+    stats = {}
+    try:
+        with open(os.path.join(PROC_NET, 'dev')) as f:
+            lines = f.readlines()[2:]
+    except OSError:
+        return stats
+    for line in lines:
+        name, _, counters = line.partition(':')
+        values = [int(value) for value in counters.split()]
+        if len(values) < 16:
+            continue
+        stats[name.strip()] = {
+            'rx_bytes': values[0], 'rx_packets': values[1], 'rx_errors': values[2], 'rx_dropped': values[3],
+            'tx_bytes': values[8], 'tx_packets': values[9], 'tx_errors': values[10], 'tx_dropped': values[11],
+        }
+    return stats
+
+def read_ipv6_addresses():
+    """
+    nombre -> [(dirección/prefijo, ámbito)] de /proc/net/if_inet6
+    """
+    addresses = {}
+    try:
+        with open(os.path.join(PROC_NET, 'if_inet6')) as f:
+            lines = f.readlines()
+    except OSError:
+        return addresses
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 6:
+            continue
+        address = socket.inet_ntop(socket.AF_INET6, bytes.fromhex(fields[0]))
+        scope = IPV6_SCOPES.get(int(fields[3], 16), fields[3])
+        addresses.setdefault(fields[5], []).append((f"{address}/{int(fields[2], 16)}", scope))
+    return addresses
+
+def _ioctl(sock, request, name):
+    return fcntl.ioctl(sock.fileno(), request, struct.pack('256s', name.encode()[:15]))
+
+def _interface_ipv4(sock, name):
+    """
+    Dirección IPv4 principal con su prefijo, o None si la interfaz no tiene
+    """
+    try:
+        address = socket.inet_ntoa(_ioctl(sock, SIOCGIFADDR, name)[20:24])
+        netmask = _ioctl(sock, SIOCGIFNETMASK, name)[20:24]
+    except OSError:
+        return None
+    prefix = bin(int.from_bytes(netmask, 'big')).count('1')
+    return f"{address}/{prefix}"
+
+def _read_sys(name, attribute):
+    try:
+        with open(f'/sys/class/net/{name}/{attribute}') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def interfaces(name=None):
+    """
+    Interfaces de red con sus direcciones, flags, MTU y contadores
+    """
+    stats = read_interface_stats()
+    ipv6 = read_ipv6_addresses()
+    result = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for index, ifname in socket.if_nameindex():
+            if name is not None and ifname != name:
+                continue
+            try:
+                flags = struct.unpack('H', _ioctl(sock, SIOCGIFFLAGS, ifname)[16:18])[0]
+                mtu = struct.unpack('i', _ioctl(sock, SIOCGIFMTU, ifname)[16:20])[0]
+            except OSError:
+                continue  # La interfaz desapareció mientras se recorría
+            result.append(Interface(index, ifname, [label for bit, label in IFF_FLAGS if flags & bit],
+                                    mtu, _read_sys(ifname, 'address'), _interface_ipv4(sock, ifname),
+                                    ipv6.get(ifname, []), stats.get(ifname, {})))
+    return result
+
+def format_interfaces(items):
+    blocks = []
+    for iface in items:
+        lines = [f"{iface.index}: {iface.name}: <{','.join(iface.flags)}> mtu {iface.mtu}"]
+        if iface.mac:
+            lines.append(f"    link/ether {iface.mac}")
+        if iface.ipv4:
+            lines.append(f"    inet {iface.ipv4}")
+        lines.extend(f"    inet6 {address} scope {scope}" for address, scope in iface.ipv6)
+        if iface.stats:
+            s = iface.stats
+            lines.append(f"    RX: {s['rx_bytes']} bytes  {s['rx_packets']} paquetes  "
+                         f"{s['rx_errors']} errores  {s['rx_dropped']} descartados")
+            lines.append(f"    TX: {s['tx_bytes']} bytes  {s['tx_packets']} paquetes  "
+                         f"{s['tx_errors']} errores  {s['tx_dropped']} descartados")
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks)
+
+def interfaces_json(items):
+    return json.dumps([{**iface._asdict(),
+                        'ipv6': [{'address': address, 'scope': scope} for address, scope in iface.ipv6]}
+                       for iface in items], ensure_ascii=False)
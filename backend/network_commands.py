@@ -0,0 +1,170 @@
+import asyncio
+import os
+import re
+from collections import namedtuple
+
+import procs
+from registry import CommandError
+
+# Plan de ejecución de un comando que delega en una herramienta externa:
+#   candidates   -> lista de argv a probar en orden (si el binario no existe se pasa al siguiente)
+#   formatter    -> función (returncode, stdout, stderr) que construye la salida final
+#                   (lanza CommandError si el comando falló)
+#   error_prefix -> mensaje usado cuando la ejecución lanza una excepción
+ExternalPlan = namedtuple('ExternalPlan', ['candidates', 'formatter', 'error_prefix'])
+
+def plan_ipconfig(args):
+    # Adaptar el comando según el sistema operativo
+    if os.name == "nt":  # Windows
+        candidates = [["ipconfig"]]
+    else:  # Linux/Unix
+        # Intentar ifconfig primero, si no está disponible usar ip addr
+        candidates = [["ifconfig"], ["ip", "addr"]]
+
+    def formatter(returncode, output, error):
+        if returncode == 0:
+            # Eliminar líneas vacías múltiples
+            return re.sub(r'\n\s*\n', '\n\n', output)
+        raise CommandError(f"Error al obtener información de red: {error}")
+
+    return ExternalPlan(candidates, formatter, "Error al ejecutar el comando")
+
+def plan_netstat(args):
+    # Adaptar el comando según el sistema operativo
+    if os.name == "nt":  # Windows
+        candidates = [["netstat", "-an"]]
+    else:  # Linux/Unix
+        # En Linux, añadimos -tulpn para mostrar servicios y PID
+        candidates = [["netstat", "-tulpn"]]
+
+    def formatter(returncode, output, error):
+        if returncode == 0:
+            # Mantener el encabezado y las conexiones activas
+            lines = output.split('\n')
+            filtered_lines = [line for line in lines if line.strip() and
+                              ('Proto' in line or 'ESTABLISHED' in line or 'LISTEN' in line)]
+            return '\n'.join(filtered_lines)
+        raise CommandError(f"Error al obtener estadísticas de red: {error}")
+
+    return ExternalPlan(candidates, formatter, "Error al ejecutar netstat")
+
+# Comandos que delegan en herramientas externas (en Linux, netstat e ipconfig
+# usan netinfo; estos planes quedan para los sistemas sin /proc)
+PLANNERS = {
+    'ipconfig': plan_ipconfig,
+    'netstat': plan_netstat,
+}
+
+def _decode(data):
+    return data.decode('utf-8', errors='ignore') if data else ''
+
+def run_plan(plan, session):
+    """
+    Ejecuta el plan de forma bloqueante con subprocess
+    """
+    try:
+        for i, argv in enumerate(plan.candidates):
+            try:
+                result = procs.run(argv, session)
+            except FileNotFoundError:
+                if i == len(plan.candidates) - 1:
+                    raise
+                continue
+            if result.error:
+                raise CommandError(result.error)
+            return plan.formatter(result.returncode, result.stdout, result.stderr)
+    except CommandError:
+        raise
+    except Exception as e:
+        raise CommandError(f"{plan.error_prefix}: {str(e)}")
+
+async def _read_output(stream, max_bytes):
+    """
+    Lee el stdout del proceso hasta el final o hasta max_bytes; devuelve
+    (bytes leídos, si se superó el límite)
+    """
+    chunks = []
+    size = 0
+    while chunk := await stream.read(procs.READ_CHUNK):
+        if max_bytes and size + len(chunk) > max_bytes:
+            chunks.append(chunk[:max_bytes - size])
+            return b''.join(chunks), True
+        chunks.append(chunk)
+        size += len(chunk)
+    return b''.join(chunks), False
+
+async def _read_stderr(stream):
+    # Se lee hasta el final para no bloquear el proceso, pero sólo se guarda el principio
+    chunks = []
+    size = 0
+    while chunk := await stream.read(8192):
+        if size < procs.MAX_STDERR_BYTES:
+            chunks.append(chunk[:procs.MAX_STDERR_BYTES - size])
+            size += len(chunks[-1])
+    return b''.join(chunks)
+
+async def _communicate(process, max_bytes):
+    """
+    Como process.communicate(), con la salida limitada como en
+    procs.stream_process: al superar max_bytes se mata el grupo del proceso.
+    Devuelve (stdout, stderr, si se superó el límite).
+    """
+    stderr_task = asyncio.ensure_future(_read_stderr(process.stderr))
+    try:
+        output, exceeded = await _read_output(process.stdout, max_bytes)
+        if exceeded:
+            procs.kill_group(process)
+        error = await stderr_task
+        await process.wait()
+    finally:
+        stderr_task.cancel()
+    return output, error, exceeded
+
+async def run_plan_async(plan, session):
+    """
+    Ejecuta el plan sin bloquear el event loop, con asyncio.create_subprocess_exec
+    """
+    limits = procs.current_limits()
+    try:
+        for i, argv in enumerate(plan.candidates):
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=session.cwd,
+                    env=session.env,
+                    **procs.spawn_options())
+            except FileNotFoundError:
+                if i == len(plan.candidates) - 1:
+                    raise
+                continue
+            procs.apply_rlimits(process, limits)
+            # Anotado en la sesión como los de subprocess: /cancel también lo alcanza
+            procs.register(process)
+            try:
+                output, error, exceeded = await asyncio.wait_for(
+                    _communicate(process, limits.output_bytes), limits.timeout)
+            except asyncio.TimeoutError:
+                raise CommandError(procs.timeout_message(limits.timeout))
+            finally:
+                if process.returncode is None:
+                    # Agotado el tiempo o cancelada la corrutina: matar el grupo entero
+                    procs.kill_group(process)
+                    await process.wait()
+                procs.release(process)
+            if exceeded:
+                raise CommandError(procs.output_limit_message(limits.output_bytes))
+            return plan.formatter(process.returncode, _decode(output), _decode(error))
+    except CommandError:
+        raise
+    except Exception as e:
+        raise CommandError(f"{plan.error_prefix}: {str(e)}")
+
+def execute(command, args, session):
+    plan = PLANNERS[command](args)
+    return run_plan(plan, session)
+
+async def execute_async(command, args, session):
+    plan = PLANNERS[command](args)
+    return await run_plan_async(plan, session)
@@ -0,0 +1,75 @@
+import time
+from collections import namedtuple
+
+from cache import LRUCache
+
+# Caché de la salida de los comandos de solo lectura. Cada comando declara su
+# política al registrarse (@command(..., cache=CachePolicy(...))); los que no
+# la declaran se ejecutan siempre.
+
+# Argumento que fuerza a ejecutar el comando aunque haya una salida en caché
+BYPASS_FLAG = '--no-cache'
+
+# ttl       -> segundos que se reutiliza la salida
+# per_cwd   -> la salida depende del directorio actual (forma parte de la clave)
+# max_bytes -> las salidas más grandes no se guardan
+CachePolicy = namedtuple('CachePolicy', ['ttl', 'per_cwd', 'max_bytes'], defaults=(False, 64 * 1024))
+
+# (comando, argumentos, cwd o None) -> (caduca_en, salida)
+output_cache = LRUCache(max_entries=1024, max_bytes=16 * 1024 * 1024,
+                        sizeof=lambda key, value: 64 + sum(len(str(arg)) for arg in key[1])
+                        + len(key[2] or '') + len(value[1]))
+
+def split_bypass(args):
+    """
+    Devuelve (argumentos sin el de bypass, si se pidió ejecutar sin caché)
+    """
+    if BYPASS_FLAG not in args:
+        return args, False
+    return [arg for arg in args if arg != BYPASS_FLAG], True
+
+def cache_key(spec, args, session):
+    return (spec.name, tuple(args), session.cwd if spec.cache.per_cwd else None)
+
+def _fresh(cached):
+    return cached[0] > time.monotonic()
+
+def lookup(key):
+    # Una salida caducada cuenta como fallo en las estadísticas
+    cached = output_cache.get(key, valid=_fresh)
+    return cached[1] if cached is not None else None
+
+def store(spec, key, output):
+    policy = spec.cache
+    if isinstance(output, str) and len(output) <= policy.max_bytes:
+        output_cache.put(key, (time.monotonic() + policy.ttl, output))
+
+def run_cached(spec, args, session, handler):
+    """
+    Ejecuta handler(args, session) salvo que haya una salida vigente en caché.
+    Los errores (excepciones del manejador) no se guardan: el siguiente intento
+    vuelve a ejecutar el comando.
+    """
+    args, bypass = split_bypass(args)
+    key = cache_key(spec, args, session)
+    if not bypass:
+        output = lookup(key)
+        if output is not None:
+            return output
+    output = handler(args, session)
+    store(spec, key, output)
+    return output
+
+async def run_cached_async(spec, args, session, handler):
+    """
+    Versión de run_cached para manejadores asíncronos
+    """
+    args, bypass = split_bypass(args)
+    key = cache_key(spec, args, session)
+    if not bypass:
+        output = lookup(key)
+        if output is not None:
+            return output
+    output = await handler(args, session)
+    store(spec, key, output)
+    return output
@@ -0,0 +1,117 @@
+import hashlib
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+
+from ply import lex, yacc
+
+# Directorio fijo (relativo a este archivo, no al cwd) con las tablas generadas
+TABLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables')
+
+# Se incrementa cuando cambia la forma de generar las tablas
+TABLES_VERSION = 1
+
+def grammar_hash(module, prefix):
+    """
+    Hash de las reglas del módulo: tokens, expresiones regulares de t_* (en el
+    orden en que PLY las prueba) y producciones de p_*. Si cambia cualquiera de
+    ellas las tablas guardadas dejan de ser válidas.
+    """
+    parts = [f"ply={lex.__version__}", f"version={TABLES_VERSION}",
+             repr(getattr(module, 'tokens', ())), repr(getattr(module, 'precedence', ()))]
+    functions = []
+    for name, value in vars(module).items():
+        if not name.startswith(prefix):
+            continue
+        if callable(value):
+            functions.append((value.__code__.co_firstlineno, name, value.__doc__))
+        else:
+            parts.append(f"{name}={value!r}")
+    parts.sort()
+    # Las reglas en funciones se prueban en orden de definición: conservar el orden relativo
+    parts.extend(f"{name}:{doc}" for _, name, doc in sorted(functions))
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+def _load_table(tabname, expected_hash):
+    """
+    Importa una tabla desde TABLES_DIR (sin depender de sys.path ni del cwd)
+    y la devuelve sólo si fue generada con la misma gramática
+    """
+    path = os.path.join(TABLES_DIR, tabname + '.py')
+    if not os.path.exists(path):
+        return None
+    spec = importlib.util.spec_from_file_location(f"tables.{tabname}", path)
+    table = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(table)
+    except Exception:
+        return None
+    if getattr(table, '_grammar_hash', None) != expected_hash:
+        return None
+    return table
+
+def _install_table(tmpdir, tabname, grammar):
+    """
+    Marca la tabla recién generada con el hash y la mueve de forma atómica a TABLES_DIR
+    """
+    generated = os.path.join(tmpdir, tabname + '.py')
+    with open(generated, 'a') as f:
+        f.write(f"_grammar_hash = {grammar!r}\n")
+    os.replace(generated, os.path.join(TABLES_DIR, tabname + '.py'))
+
+def build_lexer(module, name):
+    """
+    Construye el lexer de `module` a partir de la tabla `<name>_lextab`,
+    regenerándola sólo si falta o no corresponde a las reglas actuales
+    """
+    tabname = f"{name}_lextab"
+    grammar = grammar_hash(module, 't_')
+    table = _load_table(tabname, grammar)
+    if table is not None:
+        return lex.lex(module=module, optimize=1, lextab=table)
+
+    lexer = lex.lex(module=module)
+    os.makedirs(TABLES_DIR, exist_ok=True)
+    tmpdir = tempfile.mkdtemp(dir=TABLES_DIR)
+    try:
+        lexer.writetab(tabname, tmpdir)
+        _install_table(tmpdir, tabname, grammar)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return lexer
+
+def build_parser(module, name):
+    """
+    Construye el parser LALR de `module` a partir de la tabla `<name>_parsetab`,
+    regenerándola sólo si falta o no corresponde a la gramática actual
+    """
+    tabname = f"{name}_parsetab"
+    grammar = grammar_hash(module, 'p_')
+    table = _load_table(tabname, grammar)
+    if table is not None:
+        return yacc.yacc(module=module, optimize=1, tabmodule=table, debug=False, write_tables=False)
+
+    os.makedirs(TABLES_DIR, exist_ok=True)
+    tmpdir = tempfile.mkdtemp(dir=TABLES_DIR)
+    try:
+        parser = yacc.yacc(module=module, tabmodule=tabname, outputdir=tmpdir,
+                           debug=False, write_tables=True)
+        _install_table(tmpdir, tabname, grammar)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return parser
+
+# Generar las tablas por adelantado: python parse_tables.py
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # Borrar las tablas existentes para forzar su regeneración
+    if os.path.isdir(TABLES_DIR):
+        for tabfile in os.listdir(TABLES_DIR):
+            if tabfile.endswith(('_lextab.py', '_parsetab.py')):
+                os.remove(os.path.join(TABLES_DIR, tabfile))
+    import cli  # noqa: F401  (construye las tablas de cli y table_lexico al importarse)
+    for tabfile in sorted(os.listdir(TABLES_DIR)):
+        if tabfile.endswith('.py') and tabfile != '__init__.py':
+            print(os.path.join(TABLES_DIR, tabfile))
@@ -0,0 +1,266 @@
+import asyncio
+import platform
+import random
+import re
+import socket
+import struct
+import time
+from collections import namedtuple
+
+import procs
+
+# Ping a varios hosts a la vez. Cada host se sondea en una tarea asyncio con su
+# propio socket ICMP; si el sistema no permite abrirlos se usa el comando ping.
+
+DEFAULT_COUNT = 4
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_INTERVAL = 1.0
+MIN_INTERVAL = 0.01
+
+# Hosts sondeados a la vez como máximo (cada uno ocupa un socket o un proceso)
+MAX_CONCURRENT_HOSTS = 256
+
+PAYLOAD_SIZE = 56
+
+ICMP_ECHO_REQUEST = {socket.AF_INET: 8, socket.AF_INET6: 128}
+ICMP_ECHO_REPLY = {socket.AF_INET: 0, socket.AF_INET6: 129}
+ICMP_PROTOCOL = {socket.AF_INET: socket.IPPROTO_ICMP, socket.AF_INET6: socket.IPPROTO_ICMPV6}
+
+# rtt en milisegundos, o None si la respuesta no llegó a tiempo
+Reply = namedtuple('Reply', ['host', 'address', 'seq', 'rtt'])
+
+# Resultado de un host; loss en porcentaje y min/avg/max en milisegundos
+HostStats = namedtuple('HostStats', ['host', 'address', 'sent', 'received', 'loss',
+                                     'min', 'avg', 'max', 'error'])
+
+class PingError(Exception):
+    pass
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def build_echo_request(family, ident, seq):
+    payload = struct.pack('!d', time.time()).ljust(PAYLOAD_SIZE, b'\x55')
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST[family], 0, 0, ident, seq)
+    if family == socket.AF_INET6:
+        # En ICMPv6 la suma de control la calcula el kernel (incluye la pseudo-cabecera IP)
+        return header + payload
+    checksum = _checksum(header + payload)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST[family], 0, checksum, ident, seq) + payload
+
+def parse_echo_reply(data, family, raw):
+    """
+    Devuelve (identificador, secuencia) si el paquete es una respuesta de eco
+    """
+    if raw and family == socket.AF_INET:
+        # Los sockets raw de IPv4 entregan también la cabecera IP
+        data = data[(data[0] & 0x0F) * 4:]
+    if len(data) < 8:
+        return None
+    icmp_type, _, _, ident, seq = struct.unpack('!BBHHH', data[:8])
+    if icmp_type != ICMP_ECHO_REPLY[family]:
+        return None
+    return ident, seq
+
+def open_icmp_socket(family):
+    """
+    Abre un socket ICMP. Primero sin privilegios (SOCK_DGRAM, según
+    net.ipv4.ping_group_range) y si no, raw (root o CAP_NET_RAW).
+    Devuelve (socket, raw) o lanza OSError.
+    """
+    last_error = None
+    for sock_type, raw in ((socket.SOCK_DGRAM, False), (socket.SOCK_RAW, True)):
+        try:
+            sock = socket.socket(family, sock_type, ICMP_PROTOCOL[family])
+        except (OSError, AttributeError) as e:
+            last_error = e
+            continue
+        sock.setblocking(False)
+        return sock, raw
+    raise last_error
+
+def summarize(host, address, rtts, sent, error=None):
+    received = [rtt for rtt in rtts if rtt is not None]
+    loss = round(100.0 * (sent - len(received)) / sent, 1) if sent else 100.0
+    if not received:
+        return HostStats(host, address, sent, 0, loss, None, None, None, error)
+    return HostStats(host, address, sent, len(received), loss,
+                     round(min(received), 3), round(sum(received) / len(received), 3),
+                     round(max(received), 3), error)
+
+async def _resolve(host):
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await loop.getaddrinfo(host, None, type=socket.SOCK_RAW)
+    except socket.gaierror as e:
+        raise PingError(f"No se pudo resolver {host}: {e.strerror}")
+    # Preferir IPv4, como ping
+    infos.sort(key=lambda info: info[0] != socket.AF_INET)
+    family, _, _, _, sockaddr = infos[0]
+    return family, sockaddr[0]
+
+async def _wait_reply(sock, family, raw, address, ident, seq, deadline):
+    loop = asyncio.get_running_loop()
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        try:
+            data, source = await asyncio.wait_for(loop.sock_recvfrom(sock, 2048), remaining)
+        except asyncio.TimeoutError:
+            return False
+        if source[0] != address:
+            continue
+        reply = parse_echo_reply(data, family, raw)
+        # Con SOCK_DGRAM el kernel cambia el identificador y filtra por él
+        if reply is not None and reply[1] == seq and (not raw or reply[0] == ident):
+            return True
+
+async def _probe_socket(host, family, address, count, timeout, interval, emit):
+    loop = asyncio.get_running_loop()
+    sock, raw = open_icmp_socket(family)
+    ident = random.getrandbits(16)
+    rtts = []
+    try:
+        for seq in range(1, count + 1):
+            started = time.monotonic()
+            await loop.sock_sendto(sock, build_echo_request(family, ident, seq), (address, 0))
+            answered = await _wait_reply(sock, family, raw, address, ident, seq, started + timeout)
+            rtt = (time.monotonic() - started) * 1000 if answered else None
+            rtts.append(rtt)
+            await emit(Reply(host, address, seq, rtt))
+            if seq < count:
+                await asyncio.sleep(max(0.0, started + interval - time.monotonic()))
+    finally:
+        sock.close()
+    return summarize(host, address, rtts, count)
+
+_RTT_PATTERN = re.compile(r'(?:time|tiempo)[=<]\s*([\d.]+)\s*ms', re.IGNORECASE)
+_SEQ_PATTERN = re.compile(r'icmp_seq=(\d+)')
+
+def ping_argv(address, count, timeout, interval):
+    if platform.system().lower() == "windows":
+        return ['ping', '-n', str(count), '-w', str(int(timeout * 1000)), address]
+    return ['ping', '-n', '-c', str(count), '-W', str(max(1, round(timeout))),
+            '-i', f"{max(0.2, interval):g}", address]
+
+async def _probe_process(host, address, count, timeout, interval, emit):
+    """
+    Alternativa sin sockets ICMP: el comando ping del sistema, leyendo los
+    tiempos de su salida a medida que la escribe
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *ping_argv(address, count, timeout, interval),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL, **procs.spawn_options())
+    except FileNotFoundError:
+        raise PingError("No se pueden abrir sockets ICMP y el comando ping no está disponible")
+    procs.apply_rlimits(process)
+    procs.register(process)
+    rtts = []
+    try:
+        async for line in process.stdout:
+            line = line.decode('utf-8', errors='ignore')
+            match = _RTT_PATTERN.search(line)
+            if match:
+                seq = _SEQ_PATTERN.search(line)
+                rtts.append(float(match.group(1)))
+                await emit(Reply(host, address, int(seq.group(1)) if seq else len(rtts), rtts[-1]))
+        await process.wait()
+    finally:
+        if process.returncode is None:
+            procs.kill_group(process)
+            await process.wait()
+        procs.release(process)
+    return summarize(host, address, rtts, count)
+
+# familia -> True si se pueden abrir sockets ICMP (se decide en el primer ping)
+_socket_support = {}
+
+def _socket_transport_available(family):
+    if family not in _socket_support:
+        try:
+            open_icmp_socket(family)[0].close()
+            _socket_support[family] = True
+        except OSError:
+            _socket_support[family] = False
+    return _socket_support[family]
+
+async def ping_host(host, count=DEFAULT_COUNT, timeout=DEFAULT_TIMEOUT, interval=DEFAULT_INTERVAL,
+                    emit=None):
+    """
+    Sondea un host y devuelve su HostStats. emit(Reply) (corrutina) recibe cada
+    respuesta o pérdida según ocurre.
+    """
+    async def ignore(reply):
+        pass
+
+    emit = emit or ignore
+    try:
+        family, address = await _resolve(host)
+        if _socket_transport_available(family):
+            return await _probe_socket(host, family, address, count, timeout, interval, emit)
+        return await _probe_process(host, address, count, timeout, interval, emit)
+    except (PingError, OSError) as e:
+        return summarize(host, None, [], 0, str(e))
+
+async def ping_hosts(hosts, count=DEFAULT_COUNT, timeout=DEFAULT_TIMEOUT, interval=DEFAULT_INTERVAL,
+                     replies=False):
+    """
+    Sondea todos los hosts a la vez. Generador asíncrono que produce el
+    HostStats de cada host en cuanto termina (y cada Reply si replies=True).
+    """
+    events = asyncio.Queue()
+    limit = asyncio.Semaphore(MAX_CONCURRENT_HOSTS)
+
+    async def emit(reply):
+        if replies:
+            await events.put(reply)
+
+    async def run(host):
+        async with limit:
+            await events.put(await ping_host(host, count, timeout, interval, emit))
+
+    tasks = [asyncio.create_task(run(host)) for host in hosts]
+    try:
+        pending = len(tasks)
+        while pending:
+            event = await events.get()
+            if isinstance(event, HostStats):
+                pending -= 1
+            yield event
+    finally:
+        # Si se deja de leer (cliente desconectado) no dejar sondeos en curso
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def iter_ping_hosts(hosts, max_time=None, **options):
+    """
+    Versión bloqueante de ping_hosts (para el servidor Flask y la CLI): corre
+    el generador en un event loop propio y produce sus eventos. Si los sondeos
+    no terminan en max_time segundos se cancelan y se lanza PingError, como
+    asyncio.wait_for en la versión asíncrona.
+    """
+    loop = asyncio.new_event_loop()
+    events = ping_hosts(hosts, **options)
+    deadline = time.monotonic() + max_time if max_time else None
+    try:
+        while True:
+            step = events.__anext__()
+            if deadline is not None:
+                step = asyncio.wait_for(step, max(deadline - time.monotonic(), 0))
+            try:
+                yield loop.run_until_complete(step)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                raise PingError(procs.timeout_message(max_time))
+    finally:
+        loop.run_until_complete(events.aclose())
+        loop.close()
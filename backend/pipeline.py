@@ -0,0 +1,322 @@
+import subprocess
+import threading
+from collections import namedtuple
+
+import procs
+import registry
+
+# Ejecución de tuberías (a | b | c) y redirecciones (<, >, >>, 2>). Los comandos
+# internos se encadenan como generadores y los externos como procesos unidos por
+# pipes del sistema operativo; entre etapas los datos pasan en bloques de como
+# mucho CHUNK_SIZE bytes, nunca como la salida completa de una etapa.
+
+CHUNK_SIZE = 64 * 1024
+
+# Máximo de stderr que se guarda de cada proceso externo
+MAX_STDERR_BYTES = 64 * 1024
+
+# fd     -> 0 (entrada), 1 (salida) o 2 (errores)
+# append -> True para >>
+Redirect = namedtuple('Redirect', ['fd', 'append', 'target'])
+
+Stage = namedtuple('Stage', ['command', 'args', 'redirects'])
+
+Pipeline = namedtuple('Pipeline', ['stages'])
+
+def parse_redirect(operator, target):
+    """
+    Redirect a partir del operador ('<', '>', '>>', '2>', '2>>', '1>') y su destino
+    """
+    fd = 0 if operator == '<' else int(operator[0]) if operator[0].isdigit() else 1
+    if len(target) >= 2 and target[0] == target[-1] and target[0] in "'\"":
+        target = target[1:-1]
+    return Redirect(fd, operator.endswith('>>'), target)
+
+def format_redirect(redirect):
+    if redirect.fd == 0:
+        return f"< {redirect.target}"
+    prefix = '2' if redirect.fd == 2 else ''
+    return f"{prefix}{'>>' if redirect.append else '>'} {redirect.target}"
+
+def format_stage(stage):
+    return ' '.join([stage.command, *stage.args, *(format_redirect(r) for r in stage.redirects)])
+
+def format_pipeline(pipeline):
+    """
+    Texto de la tubería (para el historial)
+    """
+    return ' | '.join(format_stage(stage) for stage in pipeline.stages)
+
+# ---------------------------------------------------------------------------
+# Adaptadores entre bloques, líneas y archivos
+# ---------------------------------------------------------------------------
+
+class read_chunks:
+    """
+    Bloques de un archivo o del stdout de un proceso, en cuanto hay datos
+    (read1 no espera a completar el bloque). close() cierra el archivo aunque
+    no se haya empezado a leer.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._read = getattr(stream, 'read1', stream.read)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        chunk = self._read(CHUNK_SIZE) if not self.stream.closed else b''
+        if not chunk:
+            self.close()
+            raise StopIteration
+        return chunk
+
+    def close(self):
+        self.stream.close()
+
+def encode_lines(lines):
+    """
+    Salida de un comando interno (líneas de texto) como bloques de bytes
+    """
+    buffer = bytearray()
+    for line in lines:
+        buffer += line.encode('utf-8') + b'\n'
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+def decode_lines(chunks):
+    """
+    Bloques de bytes como líneas de texto (sin el salto de línea). Una línea
+    más larga que CHUNK_SIZE se corta en trozos para no acumularla entera.
+    """
+    pending = b''
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line.decode('utf-8', errors='replace')
+        while len(pending) > CHUNK_SIZE:
+            yield pending[:CHUNK_SIZE].decode('utf-8', errors='replace')
+            pending = pending[CHUNK_SIZE:]
+    if pending:
+        yield pending.decode('utf-8', errors='replace')
+
+def _feed(process_stdin, chunks):
+    """
+    Escribe los bloques de un comando interno en el stdin de un proceso (en un
+    hilo: el pipe del sistema limita lo que queda pendiente)
+    """
+    try:
+        for chunk in chunks:
+            process_stdin.write(chunk)
+    except (BrokenPipeError, ValueError, OSError):
+        pass  # El proceso terminó sin leerlo todo (head, grep -m...)
+    finally:
+        try:
+            process_stdin.close()
+        except OSError:
+            pass
+
+def discard_input(upstream):
+    """
+    Libera la entrada que una etapa no va a leer: el proceso anterior recibe
+    SIGPIPE en lugar de quedarse bloqueado con el pipe lleno
+    """
+    if upstream is not None and hasattr(upstream, 'close'):
+        upstream.close()
+
+def _collect_stderr(stream, buffer):
+    while True:
+        chunk = stream.read1(CHUNK_SIZE)
+        if not chunk:
+            break
+        if len(buffer) < MAX_STDERR_BYTES:
+            buffer += chunk[:MAX_STDERR_BYTES - len(buffer)]
+    stream.close()
+
+# ---------------------------------------------------------------------------
+# Ejecución
+# ---------------------------------------------------------------------------
+
+class _Run:
+    """
+    Recursos de una tubería en ejecución: procesos, archivos, hilos y errores
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.processes = []  # (índice de la etapa, Popen, buffer de stderr, procs.Watchdog)
+        self.files = []
+        self.threads = []
+        self.errors = []
+        self.failed = set()  # Índices de las etapas que han fallado
+
+    def open(self, redirect):
+        path = self.session.resolve(redirect.target)
+        mode = 'rb' if redirect.fd == 0 else 'ab' if redirect.append else 'wb'
+        f = open(path, mode)
+        self.files.append(f)
+        return f
+
+    def thread(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def error(self, index, message, stderr_file):
+        self.failed.add(index)
+        if not message:
+            return  # La salida del comando ya explica el fallo
+        if stderr_file is None:
+            self.errors.append(message)
+        else:
+            stderr_file.write(message.encode('utf-8') + b'\n')
+
+    def builtin(self, index, spec, stage, upstream, stderr_file):
+        """
+        Bloques de salida de un comando interno. Los que tienen variante `pipe`
+        leen la entrada; el resto la ignoran, como en el shell.
+        """
+        args = list(stage.args)
+        try:
+            if spec.pipe is not None:
+                return self._checked(index, spec.pipe(args, self.session, _as_chunks(upstream)), stderr_file)
+            discard_input(upstream)
+            if spec.stream is not None:
+                usage_error = spec.check_args(args)
+                if usage_error:
+                    raise registry.CommandError(usage_error)
+                lines = spec.stream(args, self.session)
+            else:
+                output = spec.run(args, self.session)
+                lines = output.splitlines() if isinstance(output, str) else []
+        except Exception as e:
+            # Fallo antes de empezar a producir la salida
+            discard_input(upstream)
+            self.error(index, str(e), stderr_file)
+            return iter(())
+        return encode_lines(self._checked(index, lines, stderr_file))
+
+    def _checked(self, index, output, stderr_file):
+        """
+        Salida de un comando interno hacia la etapa siguiente, sea cual sea su
+        contenido. Si el comando falla (también a mitad de la salida) su mensaje
+        va a stderr y la etapa cuenta como fallida.
+        """
+        try:
+            yield from output
+        except Exception as e:
+            self.error(index, str(e), stderr_file)
+
+    def external(self, index, stage, upstream, stdout_file, stderr_file):
+        if upstream is None:
+            stdin = subprocess.DEVNULL
+        elif hasattr(upstream, 'fileno'):
+            stdin = upstream
+        else:
+            stdin = subprocess.PIPE
+        process, watchdog = procs.spawn(
+            format_stage(stage._replace(redirects=())), self.session, shell=True, stdin=stdin,
+            stdout=stdout_file if stdout_file is not None else subprocess.PIPE,
+            stderr=stderr_file if stderr_file is not None else subprocess.PIPE)
+        if stdin is subprocess.PIPE:
+            self.thread(_feed, process.stdin, upstream)
+        elif stdin is upstream:
+            # El proceso anterior tiene que recibir SIGPIPE si este termina antes
+            upstream.close()
+        stderr = bytearray()
+        if stderr_file is None:
+            self.thread(_collect_stderr, process.stderr, stderr)
+        self.processes.append((index, process, stderr, watchdog))
+        return process.stdout
+
+    def cleanup(self):
+        for _, process, _, watchdog in self.processes:
+            procs.finish(process, watchdog)
+            if process.stdout is not None:
+                process.stdout.close()
+        for thread in self.threads:
+            thread.join(timeout=1)
+        for f in self.files:
+            f.close()
+
+def _open_error(e):
+    if isinstance(e, FileNotFoundError):
+        return "No existe el archivo o directorio"
+    if isinstance(e, PermissionError):
+        return "Sin permisos"
+    if isinstance(e, IsADirectoryError):
+        return "Es un directorio"
+    return e.strerror
+
+def _as_chunks(upstream):
+    if upstream is None or not hasattr(upstream, 'fileno'):
+        return upstream
+    return read_chunks(upstream)
+
+def run_pipeline(pipeline, session, status=None):
+    """
+    Ejecuta la tubería y produce la salida de la última etapa línea a línea, a
+    medida que se genera. Al final se producen los errores de las etapas que
+    fallaron (stderr de los procesos, mensajes de los comandos internos).
+    Si se pasa el diccionario `status`, al terminar status['failed'] indica si
+    falló la última etapa (como el código de salida de una tubería en el shell).
+    """
+    run = _Run(session)
+    try:
+        # upstream: lo que recibe la etapa siguiente. Un archivo (stdout de un
+        # proceso o un archivo abierto), un iterador de bloques o None
+        upstream = None
+        for index, stage in enumerate(pipeline.stages):
+            redirects = {r.fd: r for r in stage.redirects}
+            try:
+                stdin_file = run.open(redirects[0]) if 0 in redirects else None
+                stdout_file = run.open(redirects[1]) if 1 in redirects else None
+                stderr_file = run.open(redirects[2]) if 2 in redirects else None
+            except OSError as e:
+                run.error(index, f"Error: {_open_error(e)}: {e.filename}", None)
+                discard_input(upstream)
+                upstream = None
+                continue
+            if stdin_file is not None:
+                discard_input(upstream)
+                upstream = stdin_file
+
+            spec = registry.get(stage.command)
+            if spec is None:
+                upstream = run.external(index, stage, upstream, stdout_file, stderr_file)
+                continue
+
+            output = run.builtin(index, spec, stage, upstream, stderr_file)
+            if stdout_file is None:
+                upstream = output
+            else:
+                for chunk in output:
+                    stdout_file.write(chunk)
+                upstream = None
+
+        if upstream is not None:
+            yield from decode_lines(_as_chunks(upstream))
+
+        for _, process, _, _ in run.processes:
+            process.wait()
+        for thread in run.threads:
+            thread.join()
+        for index, process, stderr, watchdog in run.processes:
+            if watchdog.expired:
+                run.failed.add(index)
+                yield f"{procs.timeout_message(watchdog.timeout)}: {format_stage(pipeline.stages[index])}"
+            elif process.returncode != 0:
+                run.failed.add(index)
+                if stderr:
+                    yield stderr.decode('utf-8', errors='replace').rstrip('\n')
+        yield from run.errors
+        if status is not None:
+            status['failed'] = len(pipeline.stages) - 1 in run.failed
+    finally:
+        run.cleanup()
@@ -0,0 +1,364 @@
+import contextvars
+import os
+import select
+import signal
+import subprocess
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Procesos externos con límites: cada uno en su propio grupo de procesos (se
+# puede matar entero, con los hijos que haya lanzado el shell), con límites de
+# CPU, memoria y tamaño de archivo aplicados con prlimit al lanzarlo, un tiempo
+# máximo de ejecución y un máximo de salida recogida.
+
+# timeout      -> segundos de reloj antes de matar el grupo de procesos
+# cpu_seconds  -> RLIMIT_CPU (el kernel envía SIGXCPU y luego SIGKILL)
+# memory_bytes -> RLIMIT_AS
+# file_bytes   -> RLIMIT_FSIZE (archivos que escribe el proceso, redirecciones incluidas)
+# output_bytes -> salida que se recoge por el pipe antes de cortar el proceso
+ProcessLimits = namedtuple('ProcessLimits', ['timeout', 'cpu_seconds', 'memory_bytes', 'file_bytes',
+                                             'output_bytes'])
+
+DEFAULT_LIMITS = ProcessLimits(timeout=120, cpu_seconds=60, memory_bytes=1024 * 1024 * 1024,
+                               file_bytes=1024 * 1024 * 1024, output_bytes=16 * 1024 * 1024)
+
+# Los trabajos en segundo plano (comando &) pueden durar más
+BACKGROUND_LIMITS = DEFAULT_LIMITS._replace(timeout=60 * 60, cpu_seconds=30 * 60)
+
+# Máximo de stderr que se guarda de cada proceso
+MAX_STDERR_BYTES = 64 * 1024
+
+# Bytes que se leen del pipe de salida en cada llamada
+READ_CHUNK = 64 * 1024
+
+KILL_SIGNAL = getattr(signal, 'SIGKILL', signal.SIGTERM)
+
+def timeout_message(timeout):
+    return f"Error: Tiempo de espera agotado ({timeout:g} s)"
+
+def output_limit_message(max_bytes):
+    return f"Error: La salida supera el límite de {max_bytes} bytes"
+
+# ---------------------------------------------------------------------------
+# Procesos en curso
+# ---------------------------------------------------------------------------
+
+class ProcessSet:
+    """
+    Procesos en curso de una sesión o de un trabajo, para poder matarlos desde
+    otro hilo (/cancel, kill)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes = set()
+
+    def add(self, process):
+        with self._lock:
+            self._processes.add(process)
+
+    def discard(self, process):
+        with self._lock:
+            self._processes.discard(process)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._processes)
+
+    def kill(self, sig=KILL_SIGNAL):
+        """
+        Mata el grupo de cada proceso en curso; devuelve cuántos había
+        """
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            kill_group(process, sig)
+        return len(processes)
+
+_context = threading.local()
+
+# ProcessSet de track_processes. Es una variable de contexto y no del hilo para
+# que sirva también en las corrutinas: cada tarea asyncio tiene la suya y
+# asyncio.to_thread la hereda.
+_tracked = contextvars.ContextVar('tracked_processes', default=None)
+
+@contextmanager
+def track_processes(processes):
+    """
+    Mientras dura el bloque, los procesos que lance este hilo (o esta tarea
+    asyncio) se anotan en el ProcessSet `processes` hasta que terminan
+    """
+    previous = _tracked.get()
+    _tracked.set(processes)
+    try:
+        yield processes
+    finally:
+        _tracked.set(previous)
+
+def register(process):
+    """
+    Anota el proceso (de subprocess o de asyncio) en el ProcessSet de
+    track_processes, si lo hay
+    """
+    processes = _tracked.get()
+    if processes is not None:
+        processes.add(process)
+        process.tracked_by = processes
+    return process
+
+def release(process):
+    """
+    Quita el proceso (ya terminado) del ProcessSet en el que se anotó
+    """
+    processes = getattr(process, 'tracked_by', None)
+    if processes is not None:
+        processes.discard(process)
+
+def kill_group(process, sig=KILL_SIGNAL):
+    """
+    Envía la señal a todo el grupo del proceso (el shell y sus hijos); devuelve
+    si quedaba alguno
+    """
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, sig)
+        elif process.poll() is None:
+            process.kill()
+        else:
+            return False
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False  # El grupo ya no existe
+
+# ---------------------------------------------------------------------------
+# Límites
+# ---------------------------------------------------------------------------
+
+def current_limits():
+    """
+    Límites de los procesos que lance este hilo (ver limited)
+    """
+    return getattr(_context, 'limits', None) or DEFAULT_LIMITS
+
+@contextmanager
+def limited(limits=None, timeout=None):
+    """
+    Cambia los límites de los procesos que lance este hilo dentro del bloque.
+    Con timeout sólo se cambia el tiempo máximo de los límites actuales.
+    """
+    previous = getattr(_context, 'limits', None)
+    limits = limits or current_limits()
+    if timeout is not None:
+        limits = limits._replace(timeout=timeout)
+    _context.limits = limits
+    try:
+        yield limits
+    finally:
+        _context.limits = previous
+
+def spawn_options():
+    """
+    Argumentos para Popen o asyncio.create_subprocess_exec: grupo de procesos
+    propio. No se usa preexec_fn: ejecutar Python entre fork y exec no es
+    seguro en un servidor con hilos; los límites se aplican con apply_rlimits.
+    """
+    if os.name != 'posix':
+        return {}
+    return {'start_new_session': True}
+
+def apply_rlimits(process, limits=None):
+    """
+    Aplica los límites de CPU, memoria y archivos al proceso recién lanzado con
+    prlimit (sólo Linux). Lo que el proceso haga antes de recibirlos es
+    despreciable: el tiempo de CPU se cuenta desde el principio y el resto
+    afecta a las reservas y escrituras siguientes.
+    """
+    if not hasattr(resource, 'prlimit'):
+        return
+    limits = limits or current_limits()
+    for name, value in ((resource.RLIMIT_CPU, limits.cpu_seconds),
+                        (resource.RLIMIT_AS, limits.memory_bytes),
+                        (resource.RLIMIT_FSIZE, limits.file_bytes)):
+        if value is None:
+            continue
+        try:
+            _, hard = resource.prlimit(process.pid, name)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            resource.prlimit(process.pid, name, (value, hard))
+        except OSError:
+            return  # El proceso ya terminó
+
+class Watchdog:
+    """
+    Mata el grupo del proceso al pasar `timeout` segundos si queda algo vivo en
+    él: el proceso o hijos que siguen en segundo plano aunque el shell haya
+    terminado
+    """
+
+    def __init__(self, process, timeout):
+        self.process = process
+        self.timeout = timeout
+        self.expired = False
+        self._timer = None
+        if timeout:
+            self._timer = threading.Timer(timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _expire(self):
+        running = self.process.poll() is None
+        if kill_group(self.process) or running:
+            self.expired = True
+
+    def expire(self):
+        """
+        Da el tiempo por agotado antes de que salte el temporizador
+        """
+        self.cancel()
+        self.expired = True
+        kill_group(self.process)
+
+    def cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+
+def spawn(argv, session, shell=False, **popen_args):
+    """
+    Popen con los límites actuales del hilo. Devuelve (proceso, Watchdog); al
+    terminar hay que llamar a finish(proceso, watchdog).
+    """
+    limits = current_limits()
+    process = subprocess.Popen(argv, shell=shell, cwd=session.cwd, env=session.env,
+                               **spawn_options(), **popen_args)
+    apply_rlimits(process, limits)
+    register(process)
+    return process, Watchdog(process, limits.timeout)
+
+def finish(process, watchdog):
+    """
+    Mata lo que quede del grupo del proceso y lo deja de seguir
+    """
+    watchdog.cancel()
+    if process.poll() is None:
+        kill_group(process)
+        process.wait()
+    elif os.name == 'posix':
+        # Hijos del shell que sigan vivos en segundo plano
+        kill_group(process)
+    release(process)
+
+def _wait_readable(stream, deadline):
+    """
+    Espera hasta `deadline` (time.monotonic) a que haya datos o fin de archivo
+    en el pipe; devuelve False si se agota el tiempo antes
+    """
+    if deadline is None or os.name != 'posix':
+        return True  # Sin select para pipes: el Watchdog basta
+    return bool(select.select([stream], [], [], max(deadline - time.monotonic(), 0))[0])
+
+def _read_stderr(stream, chunks):
+    size = 0
+    for chunk in iter(lambda: stream.read(8192), b''):
+        if size < MAX_STDERR_BYTES:
+            chunks.append(chunk[:MAX_STDERR_BYTES - size])
+            size += len(chunks[-1])
+
+# ---------------------------------------------------------------------------
+# Ejecución
+# ---------------------------------------------------------------------------
+
+Completed = namedtuple('Completed', ['returncode', 'stdout', 'stderr', 'error'])
+
+def run(argv, session, shell=False):
+    """
+    Equivalente a subprocess.run con capture_output y los límites del hilo.
+    `error` es el mensaje si se agotó el tiempo o la salida superó el límite.
+    """
+    lines = []
+    status = {}
+    for line in stream_process(argv, session, shell=shell, status=status):
+        if 'returncode' in status:
+            break  # Después de la salida sólo viene el mensaje de error (ya está en status)
+        lines.append(line)
+    stdout = '\n'.join(lines) + ('\n' if lines else '')
+    return Completed(status['returncode'], stdout, status.get('stderr', ''), status.get('error'))
+
+def stream_process(argv, session, shell=False, on_error=None, status=None):
+    """
+    Lanza un proceso y produce su salida línea a línea a medida que la escribe.
+    stderr se recoge en un hilo aparte para que no se bloquee el proceso; si el
+    proceso termina con error se produce on_error(returncode, stderr) o stderr.
+    Si se agota el tiempo o la salida supera el límite se mata el grupo del
+    proceso y se produce el mensaje correspondiente.
+    Si se pasa el diccionario `status`, al terminar status['failed'] indica si
+    el proceso terminó con error y status['returncode'] su código de salida
+    (también status['stderr'] y status['error'], el mensaje por límites).
+    """
+    limits = current_limits()
+    # Sin buffer: select sobre el pipe ve todo lo que queda por leer
+    process, watchdog = spawn(argv, session, shell=shell, stdin=subprocess.DEVNULL,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+    deadline = time.monotonic() + limits.timeout if limits.timeout else None
+    stderr_chunks = []
+    stderr_reader = threading.Thread(target=_read_stderr, args=(process.stderr, stderr_chunks), daemon=True)
+    stderr_reader.start()
+    try:
+        size = 0
+        limit_error = None
+        pending = bytearray()  # Línea incompleta
+        # Se lee por bloques (no por líneas) para que una línea enorme no se
+        # acumule entera antes de comprobar el máximo de salida. La espera
+        # tiene el mismo plazo que el Watchdog: un proceso que se haya salido
+        # del grupo puede conservar el pipe abierto.
+        while limit_error is None:
+            if not _wait_readable(process.stdout, deadline):
+                watchdog.expire()
+                break
+            chunk = process.stdout.read(READ_CHUNK)
+            if not chunk:
+                if pending:
+                    yield pending.decode('utf-8', errors='ignore')
+                break
+            if limits.output_bytes and size + len(chunk) > limits.output_bytes:
+                limit_error = output_limit_message(limits.output_bytes)
+                kill_group(process)
+                chunk = chunk[:limits.output_bytes - size]
+            size += len(chunk)
+            # Sólo se buscan saltos de línea en lo recién leído
+            start = 0
+            search = len(pending)
+            pending += chunk
+            while (newline := pending.find(b'\n', search)) >= 0:
+                yield pending[start:newline].decode('utf-8', errors='ignore')
+                start = search = newline + 1
+            del pending[:start]
+        process.wait()
+        stderr_reader.join(1 if watchdog.expired else None)
+        if watchdog.expired:
+            limit_error = timeout_message(limits.timeout)
+        elif limit_error is None and process.returncode < 0:
+            # Matado desde fuera: /cancel, kill de un trabajo o un límite de recursos
+            limit_error = f"Error: Proceso terminado por la señal {-process.returncode}"
+        error = b''.join(stderr_chunks).decode('utf-8', errors='ignore')
+        if status is not None:
+            status['failed'] = process.returncode != 0 or limit_error is not None
+            status['returncode'] = process.returncode
+            status['stderr'] = error
+            status['error'] = limit_error
+        if limit_error is not None:
+            yield limit_error
+        elif process.returncode != 0:
+            yield on_error(process.returncode, error) if on_error else error
+    finally:
+        # Si el cliente se desconecta antes de terminar, no dejar el proceso colgado
+        finish(process, watchdog)
+        process.stdout.close()
+        process.stderr.close()
@@ -0,0 +1,188 @@
+import json
+
+# Categorías del catálogo de comandos (en el orden en que se muestran en el frontend)
+CATEGORIES = {
+    "system": "Sistema",
+    "navigation": "Navegación",
+    "file": "Archivos",
+    "compression": "Compresión",
+    "network": "Red",
+}
+
+class CommandError(Exception):
+    """
+    Fallo de un comando interno. Los manejadores la lanzan en lugar de devolver
+    un mensaje: el mensaje es la salida del comando (vacío si la salida ya
+    producida explica el fallo) y el comando cuenta como fallido en &&, || y
+    stop_on_error, aunque su salida normal empiece por "Error".
+    """
+
+def collect(chunks):
+    """
+    Salida completa de un generador de streaming. Si falla a mitad, CommandError
+    con lo producido hasta entonces seguido del mensaje del fallo.
+    """
+    output = []
+    try:
+        for chunk in chunks:
+            output.append(chunk)
+    except CommandError as e:
+        raise CommandError("\n".join(output + ([str(e)] if str(e) else [])))
+    return "\n".join(output)
+
+class Command:
+    """
+    Comando del terminal: manejador y metadatos (ayuda, argumentos, tipo de carga).
+
+    - handler(args, session) -> str ejecuta el comando y devuelve su salida; si
+      falla lanza CommandError (u otra excepción)
+    - stream(args, session) -> iterador de fragmentos, si el comando puede enviar
+      su salida a medida que la produce. Si falla lanza CommandError, también
+      después de haber producido parte de la salida.
+    - async_handler(args, session) -> corrutina, si tiene una versión no bloqueante
+    - pipe(args, session, stdin) -> iterador de bloques de bytes, si el comando
+      lee la salida de la etapa anterior en una tubería (stdin: iterador de
+      bloques o None). Lanza CommandError si falla antes de empezar.
+    - bound: 'io' si pasa la mayor parte del tiempo esperando (red, disco),
+      'cpu' si es cálculo en proceso
+    - cache: output_cache.CachePolicy si el comando es de solo lectura y su
+      salida se puede reutilizar durante unos segundos
+    - timeout: segundos que puede durar la variante asíncrona y los procesos
+      que lance el comando (None: procs.DEFAULT_LIMITS); también lo que el
+      servidor espera al proceso de trabajo que lo ejecuta
+    """
+
+    def __init__(self, name, handler, help, description=None, example=None, category="system",
+                 usage=None, min_args=0, usage_error=None, bound="cpu", aliases=(), cache=None,
+                 timeout=None):
+        self.name = name
+        self.handler = handler
+        self.help = help
+        self.description = description or help
+        self.example = example or name
+        self.category = category
+        self.usage = usage or name
+        self.min_args = min_args
+        self.usage_error = usage_error or f"Error: Uso: {self.usage}"
+        self.bound = bound
+        self.aliases = tuple(aliases)
+        self.cache = cache
+        self.timeout = timeout
+        self.stream = None
+        self.async_handler = None
+        self.pipe = None
+
+    def __call__(self, args, session):
+        return self.handler(args, session)
+
+    def check_args(self, args):
+        """
+        Devuelve el mensaje de error si faltan argumentos, o None
+        """
+        if len(args) < self.min_args:
+            return self.usage_error
+        return None
+
+    def run(self, args, session):
+        """
+        Comprueba los argumentos y ejecuta el manejador
+        """
+        usage_error = self.check_args(args)
+        if usage_error:
+            raise CommandError(usage_error)
+        return self.handler(args, session)
+
+    def streamer(self, func):
+        """
+        Decorador para registrar la variante por streaming del comando
+        """
+        self.stream = func
+        return func
+
+    def piped(self, func):
+        """
+        Decorador para registrar la variante del comando dentro de una tubería
+        """
+        self.pipe = func
+        return func
+
+    def asynchronous(self, func):
+        """
+        Decorador para registrar la variante asíncrona del comando
+        """
+        self.async_handler = func
+        return func
+
+
+# Comandos registrados, por nombre y por alias
+registry = {}
+
+def command(name, **metadata):
+    """
+    Decorador que registra una función como manejador del comando `name`
+    """
+    def decorator(handler):
+        spec = Command(name, handler, **metadata)
+        for key in (name,) + spec.aliases:
+            if key in registry:
+                raise ValueError(f"Comando registrado dos veces: {key}")
+            registry[key] = spec
+        return spec
+    return decorator
+
+def get(name):
+    return registry.get(name)
+
+def commands():
+    """
+    Comandos únicos (sin alias) en orden de registro
+    """
+    return [spec for key, spec in registry.items() if key == spec.name]
+
+def render_help():
+    lines = ["Comandos disponibles:"]
+    for spec in commands():
+        lines.append(f"{spec.name} - {spec.help}")
+    return "\n".join(lines) + "\n"
+
+def generate_commands_ts():
+    """
+    Genera frontend/components/commands.ts a partir del registro
+    """
+    out = [
+        "// commands.ts",
+        "// Generado automáticamente con `python backend/commands.py`. No editar a mano.",
+        "export type Command = {",
+        "  id: string",
+        "  description: string",
+        "  example: string",
+        "  category: string",
+        "  isExpanded?: boolean",
+        "  popupExpanded?: boolean",
+        "}",
+        "",
+        "export const commands: Command[] = [",
+    ]
+    entries = []
+    for category, label in CATEGORIES.items():
+        specs = [spec for spec in commands() if spec.category == category]
+        for i, spec in enumerate(specs):
+            entries.append("\n".join(([f"  // {label}"] if i == 0 else []) + [
+                "  {",
+                f"      id: {json.dumps(spec.name, ensure_ascii=False)},",
+                f"      description: {json.dumps(spec.description, ensure_ascii=False)},",
+                f"      example: {json.dumps(spec.example, ensure_ascii=False)},",
+                f"      category: {json.dumps(spec.category)},",
+                "      isExpanded: false,",
+                "      popupExpanded: false",
+                "  }",
+            ]))
+    out.append(",\n".join(entries))
+    out.append("]")
+    out.append("")
+    out.append("// Definición de categorías para referencia")
+    out.append("export const commandCategories = {")
+    out.append(",\n".join(f"  {key}: {json.dumps(label, ensure_ascii=False)}"
+                          for key, label in CATEGORIES.items()))
+    out.append("}")
+    return "\n".join(out) + "\n"
@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+import pipeline
+
+# Secuencias de comandos: a ; b, a && b, a || b. El parser produce una Sequence
+# con los pasos en orden; cada paso lleva el operador que lo une al anterior y
+# un comando simple (comando, argumentos) o una pipeline.Pipeline.
+
+SEPARATORS = (';', '&&', '||')
+
+# operator -> None en el primer paso, ';', '&&' o '||' en los demás
+Step = namedtuple('Step', ['operator', 'command'])
+
+Sequence = namedtuple('Sequence', ['steps'])
+
+def should_run(operator, last_failed):
+    """
+    && y || tienen la misma precedencia y se evalúan de izquierda a derecha,
+    como en el shell: un paso omitido no cambia el resultado del anterior, así
+    que en `a && b || c` c se ejecuta si falla a o b
+    """
+    if operator == '&&':
+        return not last_failed
+    if operator == '||':
+        return last_failed
+    return True
+
+def format_command(command):
+    if isinstance(command, Sequence):
+        return format_sequence(command)
+    if isinstance(command, pipeline.Pipeline):
+        return pipeline.format_pipeline(command)
+    name, args = command
+    return ' '.join([name, *args])
+
+def format_sequence(sequence):
+    """
+    Texto de la secuencia (para el historial)
+    """
+    parts = []
+    for step in sequence.steps:
+        if step.operator is not None:
+            parts.append(step.operator)
+        parts.append(format_command(step.command))
+    return ' '.join(parts).replace(' ;', ';')
+
+def step_result(step, execution_result, failed, skipped, cwd):
+    """
+    Resultado de un paso en la respuesta de /execute
+    """
+    return {
+        "command": format_command(step.command),
+        "operator": step.operator,
+        "execution_result": execution_result,
+        "error": failed,
+        "skipped": skipped,
+        "cwd": cwd,
+    }
+
+def failed(results):
+    """
+    Como en el shell, la secuencia falla si falló el último paso ejecutado
+    """
+    executed = [result for result in results if not result["skipped"]]
+    return bool(executed) and executed[-1]["error"]
+
+def join_outputs(results):
+    """
+    Salida conjunta de la secuencia: la de cada paso ejecutado, en orden
+    """
+    return "\n".join(result["execution_result"] for result in results
+                     if not result["skipped"] and result["execution_result"])
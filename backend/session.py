@@ -0,0 +1,168 @@
+import asyncio
+import contextvars
+import copy
+import glob
+import os
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import procs
+from history import HistoryStore
+
+# Tiempo (segundos) tras el cual una sesión inactiva se descarta
+SESSION_IDLE_TIMEOUT = 60 * 60
+
+# Locks de sesión que tiene tomados la tarea asyncio actual (ver Session.locked_async)
+_held_locks = contextvars.ContextVar('held_session_locks', default=frozenset())
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+class Session:
+    """
+    Estado de una sesión de terminal: identificador, directorio actual,
+    historial y variables de entorno. Reemplaza al os.chdir global para que
+    varios clientes puedan ejecutar comandos en paralelo.
+    """
+
+    def __init__(self, session_id=None, cwd=None, env=None):
+        self.id = session_id or uuid.uuid4().hex
+        self.env = dict(os.environ) if env is None else dict(env)
+        self.cwd = os.path.abspath(cwd or os.getcwd())
+        self.history = HistoryStore(self.id)
+        self.last_used = time.monotonic()
+        # Serializa los comandos de una misma sesión (por ejemplo, dos cd seguidos)
+        self.lock = threading.RLock()
+        # Procesos del comando en curso (/cancel mata sus grupos)
+        self.running = procs.ProcessSet()
+
+    def expanduser(self, path):
+        """
+        Expande ~ usando el HOME de la sesión
+        """
+        if not path.startswith('~'):
+            return path
+        home = self.env.get('HOME') or os.path.expanduser('~')
+        if path == '~' or path.startswith('~/'):
+            return home + path[1:]
+        return os.path.expanduser(path)
+
+    def resolve(self, path):
+        """
+        Convierte una ruta del usuario en una ruta absoluta relativa al cwd de la sesión
+        """
+        path = self.expanduser(path)
+        return os.path.normpath(os.path.join(self.cwd, path))
+
+    def glob(self, pattern):
+        """
+        Expande un patrón (*, ?, [...]) relativo al cwd de la sesión, como el
+        shell: sin coincidencias devuelve el patrón tal cual, y el texto entre
+        comillas no se expande
+        """
+        if len(pattern) >= 2 and pattern[0] == pattern[-1] and pattern[0] in "'\"":
+            return [pattern[1:-1]]
+        if not any(char in pattern for char in '*?['):
+            return [pattern]
+        matches = sorted(glob.glob(self.expanduser(pattern), root_dir=self.cwd))
+        return matches or [pattern]
+
+    def chdir(self, path):
+        """
+        Cambia el directorio de la sesión, con los mismos errores que os.chdir
+        """
+        target = self.resolve(path)
+        if not os.path.exists(target):
+            raise FileNotFoundError(f"No existe el directorio: {path}")
+        if not os.path.isdir(target):
+            raise NotADirectoryError(f"No es un directorio: {path}")
+        if not os.access(target, os.X_OK):
+            raise PermissionError(f"Sin permisos para acceder a: {path}")
+        self.cwd = target
+        return self.cwd
+
+    def fork(self):
+        """
+        Copia para un trabajo en segundo plano: comparte el historial, pero el
+        cwd y el entorno son propios (un cd del trabajo no afecta a la sesión)
+        """
+        forked = copy.copy(self)
+        forked.env = dict(self.env)
+        forked.lock = threading.RLock()
+        forked.running = procs.ProcessSet()
+        return forked
+
+    def touch(self):
+        self.last_used = time.monotonic()
+
+    def close(self):
+        """
+        Libera lo que la sesión tiene abierto (el archivo del historial) al descartarla
+        """
+        self.history.close()
+
+    @asynccontextmanager
+    async def locked_async(self):
+        """
+        `async with session.locked_async()` es el `with session.lock` de las
+        corrutinas. El RLock pertenece al hilo que lo toma, así que lo toma un
+        hilo propio que lo suelta al salir del bloque; el event loop no se
+        bloquea mientras espera. Es reentrante dentro de la misma tarea. Dentro
+        del bloque, el código que se ejecute en otros hilos (asyncio.to_thread)
+        no debe volver a tomar session.lock.
+        """
+        held = _held_locks.get()
+        if self.lock in held:
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        acquired = loop.create_future()
+        release = threading.Event()
+
+        def hold():
+            with self.lock:
+                loop.call_soon_threadsafe(_resolve, acquired)
+                release.wait()
+
+        threading.Thread(target=hold, daemon=True, name=f'session-{self.id}-lock').start()
+        token = _held_locks.set(held | {self.lock})
+        try:
+            await acquired
+            yield
+        finally:
+            _held_locks.reset(token)
+            release.set()
+
+
+# Almacén de sesiones del proceso
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(session_id=None, cwd=None, env=None):
+    """
+    Devuelve la sesión con ese id, creándola si no existe (con el cwd y el
+    entorno indicados, si se indican)
+    """
+    now = time.monotonic()
+    with _sessions_lock:
+        # Descartar sesiones inactivas
+        expired = [sid for sid, s in _sessions.items()
+                   if now - s.last_used > SESSION_IDLE_TIMEOUT]
+        for sid in expired:
+            _sessions.pop(sid).close()
+
+        session = _sessions.get(session_id) if session_id else None
+        if session is None:
+            session = Session(session_id, cwd, env)
+            _sessions[session.id] = session
+        session.touch()
+        return session
+
+def drop_session(session_id):
+    with _sessions_lock:
+        session = _sessions.pop(session_id, None)
+    if session is not None:
+        session.close()
@@ -0,0 +1,111 @@
+import cli
+import jobs
+import output_cache
+import pipeline
+import procs
+import registry
+import sequence
+from procs import stream_process
+
+def _stream_shell(full_command, session, status=None):
+    yield from stream_process(full_command, session, shell=True, status=status)
+
+def _builtin_status(lines, status):
+    # Un comando interno falla si lanza una excepción, no por el texto de su salida
+    yield from lines
+    status['failed'] = False
+
+def stream_command(parsed_command, session=None, status=None, history=True):
+    """
+    Variante de cli.execute_command que produce la salida por fragmentos (líneas)
+    en lugar de devolverla completa al final. Los comandos sin salida incremental
+    producen un único fragmento con el mismo resultado que execute_command.
+    Si se pasa el diccionario `status`, al terminar status['failed'] indica si
+    el comando falló.
+    """
+    session = session or cli.default_session
+    status = {} if status is None else status
+    status['failed'] = True
+    if isinstance(parsed_command, jobs.Background):
+        job = cli.submit_background(parsed_command, session)
+        status['failed'] = isinstance(job, str)
+        yield job if status['failed'] else job.announcement()
+        return
+
+    if isinstance(parsed_command, sequence.Sequence):
+        yield from _stream_sequence(parsed_command, session, status)
+        return
+
+    if isinstance(parsed_command, pipeline.Pipeline):
+        if history:
+            session.history.append(pipeline.format_pipeline(parsed_command))
+        try:
+            yield from pipeline.run_pipeline(parsed_command, session, status)
+        except Exception as e:
+            yield str(e)
+        return
+
+    command, args = parsed_command
+
+    spec = registry.get(command)
+    if spec is not None and spec.stream is None:
+        output, status['failed'] = cli.execute_with_status(parsed_command, session, history)
+        yield output
+        return
+
+    if history:
+        full_command = cli.record_history(session, command, args)
+    else:
+        full_command = f"{command} {' '.join(args)}"
+    try:
+        if spec is None:
+            yield from _stream_shell(full_command, session, status)
+        else:
+            if spec.cache is not None:
+                # La salida por streaming no pasa por la caché
+                args, _ = output_cache.split_bypass(args)
+            usage_error = spec.check_args(args)
+            if usage_error:
+                yield usage_error
+            else:
+                yield from _builtin_status(spec.stream(args, session), status)
+    except Exception as e:
+        status['failed'] = True
+        if str(e):
+            yield str(e)
+
+def _stream_sequence(parsed_sequence, session, status):
+    """
+    Pasos de una secuencia uno tras otro; la salida de cada paso se envía en
+    cuanto se produce, sin esperar al resto de la secuencia
+    """
+    session.history.append(sequence.format_sequence(parsed_sequence))
+    last_failed = False
+    for step in parsed_sequence.steps:
+        if not sequence.should_run(step.operator, last_failed):
+            continue
+        step_status = {}
+        yield from stream_command(step.command, session, step_status, history=False)
+        last_failed = step_status['failed']
+    status['failed'] = last_failed
+
+def stream_process_command(command_string, session=None):
+    """
+    Equivalente por streaming de cli.process_command. Produce tuplas (evento, datos):
+      ('lexical', tokens) una vez, ('output', texto) por cada fragmento y
+      ('end', {'cwd': ...}) al terminar.
+    """
+    session = session or cli.default_session
+    with session.lock, procs.track_processes(session.running):
+        try:
+            lexical_analysis, parsed_command = cli.analyze_cached(command_string)
+            yield 'lexical', lexical_analysis
+
+            if parsed_command:
+                for chunk in stream_command(parsed_command, session):
+                    yield 'output', chunk
+            else:
+                yield 'output', "Error: No se pudo parsear el comando correctamente."
+        except Exception as e:
+            yield 'output', f"Error: {str(e)}"
+        yield 'end', {'cwd': session.cwd}
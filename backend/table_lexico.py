@@ -1,4 +1,10 @@
-import ply.lex as lex
+import re
+import sys
+from collections import namedtuple
+
+import parse_tables
+import commands  # Registra los comandos disponibles
+import registry
 
 # Lista expandida de tokens
 tokens = [
@@ -30,17 +36,10 @@ tokens = [
     'PERMISOS'        # Permisos de archivo (ejemplo: 755, rwxr-xr-x)
 ]
 
-# Lista de comandos válidos
-commands_list = [
-    'cat', 'ls', 'echo', 'mkdir', 'pwd', 'cd', 'help', 
-    'history', 'clear', 'cls', 'unzip', 'rm', 'mv', 'cp', 'zip',
-    'ping', 'ipconfig', 'netstat', 'dig'
-]
-
 # Patrones de expresiones regulares
 def t_COMANDO(t):
     r'[a-zA-Z][a-zA-Z0-9]*'
-    if t.value.lower() in commands_list:
+    if t.value.lower() in registry.registry:  # Comandos registrados en commands.py
         return t
     # Si no es un comando reconocido, será procesado por otras reglas
     t.type = 'ARGUMENTO'
@@ -163,22 +162,112 @@ def t_error(t):
     print(f"Carácter ilegal '{t.value[0]}' en la línea {t.lexer.lineno}")
     t.lexer.skip(1)
 
+# Token con su posición en el comando original
+Token = namedtuple('Token', ['value', 'type', 'start', 'end'])
+
 # Construir el lexer
-lexer = lex.lex()
+lexer = parse_tables.build_lexer(sys.modules[__name__], 'lexico')
+
+# ---------------------------------------------------------------------------
+# Motor rápido: una única expresión regular precompilada con un grupo con nombre
+# por regla (en el mismo orden y con las mismas banderas que usa PLY) y una tabla
+# que resuelve el tipo/valor final sin crear LexToken ni llamar a t_*.
+# ---------------------------------------------------------------------------
+
+_RULES = sorted((rule for name, rule in list(globals().items())
+                 if name.startswith('t_') and callable(rule) and name != 't_error'),
+                key=lambda rule: rule.__code__.co_firstlineno)
+
+_MASTER_REGEX = re.compile('|'.join(f"(?P<{rule.__name__[2:]}>{rule.__doc__})" for rule in _RULES),
+                           re.VERBOSE)
+
+def _resolve_comando(value):
+    return (value, 'COMANDO') if value.lower() in registry.registry else (value, 'ARGUMENTO')
+
+def _resolve_ip(value):
+    if all(0 <= int(num) <= 255 for num in value.split('.')):
+        return value, 'IP'
+    return value, 'ARGUMENTO'
+
+def _resolve_dominio(value):
+    if not value.startswith(('http://', 'https://')):
+        return value, 'DOMINIO'
+    return value, 'ARGUMENTO'
+
+# Reglas cuya función t_* cambia el valor o el tipo del token; el resto lo deja igual
+_RESOLVERS = {
+    'COMANDO': _resolve_comando,
+    'IP': _resolve_ip,
+    'PUERTO': lambda value: (value[1:], 'PUERTO'),
+    'PROTOCOLO': lambda value: (value.upper(), 'PROTOCOLO'),
+    'DOMINIO': _resolve_dominio,
+    'STRING': lambda value: (value[1:-1], 'STRING'),
+    'NUMERO': lambda value: (int(value), 'NUMERO'),
+}
+
+def _tokenize_regex(command_string):
+    tokens = []
+    append = tokens.append
+    match = _MASTER_REGEX.match
+    resolvers = _RESOLVERS
+    pos = 0
+    end = len(command_string)
+    lineno = 1
+    while pos < end:
+        if command_string[pos] in t_ignore:
+            pos += 1
+            continue
+        m = match(command_string, pos)
+        if m is None:
+            print(f"Carácter ilegal '{command_string[pos]}' en la línea {lineno}")
+            pos += 1
+            continue
+        start, pos = m.span()
+        kind = m.lastgroup
+        value = m.group()
+        if kind == 'newline':
+            lineno += len(value)
+            continue
+        resolver = resolvers.get(kind)
+        if resolver is not None:
+            value, kind = resolver(value)
+        append(Token(value, kind, start, pos))
+    return tokens
 
-def analyze_command(command_string):
-    """
-    Analiza un comando y retorna una lista de tuplas (valor, tipo)
-    """
-    lexer.input(command_string)
+def _tokenize_ply(command_string):
+    command_lexer = lexer.clone()
+    command_lexer.input(command_string)
     tokens = []
     while True:
-        tok = lexer.token()
+        tok = command_lexer.token()
         if not tok:
             break
-        tokens.append((tok.value, tok.type))
+        # Tras devolver un token, lexpos queda justo al final del texto reconocido
+        tokens.append(Token(tok.value, tok.type, tok.lexpos, command_lexer.lexpos))
     return tokens
 
+ENGINES = {
+    'regex': _tokenize_regex,
+    'ply': _tokenize_ply,
+}
+
+# Motor usado por defecto; ambos producen exactamente los mismos tokens
+# (ver bench_lexico.py, que compara resultados y velocidad)
+DEFAULT_ENGINE = 'regex'
+
+def tokenize(command_string, engine=None):
+    """
+    Analiza un comando y retorna la lista de tokens (valor, tipo, inicio, fin),
+    donde inicio y fin son las posiciones del token en el texto original
+    """
+    return ENGINES[engine or DEFAULT_ENGINE](command_string)
+
+def analyze_command(command_string, engine=None):
+    """
+    Analiza un comando y retorna una lista de tuplas (valor, tipo)
+    """
+    return [(tok.value, tok.type) for tok in tokenize(command_string, engine)]
+
 def print_token_table(tokens):
     """
     Imprime una tabla formateada con los tokens y sus tipos, incluyendo numeración
@@ -0,0 +1,11 @@
+# ask_lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ARGUMENT', 'COMMAND'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_COMMAND>[a-zA-Z][a-zA-Z0-9]*)|(?P<t_newline>\\n+)|(?P<t_ARGUMENT>[a-zA-Z0-9./_\\-~@:]+|"[^"]*"|\\\'[^\\\']*\\\')', [None, ('t_COMMAND', 'COMMAND'), ('t_newline', 'newline'), (None, 'ARGUMENT')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_grammar_hash = '8cbfdf2a39017c09'
@@ -1,5 +1,5 @@
 
-# parsetab.py
+# ask_parsetab.py
 # This file is automatically generated. Do not edit.
 # pylint: disable=W,C,R
 _tabversion = '3.10'
@@ -27,8 +27,9 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> command","S'",1,None,None,None),
-  ('command -> COMMAND','command',1,'p_command','cli.py',52),
-  ('command -> COMMAND ARGUMENTS','command',2,'p_command','cli.py',53),
-  ('ARGUMENTS -> ARGUMENT','ARGUMENTS',1,'p_arguments','cli.py',64),
-  ('ARGUMENTS -> ARGUMENT ARGUMENTS','ARGUMENTS',2,'p_arguments','cli.py',65),
+  ('command -> COMMAND','command',1,'p_command','ask.py',53),
+  ('command -> COMMAND ARGUMENTS','command',2,'p_command','ask.py',54),
+  ('ARGUMENTS -> ARGUMENT','ARGUMENTS',1,'p_arguments','ask.py',65),
+  ('ARGUMENTS -> ARGUMENT ARGUMENTS','ARGUMENTS',2,'p_arguments','ask.py',66),
 ]
+_grammar_hash = '2b5d47d62f9cba20'
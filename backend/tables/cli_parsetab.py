@@ -0,0 +1,44 @@
+
+# cli_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'AMP AND ARGUMENT COMMAND OR PIPE REDIRECT SEMI\n    command_line : sequence\n                 | sequence SEMI\n                 | sequence AMP\n    \n    sequence : pipeline\n             | sequence SEMI pipeline\n             | sequence AND pipeline\n             | sequence OR pipeline\n    \n    pipeline : stage\n             | pipeline PIPE stage\n    \n    stage : COMMAND\n          | ARGUMENT\n          | stage ARGUMENT\n          | stage REDIRECT ARGUMENT\n    '
+    
+_lr_action_items = {'COMMAND':([0,7,9,10,11,],[5,5,5,5,5,]),'ARGUMENT':([0,4,5,6,7,9,10,11,12,13,17,18,],[6,12,-10,-11,6,6,6,6,-12,18,12,-13,]),'$end':([1,2,3,4,5,6,7,8,12,14,15,16,17,18,],[0,-1,-4,-8,-10,-11,-2,-3,-12,-5,-6,-7,-9,-13,]),'SEMI':([2,3,4,5,6,12,14,15,16,17,18,],[7,-4,-8,-10,-11,-12,-5,-6,-7,-9,-13,]),'AMP':([2,3,4,5,6,12,14,15,16,17,18,],[8,-4,-8,-10,-11,-12,-5,-6,-7,-9,-13,]),'AND':([2,3,4,5,6,12,14,15,16,17,18,],[9,-4,-8,-10,-11,-12,-5,-6,-7,-9,-13,]),'OR':([2,3,4,5,6,12,14,15,16,17,18,],[10,-4,-8,-10,-11,-12,-5,-6,-7,-9,-13,]),'PIPE':([3,4,5,6,12,14,15,16,17,18,],[11,-8,-10,-11,-12,11,11,11,-9,-13,]),'REDIRECT':([4,5,6,12,17,18,],[13,-10,-11,-12,13,-13,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'command_line':([0,],[1,]),'sequence':([0,],[2,]),'pipeline':([0,7,9,10,],[3,14,15,16,]),'stage':([0,7,9,10,11,],[4,4,4,4,17,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> command_line","S'",1,None,None,None),
+  ('command_line -> sequence','command_line',1,'p_command_line','cli.py',106),
+  ('command_line -> sequence SEMI','command_line',2,'p_command_line','cli.py',107),
+  ('command_line -> sequence AMP','command_line',2,'p_command_line','cli.py',108),
+  ('sequence -> pipeline','sequence',1,'p_sequence','cli.py',131),
+  ('sequence -> sequence SEMI pipeline','sequence',3,'p_sequence','cli.py',132),
+  ('sequence -> sequence AND pipeline','sequence',3,'p_sequence','cli.py',133),
+  ('sequence -> sequence OR pipeline','sequence',3,'p_sequence','cli.py',134),
+  ('pipeline -> stage','pipeline',1,'p_pipeline','cli.py',153),
+  ('pipeline -> pipeline PIPE stage','pipeline',3,'p_pipeline','cli.py',154),
+  ('stage -> COMMAND','stage',1,'p_stage','cli.py',160),
+  ('stage -> ARGUMENT','stage',1,'p_stage','cli.py',161),
+  ('stage -> stage ARGUMENT','stage',2,'p_stage','cli.py',162),
+  ('stage -> stage REDIRECT ARGUMENT','stage',3,'p_stage','cli.py',163),
+]
+_grammar_hash = '4c83a560f7f455cc'
@@ -0,0 +1,11 @@
+# lexico_lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ARCHIVO', 'ARGUMENTO', 'COMANDO', 'COMODIN', 'DOMINIO', 'EXTENSION', 'FLAG', 'HOST_USUARIO', 'IP', 'MAC', 'MASCARA_RED', 'NUMERO', 'OPERADOR', 'PERMISOS', 'PIPE', 'PROTOCOLO', 'PUERTO', 'REDIRECCION', 'RUTA', 'RUTA_ABSOLUTA', 'RUTA_RELATIVA', 'SIMBOLO', 'STRING', 'TIMESTAMP', 'URL', 'VARIABLE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_COMANDO>[a-zA-Z][a-zA-Z0-9]*)|(?P<t_FLAG>-[a-zA-Z]+|--[a-zA-Z][a-zA-Z0-9-]*)|(?P<t_IP>\\b(?:\\d{1,3}\\.){3}\\d{1,3}\\b)|(?P<t_MASCARA_RED>/\\d{1,2}|(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?))|(?P<t_PUERTO>:\\d{1,5})|(?P<t_PROTOCOLO>(?:TCP|UDP|ICMP|HTTP|HTTPS|FTP|SSH|TELNET))|(?P<t_MAC>(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2})|(?P<t_URL>https?://[\\w\\-.]+(:\\d+)?(/[\\w\\-./?%&=]*)?)|(?P<t_DOMINIO>(?:[a-zA-Z0-9-]+\\.)+[a-zA-Z]{2,})|(?P<t_HOST_USUARIO>[a-zA-Z0-9_-]+@[a-zA-Z0-9.-]+)|(?P<t_TIMESTAMP>\\d{4}-\\d{2}-\\d{2} \\d{2}:\\d{2}:\\d{2}|\\d{10})|(?P<t_PERMISOS>[0-7]{3,4}|[rwx-]{9})|(?P<t_RUTA_ABSOLUTA>/(?:[a-zA-Z0-9._-]+/)*[a-zA-Z0-9._-]*)|(?P<t_RUTA_RELATIVA>\\.{1,2}/(?:[a-zA-Z0-9._-]+/)*[a-zA-Z0-9._-]*)|(?P<t_ARCHIVO>[a-zA-Z0-9_-]+\\.[a-zA-Z0-9]+)|(?P<t_EXTENSION>\\.[a-zA-Z0-9]+)|(?P<t_VARIABLE>\\$[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_STRING>\\"[^\\"]*\\"|\\\'[^\\\']*\\\')|(?P<t_NUMERO>\\d+)|(?P<t_PIPE>\\|)|(?P<t_REDIRECCION>>>|>|<)|(?P<t_COMODIN>\\*|\\?|\\[\\^?\\]?[^\\]]*\\])|(?P<t_OPERADOR>[><|&;]+)|(?P<t_SIMBOLO>[./\\-_@:~#$%^&*()+={}[\\]\\\\])|(?P<t_newline>\\n+)', [None, ('t_COMANDO', 'COMANDO'), ('t_FLAG', 'FLAG'), ('t_IP', 'IP'), ('t_MASCARA_RED', 'MASCARA_RED'), ('t_PUERTO', 'PUERTO'), ('t_PROTOCOLO', 'PROTOCOLO'), ('t_MAC', 'MAC'), ('t_URL', 'URL'), None, None, ('t_DOMINIO', 'DOMINIO'), ('t_HOST_USUARIO', 'HOST_USUARIO'), ('t_TIMESTAMP', 'TIMESTAMP'), ('t_PERMISOS', 'PERMISOS'), ('t_RUTA_ABSOLUTA', 'RUTA_ABSOLUTA'), ('t_RUTA_RELATIVA', 'RUTA_RELATIVA'), ('t_ARCHIVO', 'ARCHIVO'), ('t_EXTENSION', 'EXTENSION'), ('t_VARIABLE', 'VARIABLE'), ('t_STRING', 'STRING'), ('t_NUMERO', 'NUMERO'), ('t_PIPE', 'PIPE'), ('t_REDIRECCION', 'REDIRECCION'), ('t_COMODIN', 'COMODIN'), ('t_OPERADOR', 'OPERADOR'), ('t_SIMBOLO', 'SIMBOLO'), ('t_newline', 'newline')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_grammar_hash = '665ca8670dfa4eb7'
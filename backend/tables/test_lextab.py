@@ -0,0 +1,11 @@
+# test_lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ARGUMENT', 'COMMAND'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_COMMAND>[a-zA-Z]+)|(?P<t_newline>\\n+)|(?P<t_ARGUMENT>[^\\s]+)', [None, ('t_COMMAND', 'COMMAND'), ('t_newline', 'newline'), (None, 'ARGUMENT')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_grammar_hash = 'cd1f601551b06ada'
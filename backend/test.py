@@ -1,6 +1,7 @@
 import subprocess
+import sys
 import os
-from ply import lex, yacc
+import parse_tables
 
 # Lexer for command parsing
 tokens = (
@@ -34,7 +35,7 @@ def t_error(t):
     print(f"Illegal character '{t.value[0]}'")
     t.lexer.skip(1)
 
-lexer = lex.lex()
+lexer = parse_tables.build_lexer(sys.modules[__name__], 'test')
 
 # Parsing rules
 def p_command(p):
@@ -65,7 +66,7 @@ def p_error(p):
     else:
         print("Syntax error at EOF")
 
-parser = yacc.yacc()
+parser = parse_tables.build_parser(sys.modules[__name__], 'test')
 
 def execute_command(parsed_command):
     command, args = parsed_command
@@ -0,0 +1,37 @@
+import asyncio
+
+import app as flask_app
+import asgi
+
+def _flask(method, path, **kwargs):
+    response = getattr(flask_app.app.test_client(), method)(path, **kwargs)
+    return response.status_code, response.get_data(as_text=True)
+
+def _quart(method, path, **kwargs):
+    async def request():
+        response = await getattr(asgi.app.test_client(), method)(path, **kwargs)
+        return response.status_code, await response.get_data(as_text=True)
+    return asyncio.run(request())
+
+def test_servers_answer_the_same(tmp_path):
+    (tmp_path / 'a.txt').write_text('hola\n')
+    requests = [
+        ('post', '/execute', {'json': {'command': f'cat {tmp_path}/a.txt', 'session_id': 'api'}}),
+        ('post', '/execute', {'json': {}}),
+        ('post', '/execute/batch', {'json': {'commands': [f'cd {tmp_path}', 'pwd'], 'session_id': 'api'}}),
+        ('post', '/execute/stream', {'json': {'command': 'echo a', 'session_id': 'api'}}),
+        ('get', '/file?session_id=api&path=nope.txt', {}),
+        ('get', '/jobs/7?session_id=api', {}),
+        ('post', '/cancel', {'json': {'session_id': 'api'}}),
+    ]
+    for method, path, kwargs in requests:
+        assert _flask(method, path, **kwargs) == _quart(method, path, **kwargs), path
+
+def test_session_id_must_be_a_string():
+    for path, body in [('/execute', {'command': 'pwd', 'session_id': 7}),
+                       ('/execute/batch', {'commands': ['pwd'], 'session_id': {'id': 1}}),
+                       ('/execute/stream', {'command': 'pwd', 'session_id': [1]}),
+                       ('/cancel', {'session_id': 7})]:
+        for client in (_flask, _quart):
+            status, text = client('post', path, json=body)
+            assert status == 400 and 'session_id' in text, (path, text)
@@ -0,0 +1,28 @@
+import time
+
+import cli
+import output_cache
+from cache import LRUCache
+from session import Session
+
+def test_invalid_entry_counts_as_miss_and_is_dropped():
+    cache = LRUCache()
+    cache.put('key', 'stale')
+    assert cache.get('key', valid=lambda value: value != 'stale') is None
+    assert (cache.hits, cache.misses, len(cache)) == (0, 1, 0)
+
+def test_expired_output_is_a_miss(monkeypatch):
+    cache = LRUCache()
+    monkeypatch.setattr(output_cache, 'output_cache', cache)
+    cache.put('fresh', (time.monotonic() + 60, 'salida'))
+    cache.put('expired', (time.monotonic() - 1, 'vieja'))
+    assert output_cache.lookup('fresh') == 'salida'
+    assert output_cache.lookup('expired') is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+def test_pwd_does_not_use_the_output_cache(tmp_path, monkeypatch):
+    cache = LRUCache()
+    monkeypatch.setattr(output_cache, 'output_cache', cache)
+    assert cli.process_command('pwd', Session('pwd', str(tmp_path)))['execution_result'] == str(tmp_path)
+    assert len(cache) == 0 and cache.stats()['misses'] == 0
@@ -0,0 +1,49 @@
+import pytest
+
+import cli
+from session import Session
+
+@pytest.fixture
+def session(tmp_path):
+    return Session(None, str(tmp_path))
+
+def test_output_that_looks_like_an_error_is_not_a_failure(session, tmp_path):
+    (tmp_path / 'log.txt').write_text('Error: disk full\n')
+    results = cli.process_batch(['cat log.txt', 'echo Error foo', 'echo next'], session, stop_on_error=True)
+    assert [result['error'] for result in results] == [False, False, False]
+    assert results[0]['execution_result'] == 'Error: disk full\n'
+
+def test_batch_stops_after_failed_command(session):
+    results = cli.process_batch(['cat nope.txt', 'echo next'], session, stop_on_error=True)
+    assert len(results) == 1
+    assert results[0]['error']
+    assert results[0]['execution_result'] == 'Archivo no encontrado.'
+
+def test_failure_without_error_prefix(session):
+    assert not cli.process_command('mkdir d', session)['error']
+    result = cli.process_command('mkdir d', session)
+    assert result['error']
+    assert result['execution_result'] == 'El directorio ya existe.'
+
+def test_usage_error_is_a_failure(session):
+    result = cli.process_command('cat', session)
+    assert result['error']
+    assert result['execution_result'] == 'Error: No se especificó un archivo.'
+
+def test_partial_failure_keeps_the_output_of_every_target(session, tmp_path):
+    (tmp_path / 'a').write_text('')
+    result = cli.process_command('rm a b', session)
+    assert result['error']
+    assert result['execution_result'] == 'Eliminado: a\nError: b no encontrado'
+
+def test_long_options_are_not_split_into_letters(session, tmp_path):
+    (tmp_path / 'dir').mkdir()
+    (tmp_path / 'dir' / 'keep.txt').write_text('')
+    # --force no incluye la r de recursive
+    result = cli.process_command('rm --force dir', session)
+    assert result['error'] and 'Use -r' in result['execution_result']
+    result = cli.process_command('rm --verbose dir', session)
+    assert result['execution_result'] == 'Error: Opción no reconocida: --verbose'
+    assert (tmp_path / 'dir' / 'keep.txt').exists()
+    assert not cli.process_command('rm --recursive --force dir', session)['error']
+    assert not (tmp_path / 'dir').exists()
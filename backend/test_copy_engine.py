@@ -0,0 +1,27 @@
+import os
+import shutil
+
+import pytest
+
+import copy_engine
+
+def test_copy_onto_itself_keeps_the_source(tmp_path):
+    source = tmp_path / 'a.txt'
+    source.write_text('hola\n')
+    for destination in (source, tmp_path):
+        with pytest.raises(shutil.SameFileError):
+            copy_engine.copy_file(str(source), str(destination))
+    assert source.read_text() == 'hola\n'
+
+def test_copy_into_directory_uses_the_source_name(tmp_path):
+    (tmp_path / 'a.txt').write_text('hola\n')
+    (tmp_path / 'dir').mkdir()
+    copy_engine.copy_file(str(tmp_path / 'a.txt'), str(tmp_path / 'dir'))
+    assert (tmp_path / 'dir' / 'a.txt').read_text() == 'hola\n'
+
+def test_pseudo_files_are_copied_with_their_content(tmp_path):
+    if not os.path.exists('/proc/self/status'):
+        pytest.skip("sin /proc")
+    assert os.stat('/proc/self/status').st_size == 0
+    copy_engine.copy_file('/proc/self/status', str(tmp_path / 'status'))
+    assert (tmp_path / 'status').read_text().startswith('Name:')
@@ -0,0 +1,143 @@
+import socket
+import struct
+import threading
+
+import pytest
+
+import dns_resolver
+from dns_resolver import DNSError, build_query, decode_name, parse_response
+
+def _header(query_id, flags=0x8180, qdcount=1, ancount=0, nscount=0):
+    return struct.pack('!HHHHHH', query_id, flags, qdcount, ancount, nscount, 0)
+
+def _question(name='example.test.', qtype='A'):
+    return dns_resolver.encode_name(name) + struct.pack('!HH', dns_resolver.RECORD_TYPES[qtype], 1)
+
+def _record(owner, rtype, ttl, rdata):
+    # owner: nombre ya codificado (o puntero de compresión)
+    return owner + struct.pack('!HHIH', dns_resolver.RECORD_TYPES[rtype], 1, ttl, len(rdata)) + rdata
+
+# Puntero de compresión al nombre de la pregunta (justo después de la cabecera)
+QUESTION_NAME = b'\xc0\x0c'
+
+def test_decode_name_follows_compression_pointers():
+    data = b'\x00' * 12 + b'\x07example\x04test\x00' + b'\x03www\xc0\x0c'
+    assert decode_name(data, 12) == ('example.test.', 26)
+    # El offset siguiente es el del puntero, no el del nombre al que apunta
+    assert decode_name(data, 26) == ('www.example.test.', 32)
+
+def test_decode_name_rejects_pointer_loops_and_truncation():
+    with pytest.raises(DNSError):
+        decode_name(b'\xc0\x00', 0)
+    with pytest.raises(DNSError):
+        decode_name(b'\x07exa', 0)
+    with pytest.raises(DNSError):
+        decode_name(b'\x03www', 0)
+    with pytest.raises(DNSError):
+        decode_name(b'\x03www\xc0', 0)
+
+def test_parse_response_answers_and_authority():
+    packet = (_header(7, ancount=2, nscount=1) + _question('example.test.', 'MX')
+              + _record(QUESTION_NAME, 'MX', 300, struct.pack('!H', 10) + b'\x04mail' + QUESTION_NAME)
+              + _record(QUESTION_NAME, 'A', 60, socket.inet_aton('192.0.2.1'))
+              + _record(QUESTION_NAME, 'NS', 120, b'\x02ns' + QUESTION_NAME))
+    response, truncated = parse_response(packet, 7, 'example.test.', 'MX')
+    assert not truncated
+    assert response.rcode == 'NOERROR'
+    assert [(r.type, r.ttl, r.data) for r in response.answers] == [
+        ('MX', 300, '10 mail.example.test.'), ('A', 60, '192.0.2.1')]
+    assert response.authority[0].data == 'ns.example.test.'
+
+def test_parse_response_rejects_malformed_packets():
+    question = _header(7, ancount=1) + _question()
+    malformed = [
+        b'\x00\x07\x81',                                                      # cabecera incompleta
+        _header(8, ancount=1) + _question(),                                  # id de otra consulta
+        _header(7, flags=0x0100) + _question(),                               # no es una respuesta
+        question,                                                             # falta la respuesta
+        question + QUESTION_NAME + struct.pack('!HHI', 1, 1, 60),             # registro cortado
+        question + _record(QUESTION_NAME, 'A', 60, b'\xc0\x00\x02\x01')[:-2],  # rdata cortada
+        question + _record(QUESTION_NAME, 'MX', 60, b'\x00'),                 # MX sin nombre
+        question + _record(QUESTION_NAME, 'SOA', 60, b'\x00\x00'),            # SOA sin contadores
+        question + _record(QUESTION_NAME, 'TXT', 60, b'\x05ab'),              # cadena TXT cortada
+    ]
+    for packet in malformed:
+        with pytest.raises(DNSError):
+            parse_response(packet, 7, 'example.test.', 'A')
+
+def test_parse_response_reports_truncation_and_rcode():
+    response, truncated = parse_response(_header(7, flags=0x8383) + _question(), 7, 'example.test.', 'A')
+    assert truncated
+    assert response.rcode == 'NXDOMAIN'
+
+class StubServer:
+    """
+    Servidor DNS por UDP en 127.0.0.1 que contesta a cualquier pregunta A con
+    192.0.2.1 y el TTL indicado, y cuenta las consultas recibidas
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.queries = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                data, client = self.sock.recvfrom(512)
+            except OSError:
+                return
+            self.queries += 1
+            query_id = struct.unpack('!H', data[:2])[0]
+            question = data[12:]
+            answer = _record(QUESTION_NAME, 'A', self.ttl, socket.inet_aton('192.0.2.1'))
+            self.sock.sendto(_header(query_id, ancount=1) + question + answer, client)
+
+    def close(self):
+        self.sock.close()
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(ttl):
+        servers.append(StubServer(ttl))
+        return servers[-1]
+
+    dns_resolver.response_cache.clear()
+    yield start
+    for server in servers:
+        server.close()
+    dns_resolver.response_cache.clear()
+
+def _resolve(server, name='example.test'):
+    [response] = dns_resolver.resolve([(name, 'A')], servers=['127.0.0.1'], port=server.port, timeout=1.0)
+    assert not isinstance(response, Exception), response
+    return response
+
+def test_query_against_udp_stub_is_cached_for_its_ttl(stub_server):
+    server = stub_server(ttl=300)
+    first = _resolve(server)
+    assert [r.data for r in first.answers] == ['192.0.2.1']
+    assert first.server == '127.0.0.1'
+    assert _resolve(server) == first
+    assert server.queries == 1
+    # Otro nombre es otra entrada de la caché
+    _resolve(server, 'other.test')
+    assert server.queries == 2
+
+def test_expired_answers_are_queried_again(stub_server):
+    server = stub_server(ttl=0)
+    _resolve(server)
+    _resolve(server)
+    assert server.queries == 2
+
+def test_build_query_round_trip():
+    packet = build_query('example.test', 'AAAA', 0x1234)
+    assert struct.unpack('!H', packet[:2])[0] == 0x1234
+    assert decode_name(packet, 12) == ('example.test.', 26)
+    assert struct.unpack('!HH', packet[26:30]) == (dns_resolver.RECORD_TYPES['AAAA'], 1)
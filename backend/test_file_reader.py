@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+import file_reader
+
+def test_pseudo_files_are_read_without_mmap():
+    if not os.path.exists('/proc/self/status'):
+        pytest.skip("sin /proc")
+    # Tamaño 0 en stat, contenido al leerlo
+    assert file_reader.read_file('/proc/self/status', head=1).content.startswith('Name:')
+
+def test_character_devices_are_read_up_to_max_bytes():
+    result = file_reader.read_file(os.devnull)
+    assert result.content == '' and result.next_token is None
+
+def test_large_files_page_through_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_reader, 'MMAP_MIN_BYTES', 1)
+    path = tmp_path / 'big.txt'
+    path.write_text(''.join(f"line {i}\n" for i in range(1000)))
+
+    assert file_reader.read_file(str(path), tail=1).content == 'line 999\n'
+    first = file_reader.read_file(str(path), head=3, max_bytes=10)
+    rest = file_reader.read_file(str(path), token=first.next_token)
+    assert first.content + rest.content == 'line 0\nline 1\nline 2\n'
+
+def test_truncated_file_is_not_read_past_its_end(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_reader, 'MMAP_MIN_BYTES', 1)
+    path = tmp_path / 'log.txt'
+    path.write_bytes(b'x' * 8192)
+    with open(path, 'rb') as f:
+        with file_reader._contents(f, os.fstat(f.fileno())) as (data, size):
+            os.truncate(path, 10)
+            with pytest.raises(ValueError):
+                file_reader._copy(data, f, 0, size)
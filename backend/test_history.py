@@ -0,0 +1,18 @@
+import history
+import session as session_module
+
+def test_history_file_is_closed_when_the_session_expires(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, 'HISTORY_DIR', str(tmp_path))
+    expired = session_module.get_session('expired')
+    expired.history.append('pwd')
+    handle = expired.history._file
+    assert handle is not None and not handle.closed
+
+    expired.last_used -= session_module.SESSION_IDLE_TIMEOUT + 1
+    session_module.get_session('other')
+    assert handle.closed
+    session_module.drop_session('other')
+
+    # Al volver, la sesión recupera su historial del archivo
+    assert list(session_module.get_session('expired').history) == ['pwd']
+    session_module.drop_session('expired')
@@ -0,0 +1,23 @@
+import asyncio
+import os
+
+import pytest
+
+import procs
+from network_commands import ExternalPlan, run_plan_async
+from registry import CommandError
+from session import Session
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="usa /bin/sh")
+
+def _run(argv, tmp_path):
+    plan = ExternalPlan([argv], lambda returncode, output, error: (returncode, output, error), "Error")
+    return asyncio.run(run_plan_async(plan, Session('plans', cwd=str(tmp_path))))
+
+def test_async_plan_output_is_capped(tmp_path):
+    with procs.limited(procs.DEFAULT_LIMITS._replace(output_bytes=1000)):
+        with pytest.raises(CommandError, match="límite de 1000 bytes"):
+            _run(['sh', '-c', 'head -c 50000000 /dev/zero'], tmp_path)
+
+def test_async_plan_collects_both_streams(tmp_path):
+    assert _run(['sh', '-c', 'echo hola; echo mal >&2; exit 3'], tmp_path) == (3, 'hola\n', 'mal\n')
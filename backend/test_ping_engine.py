@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+import pytest
+
+import commands
+import ping_engine
+from registry import CommandError
+
+@pytest.fixture
+def slow_hosts(monkeypatch):
+    cancelled = []
+
+    async def ping_host(host, count, timeout, interval, emit):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(host)
+            raise
+
+    monkeypatch.setattr(ping_engine, 'ping_host', ping_host)
+    return cancelled
+
+def test_blocking_ping_stops_at_max_time(slow_hosts):
+    start = time.monotonic()
+    with pytest.raises(ping_engine.PingError, match="Tiempo de espera agotado"):
+        list(ping_engine.iter_ping_hosts(['a.test', 'b.test'], max_time=0.2))
+    assert time.monotonic() - start < 5
+    assert sorted(slow_hosts) == ['a.test', 'b.test']
+
+def test_ping_command_applies_its_timeout(slow_hosts, monkeypatch):
+    monkeypatch.setattr(commands.ping_command, 'timeout', 0.2)
+    with pytest.raises(CommandError, match="Tiempo de espera agotado"):
+        commands.ping_command(['a.test'], None)
+    with pytest.raises(CommandError, match="Tiempo de espera agotado"):
+        list(commands.ping_stream(['a.test'], None))
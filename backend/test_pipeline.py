@@ -0,0 +1,28 @@
+import pytest
+
+import cli
+from session import Session
+
+@pytest.fixture
+def session(tmp_path):
+    return Session(None, str(tmp_path))
+
+def test_builtin_output_that_looks_like_an_error_goes_down_the_pipe(session):
+    result = cli.process_command('echo Error | wc -l', session)
+    assert not result['error']
+    assert result['execution_result'].strip() == '1'
+
+def test_failed_builtin_stage_reports_to_stderr(session):
+    result = cli.process_command('cat nope.txt | wc -l', session)
+    assert result['execution_result'].split('\n') == ['0', 'Archivo no encontrado.']
+
+def test_failed_builtin_stage_with_stderr_redirect(session, tmp_path):
+    result = cli.process_command('cat nope.txt 2> err.txt', session)
+    assert result['error']
+    assert result['execution_result'] == ''
+    assert (tmp_path / 'err.txt').read_text() == 'Archivo no encontrado.\n'
+
+def test_partial_failure_keeps_the_data_in_the_pipe(session, tmp_path):
+    (tmp_path / 'a.txt').write_text('')
+    result = cli.process_command('ls a.txt nope | cat', session)
+    assert result['execution_result'].split('\n') == ['a.txt', 'Error: No existe el archivo o directorio: nope']
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+import procs
+from session import Session
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="usa /bin/sh")
+
+def test_output_cap_applies_within_a_single_line(tmp_path):
+    status = {}
+    with procs.limited(procs.DEFAULT_LIMITS._replace(output_bytes=64 * 1024)):
+        # Sin saltos de línea: leyendo por líneas se acumularía todo antes de comprobar el límite
+        lines = list(procs.stream_process("head -c 50000000 /dev/zero", Session('caps', cwd=str(tmp_path)),
+                                          shell=True, status=status))
+    assert lines == [procs.output_limit_message(64 * 1024)]
+    assert status['failed']
+
+def test_lines_split_across_reads(tmp_path, monkeypatch):
+    monkeypatch.setattr(procs, 'READ_CHUNK', 3)
+    lines = list(procs.stream_process("printf 'uno\\ndos\\n\\ntres'", Session('lines', cwd=str(tmp_path)),
+                                      shell=True))
+    assert lines == ['uno', 'dos', '', 'tres']
+
+@pytest.mark.skipif(not hasattr(procs.resource, 'prlimit'), reason="sin prlimit")
+def test_rlimits_are_applied_to_the_child(tmp_path):
+    with procs.limited(procs.DEFAULT_LIMITS._replace(cpu_seconds=7)):
+        result = procs.run("ulimit -t", Session('limits', cwd=str(tmp_path)), shell=True)
+    assert result.stdout.strip() == '7'
+
+def test_timeout_kills_children_left_behind_by_the_shell(tmp_path):
+    session = Session('orphans', cwd=str(tmp_path))
+    # El shell termina enseguida; sleep sigue en segundo plano con la salida abierta
+    with procs.limited(timeout=1):
+        result = procs.run('sh -c "sleep 8 &"; echo hi', session, shell=True)
+    assert result.error == procs.timeout_message(1)
+    assert result.stdout == 'hi\n'
+
+def test_timeout_applies_to_processes_that_leave_the_group(tmp_path):
+    session = Session('escaped', cwd=str(tmp_path))
+    with procs.limited(timeout=1):
+        result = procs.run('setsid sleep 4 & echo hi', session, shell=True)
+    assert result.error == procs.timeout_message(1)
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+import async_cli
+import cli
+import streaming
+from session import Session
+
+@pytest.fixture
+def session(tmp_path):
+    (tmp_path / 'log.txt').write_text('Error: disk full\n')
+    return Session(None, str(tmp_path))
+
+def _streamed(command, session):
+    return [payload for event, payload in streaming.stream_process_command(command, session) if event == 'output']
+
+@pytest.mark.parametrize('command', ['echo Error foo && echo next', 'cat log.txt && echo next'])
+def test_and_runs_after_output_that_looks_like_an_error(session, command):
+    result = cli.process_command(command, session)
+    assert not result['error']
+    assert [step['skipped'] for step in result['steps']] == [False, False]
+    assert result['execution_result'].endswith('next')
+
+def test_or_runs_after_failure(session):
+    result = cli.process_command('cat nope.txt || echo fallback', session)
+    assert [(step['error'], step['skipped']) for step in result['steps']] == [(True, False), (False, False)]
+    assert result['execution_result'] == 'Archivo no encontrado.\nfallback'
+
+def test_or_skipped_after_output_that_looks_like_an_error(session):
+    result = cli.process_command('ls log.txt || echo fallback', session)
+    assert [step['skipped'] for step in result['steps']] == [False, True]
+
+def test_streaming_sequence(session):
+    assert _streamed('cat log.txt && echo next', session) == ['Error: disk full', 'next']
+    assert _streamed('ls nope && echo next', session) == ['Error: No existe el archivo o directorio: nope']
+    assert _streamed('ls nope || echo fallback', session) == [
+        'Error: No existe el archivo o directorio: nope', 'fallback']
+
+def test_async_sequence(session):
+    result = asyncio.run(async_cli.process_command_async('echo Error foo && cat nope.txt || echo fallback', session))
+    assert [(step['error'], step['skipped']) for step in result['steps']] == [
+        (False, False), (True, False), (False, False)]
+    assert not result['error']
@@ -0,0 +1,43 @@
+import pytest
+
+import worker_pool
+from worker_pool import LocalRunner, WorkerError, WorkerPool
+
+def test_job_ids_from_json_are_normalized():
+    runner = LocalRunner()
+    job_id = runner.call('json-ids', 'execute', 'sleep 30 &')['job_id']
+    assert runner.call('json-ids', 'job', str(job_id), 0)['id'] == job_id
+    assert runner.call('json-ids', 'cancel', f'%{job_id}') == {'cancelled': True, 'job_id': job_id}
+    assert runner.call('json-ids', 'cancel', 'x') is None
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(1)
+    yield pool
+    pool.shutdown()
+
+def test_hung_worker_is_replaced_and_lost_jobs_are_reported(pool, monkeypatch):
+    pool.call('owner', 'execute', 'sleep 30 &')
+
+    monkeypatch.setattr(worker_pool, 'request_timeout', lambda operation, args: 1)
+    with pytest.raises(WorkerError, match="reiniciado"):
+        pool.call('other', 'execute', 'sleep 10')
+    monkeypatch.undo()
+
+    # El proceso nuevo atiende las peticiones, pero no conoce los trabajos del anterior
+    assert pool.call('other', 'execute', 'echo ok')['execution_result'] == 'ok'
+    with pytest.raises(WorkerError, match="se perdieron"):
+        pool.call('owner', 'job', 1, 0)
+    assert pool.call('owner', 'cancel', None) == {'cancelled': False}
+
+def test_request_timeout_follows_the_command_limits():
+    grace = worker_pool.REQUEST_TIMEOUT_GRACE
+    default = worker_pool.procs.DEFAULT_LIMITS.timeout
+    assert worker_pool.request_timeout('execute', ('echo hola',)) == default + grace
+    # Límite propio del comando, el de los trabajos para fg y la suma de los pasos de una secuencia
+    assert worker_pool.request_timeout('execute', ('ping -c 200 example.test',)) == 600 + grace
+    assert worker_pool.request_timeout('execute', ('fg',)) == worker_pool.procs.BACKGROUND_LIMITS.timeout + grace
+    assert worker_pool.request_timeout('execute', ('ls && ping example.test && ls',)) == 2 * default + 600 + grace
+    assert worker_pool.request_timeout('execute', ('sleep 300 &',)) == default + grace
+    assert worker_pool.request_timeout('batch', (['ls', 'fg'], False)) == \
+        default + worker_pool.procs.BACKGROUND_LIMITS.timeout + grace
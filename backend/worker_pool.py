@@ -0,0 +1,635 @@
+import asyncio
+import inspect
+import itertools
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import async_cli
+import cli
+import file_reader
+import jobs
+import procs
+import streaming
+from listing import listing_cache
+from output_cache import output_cache
+from session import SESSION_IDLE_TIMEOUT, get_session
+
+# Ejecución de los comandos en procesos de trabajo. Con TERMINAL_WORKERS=N el
+# servidor (app.py o asgi.py) sólo reparte las peticiones: cada sesión se atiende siempre
+# en el mismo proceso (afinidad por id), que se arranca desde un forkserver con
+# las tablas del parser ya cargadas. Un proceso que falla o que crece demasiado
+# no tumba el API: se sustituye por otro y la sesión conserva su cwd y su
+# entorno (el frontal guarda la última copia). Sin TERMINAL_WORKERS todo se
+# ejecuta en el propio proceso del servidor, como siempre.
+#   TERMINAL_WORKERS=4 python app.py
+
+WORKERS = int(os.environ.get('TERMINAL_WORKERS', '0') or 0)
+
+# Peticiones que atiende un proceso antes de sustituirlo
+MAX_REQUESTS_PER_WORKER = 1000
+
+# Memoria residente a partir de la cual se sustituye el proceso (al terminar la petición)
+MAX_WORKER_MEMORY = 512 * 1024 * 1024
+
+# Límite duro de memoria virtual del proceso (RLIMIT_AS): por encima falla la
+# reserva dentro del proceso en lugar de afectar al servidor
+WORKER_MEMORY_LIMIT = 4 * 1024 * 1024 * 1024
+
+# Peticiones simultáneas dentro de cada proceso (de sesiones distintas o /cancel)
+WORKER_THREADS = 16
+
+# Margen sobre el tiempo máximo de un comando antes de dar por colgado el proceso
+REQUEST_TIMEOUT_GRACE = 30
+
+# Módulos que el forkserver importa una vez; los procesos nacen con ellos cargados
+PRELOAD = ['cli', 'streaming', 'worker_pool']
+
+class WorkerError(Exception):
+    pass
+
+def new_session_id(session_id=None):
+    """
+    Id de la sesión de la petición; si el cliente no envía uno se crea aquí
+    para poder elegir su proceso
+    """
+    return session_id or uuid.uuid4().hex
+
+# ---------------------------------------------------------------------------
+# Operaciones (se ejecutan en el proceso de la sesión)
+# ---------------------------------------------------------------------------
+
+def _execute(session, command):
+    return cli.process_command(command, session)
+
+def _batch(session, commands, stop_on_error):
+    return {'results': cli.process_batch(commands, session, stop_on_error), 'cwd': session.cwd}
+
+def _stream(session, command):
+    return streaming.stream_process_command(command, session)
+
+def _history(session, page, page_size, text, prefix):
+    if text is None:
+        entries = session.history.page(page, page_size)
+    else:
+        entries = session.history.search(text, prefix, page, page_size)
+    return {'entries': [entry._asdict() for entry in entries], 'total': len(session.history)}
+
+def _read_file(session, path, options):
+    return file_reader.read_file(session.resolve(path), **options)._asdict()
+
+def _find_job(session, job_id):
+    # El id llega como número o como texto ("1", "%1"), según el cliente
+    job_id = jobs.parse_job_id(str(job_id))
+    return jobs.manager.get(session.id, job_id) if job_id is not None else None
+
+def _cancel(session, job_id):
+    """
+    Cancela el comando en curso o, con job_id, ese trabajo. None si no existe el trabajo.
+    """
+    if job_id is None:
+        return {'cancelled': session.running.kill() > 0}
+    job = _find_job(session, job_id)
+    if job is None:
+        return None
+    return {'cancelled': jobs.manager.kill(job), 'job_id': job.id}
+
+def _jobs(session):
+    return [job.to_dict(since=job.lines) for job in jobs.manager.list(session.id)]
+
+def _job(session, job_id, since):
+    job = _find_job(session, job_id)
+    return job.to_dict(since) if job is not None else None
+
+OPERATIONS = {
+    'execute': _execute,
+    'batch': _batch,
+    'stream': _stream,
+    'history': _history,
+    'read_file': _read_file,
+    'cancel': _cancel,
+    'jobs': _jobs,
+    'job': _job,
+}
+
+# Operaciones que el proceso atiende en el acto, aunque todos sus hilos estén ocupados
+INLINE_OPERATIONS = {'cancel'}
+
+def request_timeout(operation, args):
+    """
+    Segundos que se espera la respuesta del proceso de trabajo: lo que pueden
+    durar los comandos según sus propios límites (cli.command_timeout) más un
+    margen. Los procesos los mata antes su propio tiempo máximo; esto sólo
+    detecta un proceso de trabajo colgado.
+    """
+    if operation == 'execute':
+        seconds = cli.command_timeout(args[0])
+    elif operation == 'batch':
+        seconds = sum(cli.command_timeout(command) for command in args[0])
+    else:
+        seconds = procs.DEFAULT_LIMITS.timeout
+    return seconds + REQUEST_TIMEOUT_GRACE
+
+def _uses_jobs(operation, args):
+    # Operaciones sobre los trabajos en segundo plano (cancel sin job_id es el comando en curso)
+    return operation in ('jobs', 'job') or (operation == 'cancel' and args[0] is not None)
+
+async def _execute_async(session, command):
+    return await async_cli.process_command_async(command, session)
+
+async def _batch_async(session, commands, stop_on_error):
+    results = await async_cli.process_batch_async(commands, session, stop_on_error)
+    return {'results': results, 'cwd': session.cwd}
+
+# Variantes para el servidor ASGI en el propio proceso: los comandos de red no ocupan un hilo
+ASYNC_OPERATIONS = {
+    'execute': _execute_async,
+    'batch': _batch_async,
+}
+
+async def iterate_in_thread(make_iterator):
+    """
+    Generador asíncrono con los elementos de make_iterator(), un generador
+    bloqueante que se recorre entero en un hilo propio (los de streaming
+    tienen tomado session.lock entre un elemento y el siguiente, y el RLock
+    es del hilo). Si se deja de leer, el generador se cierra en el siguiente elemento.
+    """
+    loop = asyncio.get_running_loop()
+    items = asyncio.Queue()
+    stop = threading.Event()
+
+    def produce():
+        try:
+            iterator = make_iterator()
+            try:
+                for item in iterator:
+                    if stop.is_set():
+                        break  # El cliente se desconectó
+                    loop.call_soon_threadsafe(items.put_nowait, ('event', item))
+            finally:
+                iterator.close()
+        except Exception as e:
+            loop.call_soon_threadsafe(items.put_nowait, ('error', e))
+        else:
+            loop.call_soon_threadsafe(items.put_nowait, ('end', None))
+
+    threading.Thread(target=produce, daemon=True, name='stream').start()
+    try:
+        while True:
+            kind, payload = await items.get()
+            if kind == 'event':
+                yield payload
+            elif kind == 'end':
+                return
+            else:
+                raise payload
+    finally:
+        stop.set()
+
+def cache_stats():
+    return {
+        'lexical': cli.analysis_cache.stats(),
+        'listing': listing_cache.stats(),
+        'output': output_cache.stats()
+    }
+
+def merge_cache_stats(all_stats):
+    """
+    Suma los contadores de las cachés de varios procesos
+    """
+    merged = {}
+    for stats in all_stats:
+        for name, counters in stats.items():
+            total = merged.setdefault(name, dict.fromkeys(counters, 0))
+            for key, value in counters.items():
+                total[key] += value
+    for counters in merged.values():
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = counters['hits'] / lookups if lookups else 0.0
+    return merged
+
+class LocalRunner:
+    """
+    Ejecuta las operaciones en el propio proceso del servidor
+    """
+
+    def call(self, session_id, operation, *args):
+        return OPERATIONS[operation](get_session(session_id), *args)
+
+    def stream(self, session_id, operation, *args):
+        return OPERATIONS[operation](get_session(session_id), *args)
+
+    async def call_async(self, session_id, operation, *args):
+        if operation in ASYNC_OPERATIONS:
+            return await ASYNC_OPERATIONS[operation](get_session(session_id), *args)
+        return await asyncio.to_thread(self.call, session_id, operation, *args)
+
+    def stream_async(self, session_id, operation, *args):
+        return iterate_in_thread(lambda: self.stream(session_id, operation, *args))
+
+    def cache_stats(self):
+        return cache_stats()
+
+# ---------------------------------------------------------------------------
+# Proceso de trabajo
+# ---------------------------------------------------------------------------
+
+def _memory_usage():
+    """
+    Memoria residente del proceso en bytes
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # Sin /proc: el máximo alcanzado (en kilobytes en Linux, bytes en macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 if resource else 0
+
+def _process_info(session):
+    # Estado que el frontal guarda de la sesión y datos para decidir si se recicla el proceso
+    info = {'memory': _memory_usage(), 'jobs': jobs.manager.active_count()}
+    if session is not None:
+        info['cwd'] = session.cwd
+        info['env'] = session.env
+        info['session_jobs'] = bool(jobs.manager.list(session.id))
+    return info
+
+def _sendable(exception):
+    # La excepción tiene que poder reconstruirse en el frontal
+    try:
+        multiprocessing.reduction.ForkingPickler.dumps(exception)
+        return exception
+    except Exception:
+        return WorkerError(str(exception))
+
+def _handle(send, message, closed):
+    request_id, operation, session_id, state, args = message
+    session = None
+    try:
+        if operation == 'cache_stats':
+            result = cache_stats()
+        else:
+            session = get_session(session_id, *state) if state else get_session(session_id)
+            result = OPERATIONS[operation](session, *args)
+        if inspect.isgenerator(result):
+            stop = closed.setdefault(request_id, threading.Event())
+            try:
+                for item in result:
+                    if stop.is_set():
+                        break  # El cliente se desconectó
+                    send((request_id, 'event', item, None))
+            finally:
+                result.close()
+                closed.pop(request_id, None)
+            send((request_id, 'end', None, _process_info(session)))
+        else:
+            send((request_id, 'result', result, _process_info(session)))
+    except Exception as e:
+        send((request_id, 'error', _sendable(e), _process_info(session)))
+
+def _worker_main(connection, memory_limit):
+    """
+    Bucle del proceso de trabajo: recibe (id, operación, sesión, estado,
+    argumentos) y contesta (id, tipo, datos, info). None pide terminar
+    después de atender lo pendiente.
+    """
+    # Ctrl-C en el terminal del servidor lo gestiona el frontal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if resource is not None and memory_limit:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard == resource.RLIM_INFINITY or memory_limit < hard:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            try:
+                connection.send(message)
+            except Exception as e:
+                connection.send((message[0], 'error', WorkerError(str(e)), message[3]))
+
+    closed = {}  # id de la petición -> Event para cortar su streaming
+    executor = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix='request')
+    retiring = False
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            break  # El frontal ya no existe
+        if message is None:
+            retiring = True
+            break
+        request_id, operation = message[:2]
+        if operation == 'close':
+            closed.setdefault(request_id, threading.Event()).set()
+        elif operation in INLINE_OPERATIONS:
+            _handle(send, message, closed)
+        else:
+            executor.submit(_handle, send, message, closed)
+    # Al reciclarse termina lo que está en curso; si el frontal desapareció, no hay a quién responder
+    executor.shutdown(wait=retiring)
+    connection.close()
+
+# ---------------------------------------------------------------------------
+# Frontal
+# ---------------------------------------------------------------------------
+
+# Cada proceso de trabajo arrancado recibe un número distinto
+_generations = itertools.count(1)
+
+def _settle(future, kind, payload):
+    # call_async cancela el Future si se cancela la corrutina que lo espera
+    try:
+        if kind == 'error':
+            future.set_exception(payload)
+        else:
+            future.set_result(payload)
+    except InvalidStateError:
+        pass
+
+class Worker:
+    """
+    Un proceso de trabajo visto desde el frontal: conexión, peticiones
+    pendientes y contadores para reciclarlo
+    """
+
+    def __init__(self, pool, slot, context):
+        self.pool = pool
+        self.slot = slot
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, WORKER_MEMORY_LIMIT), daemon=True,
+                                       name=f'terminal-worker-{slot}')
+        self.process.start()
+        child.close()
+        self.generation = next(_generations)
+        self.lock = threading.Lock()
+        self.pending = {}  # id -> (id de sesión, Future o Queue)
+        self.requests = 0
+        self.alive = True
+        self.retiring = False
+        self.reader = threading.Thread(target=self._read, daemon=True, name=f'terminal-worker-{slot}-reader')
+        self.reader.start()
+
+    def send(self, request_id, operation, session_id, state, args, waiter):
+        with self.lock:
+            if not self.alive:
+                raise WorkerError("Error: El proceso de trabajo no está disponible")
+            self.pending[request_id] = (session_id, waiter)
+            try:
+                self.connection.send((request_id, operation, session_id, state, args))
+            except OSError:
+                # El proceso murió y el lector aún no lo ha visto
+                del self.pending[request_id]
+                self.alive = False
+                raise WorkerError("Error: El proceso de trabajo no está disponible")
+
+    def close_stream(self, request_id):
+        with self.lock:
+            if self.alive and self.pending.pop(request_id, None) is not None:
+                try:
+                    self.connection.send((request_id, 'close', None, None, ()))
+                except OSError:
+                    pass  # El proceso ya no existe
+
+    def retire(self):
+        """
+        Deja de recibir peticiones; el proceso termina cuando acaba las que tiene
+        """
+        with self.lock:
+            self.retiring = True
+            if self.alive:
+                try:
+                    self.connection.send(None)
+                except OSError:
+                    pass
+
+    def kill(self):
+        """
+        Termina el proceso sin esperar a que acabe (no responde). El lector
+        falla sus peticiones pendientes al ver cerrada la conexión.
+        """
+        with self.lock:
+            self.retiring = True
+        self.process.kill()
+
+    def _read(self):
+        while True:
+            try:
+                request_id, kind, payload, info = self.connection.recv()
+            except (EOFError, OSError):
+                break
+            with self.lock:
+                session_id, waiter = self.pending.get(request_id, (None, None))
+                if kind != 'event':
+                    self.pending.pop(request_id, None)
+            if kind != 'event' and info is not None:
+                self.pool._finished(self, session_id, info)
+            if waiter is None:
+                continue  # Streaming cancelado por el cliente
+            if isinstance(waiter, Future):
+                _settle(waiter, kind, payload)
+            else:
+                waiter.put((kind, payload))
+
+        with self.lock:
+            self.alive = False
+            pending = list(self.pending.values())
+            self.pending.clear()
+        error = WorkerError("Error: El proceso de trabajo terminó inesperadamente")
+        for _, waiter in pending:
+            if isinstance(waiter, Future):
+                _settle(waiter, 'error', error)
+            else:
+                waiter.put(('error', error))
+        self.connection.close()
+        self.process.join()
+
+
+class WorkerPool:
+    """
+    Procesos de trabajo con afinidad por sesión. Los procesos se crean al
+    llegar la primera petición de su posición y se sustituyen al fallar, al
+    llegar a max_requests o al superar max_memory (si no tienen trabajos en
+    segundo plano en curso).
+    """
+
+    def __init__(self, size, max_requests=MAX_REQUESTS_PER_WORKER, max_memory=MAX_WORKER_MEMORY):
+        self.size = size
+        self.max_requests = max_requests
+        self.max_memory = max_memory
+        self.workers = [None] * size
+        self.lock = threading.Lock()
+        # id de sesión -> (cwd, entorno, último uso, generation del proceso con sus trabajos o None)
+        self.states = {}
+        self._ids = itertools.count(1)
+        self._context = None
+
+    def _get_context(self):
+        if self._context is None:
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                self._context = multiprocessing.get_context('forkserver')
+                self._context.set_forkserver_preload(PRELOAD)
+            else:
+                self._context = multiprocessing.get_context('spawn')
+        return self._context
+
+    def _worker(self, session_id):
+        slot = zlib.crc32(session_id.encode('utf-8')) % self.size
+        with self.lock:
+            worker = self.workers[slot]
+            if worker is None or not worker.alive or worker.retiring:
+                worker = Worker(self, slot, self._get_context())
+                self.workers[slot] = worker
+            return worker
+
+    def _state(self, session_id):
+        with self.lock:
+            state = self.states.get(session_id)
+        return state[:2] if state else None
+
+    def _finished(self, worker, session_id, info):
+        """
+        Guarda el estado de la sesión y recicla el proceso si hace falta
+        """
+        now = time.monotonic()
+        with self.lock:
+            if session_id is not None and 'cwd' in info:
+                if session_id not in self.states:
+                    expired = [sid for sid, state in self.states.items()
+                               if now - state[2] > SESSION_IDLE_TIMEOUT]
+                    for sid in expired:
+                        del self.states[sid]
+                jobs_generation = worker.generation if info['session_jobs'] else \
+                    self.states.get(session_id, (None, None, None, None))[3]
+                self.states[session_id] = (info['cwd'], info['env'], now, jobs_generation)
+            worker.requests += 1
+            recycle = (worker.requests >= self.max_requests or info['memory'] > self.max_memory) \
+                and info['jobs'] == 0 and not worker.retiring and self.workers[worker.slot] is worker
+            if recycle:
+                self.workers[worker.slot] = None
+        if recycle:
+            worker.retire()
+
+    def _check_jobs(self, worker, session_id, operation, args):
+        """
+        Los trabajos viven en el proceso que los lanzó: si se ha sustituido, el
+        nuevo no los conoce y respondería que no existen
+        """
+        if not _uses_jobs(operation, args):
+            return
+        with self.lock:
+            state = self.states.get(session_id)
+        if state is not None and state[3] is not None and state[3] != worker.generation:
+            raise WorkerError("Error: Los trabajos de la sesión se perdieron al reiniciarse su proceso de trabajo")
+
+    def _send(self, session_id, operation, args, waiter):
+        request_id = next(self._ids)
+        for attempt in range(2):
+            worker = self._worker(session_id)
+            self._check_jobs(worker, session_id, operation, args)
+            try:
+                worker.send(request_id, operation, session_id, self._state(session_id), args, waiter)
+                return worker, request_id
+            except WorkerError:
+                # El proceso murió justo ahora: otro intento con uno nuevo
+                if attempt:
+                    raise
+
+    def _recycle(self, worker, timeout):
+        """
+        Sustituye un proceso que no ha respondido a tiempo
+        """
+        with self.lock:
+            if self.workers[worker.slot] is worker:
+                self.workers[worker.slot] = None
+        worker.kill()
+        return WorkerError(f"Error: Sin respuesta del proceso de trabajo en {timeout:g} s; se ha reiniciado")
+
+    def call(self, session_id, operation, *args):
+        future = Future()
+        worker, _ = self._send(session_id, operation, args, future)
+        timeout = request_timeout(operation, args)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            raise self._recycle(worker, timeout)
+
+    async def call_async(self, session_id, operation, *args):
+        future = Future()
+        # _send puede arrancar el proceso de trabajo: fuera del event loop
+        worker, _ = await asyncio.to_thread(self._send, session_id, operation, args, future)
+        timeout = request_timeout(operation, args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            raise self._recycle(worker, timeout)
+
+    def stream(self, session_id, operation, *args):
+        events = queue.Queue()
+        worker, request_id = self._send(session_id, operation, args, events)
+        finished = False
+        try:
+            while True:
+                kind, payload = events.get()
+                if kind == 'event':
+                    yield payload
+                elif kind == 'end':
+                    finished = True
+                    return
+                else:
+                    finished = True
+                    raise payload
+        finally:
+            if not finished:
+                worker.close_stream(request_id)
+
+    def stream_async(self, session_id, operation, *args):
+        return iterate_in_thread(lambda: self.stream(session_id, operation, *args))
+
+    def cache_stats(self):
+        """
+        Contadores de las cachés sumados entre los procesos en marcha
+        """
+        with self.lock:
+            workers = [worker for worker in self.workers if worker is not None and worker.alive]
+        futures = []
+        for worker in workers:
+            future = Future()
+            try:
+                worker.send(next(self._ids), 'cache_stats', None, None, (), future)
+            except WorkerError:
+                continue
+            futures.append(future)
+        all_stats = []
+        for future in futures:
+            try:
+                all_stats.append(future.result())
+            except WorkerError:
+                pass
+        return merge_cache_stats(all_stats) if all_stats else cache_stats()
+
+    def shutdown(self):
+        with self.lock:
+            workers = [worker for worker in self.workers if worker is not None]
+            self.workers = [None] * self.size
+        for worker in workers:
+            worker.retire()
+
+
+def create_runner(workers=WORKERS):
+    """
+    WorkerPool con `workers` procesos o, con 0, ejecución en el propio proceso
+    """
+    return WorkerPool(workers) if workers > 0 else LocalRunner()
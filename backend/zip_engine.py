@@ -0,0 +1,370 @@
+import fnmatch
+import os
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Escritor de archivos ZIP que comprime en paralelo. Cada archivo se divide en
+# bloques que se comprimen por separado en un pool de hilos (zlib libera el GIL)
+# y se escriben en orden: los bloques intermedios terminan con Z_SYNC_FLUSH y el
+# último con Z_FINISH, así que su concatenación es un único flujo deflate válido
+# (la misma técnica que pigz).
+
+# Tamaño de los bloques que se comprimen de forma independiente
+CHUNK_SIZE = 1024 * 1024
+
+# Nivel de compresión por defecto (0 = sin compresión, 9 = máxima)
+DEFAULT_LEVEL = 6
+
+# Extensiones de formatos ya comprimidos: se guardan sin volver a comprimirlos
+STORED_EXTENSIONS = {
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.txz', '.zst', '.lz4', '.7z', '.rar', '.br',
+    '.jar', '.war', '.apk', '.whl', '.docx', '.xlsx', '.pptx', '.odt', '.ods',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.avif',
+    '.mp3', '.ogg', '.flac', '.aac', '.m4a', '.mp4', '.mkv', '.avi', '.mov', '.webm',
+}
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# Límites a partir de los cuales hacen falta las extensiones ZIP64
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_COUNT_LIMIT = 0xFFFF
+
+# source: ruta en disco (None para directorios); arcname: nombre dentro del zip
+ZipSource = namedtuple('ZipSource', ['path', 'arcname', 'is_dir', 'size', 'mtime', 'mode'])
+
+# Avance: archivos y bytes (sin comprimir) procesados sobre el total
+Progress = namedtuple('Progress', ['files_done', 'files_total', 'bytes_done', 'bytes_total', 'current'])
+
+def collect_sources(path, recursive=False, exclude=()):
+    """
+    Entradas a comprimir para `path`: el archivo, o con recursive el directorio
+    completo con nombres relativos a su directorio padre (como zip -r)
+    """
+    exclude = {os.path.abspath(p) for p in exclude}
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    if not os.path.isdir(path):
+        return [ZipSource(path, os.path.basename(path), False, st.st_size, st.st_mtime, st.st_mode)]
+    if not recursive:
+        raise IsADirectoryError(path)
+
+    base = os.path.dirname(path)
+    sources = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        st = os.stat(root)
+        sources.append(ZipSource(None, os.path.relpath(root, base).replace(os.sep, '/') + '/', True,
+                                 0, st.st_mtime, st.st_mode))
+        for name in sorted(files):
+            full_path = os.path.join(root, name)
+            if full_path in exclude or os.path.islink(full_path) and not os.path.exists(full_path):
+                continue
+            st = os.stat(full_path)
+            sources.append(ZipSource(full_path, os.path.relpath(full_path, base).replace(os.sep, '/'),
+                                     False, st.st_size, st.st_mtime, st.st_mode))
+    return sources
+
+def _dos_datetime(timestamp):
+    t = time.localtime(timestamp)
+    year = max(t.tm_year, 1980)
+    return ((t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+            ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday)
+
+def _compress(data, level, final):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+def _chunks(source):
+    """
+    Bloques del archivo; siempre al menos uno (vacío si el archivo está vacío)
+    """
+    with open(source.path, 'rb') as f:
+        data = f.read(CHUNK_SIZE)
+        while True:
+            following = f.read(CHUNK_SIZE) if data else b''
+            yield data, not following
+            if not following:
+                return
+            data = following
+
+class _Entry:
+    def __init__(self, source, method, offset, zip64):
+        self.source = source
+        self.name = source.arcname.encode('utf-8')
+        self.method = method
+        self.offset = offset
+        self.zip64 = zip64
+        self.crc = 0
+        self.compressed_size = 0
+        self.size = 0
+
+class ZipWriter:
+    """
+    Escribe el zip entrada por entrada: cabecera local, datos comprimidos en
+    paralelo y, al cerrar, el directorio central (con ZIP64 si hace falta)
+    """
+
+    def __init__(self, path, level=DEFAULT_LEVEL, workers=None):
+        self.level = level
+        self.workers = workers or os.cpu_count() or 1
+        self._file = open(path, 'wb')
+        self._entries = []
+
+    def _method_for(self, source):
+        if source.is_dir or self.level == 0:
+            return ZIP_STORED
+        if os.path.splitext(source.arcname)[1].lower() in STORED_EXTENSIONS:
+            return ZIP_STORED
+        return ZIP_DEFLATED
+
+    def _write_local_header(self, entry):
+        dostime, dosdate = _dos_datetime(entry.source.mtime)
+        extra = struct.pack('<HHQQ', 0x0001, 16, 0, 0) if entry.zip64 else b''
+        self._file.write(struct.pack(
+            '<IHHHHHIIIHH', 0x04034b50, 45 if entry.zip64 else 20, 0x800, entry.method,
+            dostime, dosdate, 0, ZIP64_LIMIT if entry.zip64 else 0, ZIP64_LIMIT if entry.zip64 else 0,
+            len(entry.name), len(extra)))
+        self._file.write(entry.name)
+        self._file.write(extra)
+
+    def _finish_entry(self, entry):
+        """
+        Completa la cabecera local con el CRC y los tamaños ya conocidos
+        """
+        end = self._file.tell()
+        self._file.seek(entry.offset + 14)
+        if entry.zip64:
+            self._file.write(struct.pack('<I', entry.crc))
+            self._file.seek(entry.offset + 30 + len(entry.name) + 4)
+            self._file.write(struct.pack('<QQ', entry.size, entry.compressed_size))
+        else:
+            self._file.write(struct.pack('<III', entry.crc, entry.compressed_size, entry.size))
+        self._file.seek(end)
+
+    def _start_entry(self, source):
+        # El tamaño comprimido puede superar ligeramente al original: margen para decidir ZIP64
+        zip64 = source.size + source.size // 100 + 1024 >= ZIP64_LIMIT
+        entry = _Entry(source, self._method_for(source), self._file.tell(), zip64)
+        self._write_local_header(entry)
+        self._entries.append(entry)
+        return entry
+
+    def write_all(self, sources):
+        """
+        Comprime y escribe las entradas en orden. Es un generador que produce un
+        Progress cada vez que termina una entrada.
+        """
+        files_total = len(sources)
+        bytes_total = sum(source.size for source in sources)
+        bytes_done = 0
+        # Bloques en vuelo: limita la memoria a unos pocos bloques por hilo
+        window = self.workers * 4
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            def tasks():
+                for index, source in enumerate(sources):
+                    if source.is_dir:
+                        yield index, source, None, b'', True
+                        continue
+                    method = self._method_for(source)
+                    for data, final in _chunks(source):
+                        future = pool.submit(_compress, data, self.level, final) if method == ZIP_DEFLATED else None
+                        yield index, source, future, data, final
+
+            entry = None
+            files_done = 0
+            for task in tasks():
+                pending.append(task)
+                while len(pending) >= window:
+                    entry, files_done, bytes_done = self._drain(pending.popleft(), entry, files_done, bytes_done)
+                    if entry is None:
+                        yield Progress(files_done, files_total, bytes_done, bytes_total, sources[files_done - 1].arcname)
+            while pending:
+                entry, files_done, bytes_done = self._drain(pending.popleft(), entry, files_done, bytes_done)
+                if entry is None:
+                    yield Progress(files_done, files_total, bytes_done, bytes_total, sources[files_done - 1].arcname)
+
+    def _drain(self, task, entry, files_done, bytes_done):
+        """
+        Escribe un bloque ya comprimido; devuelve la entrada en curso (None si
+        el bloque era el último de su archivo) y los contadores actualizados
+        """
+        index, source, future, data, final = task
+        if entry is None:
+            entry = self._start_entry(source)
+        output = future.result() if future is not None else data
+        entry.crc = zlib.crc32(data, entry.crc)
+        entry.size += len(data)
+        entry.compressed_size += len(output)
+        self._file.write(output)
+        bytes_done += len(data)
+        if not final:
+            return entry, files_done, bytes_done
+        if not entry.zip64 and (entry.size >= ZIP64_LIMIT or entry.compressed_size >= ZIP64_LIMIT):
+            raise ValueError(f"{source.arcname} ha crecido mientras se comprimía")
+        self._finish_entry(entry)
+        return None, files_done + 1, bytes_done
+
+    def close(self):
+        """
+        Escribe el directorio central y cierra el archivo
+        """
+        central_offset = self._file.tell()
+        for entry in self._entries:
+            self._write_central_header(entry)
+        central_size = self._file.tell() - central_offset
+        count = len(self._entries)
+
+        if count >= ZIP64_COUNT_LIMIT or central_offset >= ZIP64_LIMIT or central_size >= ZIP64_LIMIT:
+            zip64_end = self._file.tell()
+            self._file.write(struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0,
+                                         count, count, central_size, central_offset))
+            self._file.write(struct.pack('<IIQI', 0x07064b50, 0, zip64_end, 1))
+            self._file.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, ZIP64_COUNT_LIMIT, ZIP64_COUNT_LIMIT,
+                                         ZIP64_LIMIT, ZIP64_LIMIT, 0))
+        else:
+            self._file.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, count, count,
+                                         central_size, central_offset, 0))
+        self._file.close()
+
+    def abort(self):
+        self._file.close()
+
+    def _write_central_header(self, entry):
+        dostime, dosdate = _dos_datetime(entry.source.mtime)
+        extra_fields = []
+        size, compressed_size, offset = entry.size, entry.compressed_size, entry.offset
+        if size >= ZIP64_LIMIT or entry.zip64:
+            extra_fields.append(size)
+            size = ZIP64_LIMIT
+        if compressed_size >= ZIP64_LIMIT or entry.zip64:
+            extra_fields.append(compressed_size)
+            compressed_size = ZIP64_LIMIT
+        if offset >= ZIP64_LIMIT:
+            extra_fields.append(offset)
+            offset = ZIP64_LIMIT
+        extra = struct.pack(f'<HH{len(extra_fields)}Q', 0x0001, 8 * len(extra_fields), *extra_fields) if extra_fields else b''
+        version = 45 if extra else 20
+        external_attr = (entry.source.mode & 0xFFFF) << 16
+        if entry.source.is_dir:
+            external_attr |= 0x10  # Atributo de directorio de MS-DOS
+        self._file.write(struct.pack(
+            '<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | version, version, 0x800, entry.method,
+            dostime, dosdate, entry.crc, compressed_size, size, len(entry.name), len(extra), 0,
+            0, 0, external_attr, offset))
+        self._file.write(entry.name)
+        self._file.write(extra)
+
+def create_zip(zip_path, sources, level=DEFAULT_LEVEL, workers=None):
+    """
+    Crea `zip_path` con las entradas `sources` (ver collect_sources). Es un
+    generador de Progress; para ejecutarlo sin más basta con recorrerlo.
+    """
+    writer = ZipWriter(zip_path, level, workers)
+    try:
+        yield from writer.write_all(sources)
+    except BaseException:
+        writer.abort()
+        try:
+            os.remove(zip_path)
+        except OSError:
+            pass
+        raise
+    writer.close()
+
+
+# ---------------------------------------------------------------------------
+# Extracción
+# ---------------------------------------------------------------------------
+
+def list_members(zip_path):
+    """
+    Entradas del zip leídas sólo del directorio central (no descomprime nada)
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        return zf.infolist()
+
+def format_listing(members):
+    """
+    Listado al estilo de `unzip -l`
+    """
+    lines = ["  Length      Date    Time    Name",
+             "---------  ---------- -----   ----"]
+    total = 0
+    for info in members:
+        year, month, day, hour, minute, _ = info.date_time
+        lines.append(f"{info.file_size:9d}  {year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}   {info.filename}")
+        total += info.file_size
+    lines.append("---------                     -------")
+    lines.append(f"{total:9d}                     {len(members)} archivo(s)")
+    return "\n".join(lines)
+
+def select_members(members, patterns):
+    """
+    Entradas cuyo nombre coincide con alguno de los patrones glob (todas si no hay patrones)
+    """
+    if not patterns:
+        return list(members)
+    return [info for info in members
+            if any(fnmatch.fnmatchcase(info.filename, pattern) for pattern in patterns)]
+
+def _target_path(dest, filename):
+    """
+    Ruta de destino de una entrada, saneada igual que ZipFile.extract
+    (sin unidades, sin rutas absolutas y sin componentes '..')
+    """
+    parts = [part for part in filename.replace('\\', '/').split('/')
+             if part not in ('', '.', '..')]
+    if parts:
+        parts[0] = os.path.splitdrive(parts[0])[1]
+    return os.path.join(dest, *parts)
+
+def extract_members(zip_path, dest, members, workers=None):
+    """
+    Extrae `members` en `dest` con varios hilos; cada hilo abre su propio
+    ZipFile, así que los miembros se leen y descomprimen en paralelo. Es un
+    generador que produce un Progress por cada archivo extraído.
+    """
+    workers = workers or os.cpu_count() or 1
+    files = [info for info in members if not info.is_dir()]
+    # Los directorios se crean antes, en un solo hilo, para que los hilos no compitan por ellos
+    for info in members:
+        target = _target_path(dest, info.filename)
+        os.makedirs(target if info.is_dir() else os.path.dirname(target), exist_ok=True)
+
+    local = threading.local()
+    opened = []
+    opened_lock = threading.Lock()
+
+    def extract(info):
+        zf = getattr(local, 'zipfile', None)
+        if zf is None:
+            zf = local.zipfile = zipfile.ZipFile(zip_path)
+            with opened_lock:
+                opened.append(zf)
+        zf.extract(info, dest)
+        return info
+
+    bytes_total = sum(info.file_size for info in files)
+    bytes_done = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(extract, info) for info in files]
+            try:
+                for files_done, future in enumerate(as_completed(futures), start=1):
+                    info = future.result()
+                    bytes_done += info.file_size
+                    yield Progress(files_done, len(files), bytes_done, bytes_total, info.filename)
+            finally:
+                for future in futures:
+                    future.cancel()
+    finally:
+        for zf in opened:
+            zf.close()
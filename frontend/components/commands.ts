@@ -1,15 +1,16 @@
 // commands.ts
+// Generado automáticamente con `python backend/commands.py`. No editar a mano.
 export type Command = {
   id: string
   description: string
   example: string
-  category: string  // Añadimos la categoría como nueva propiedad
+  category: string
   isExpanded?: boolean
   popupExpanded?: boolean
 }
 
 export const commands: Command[] = [
-  // Comandos de ayuda y sistema
+  // Sistema
   {
       id: "help",
       description: "Muestra la lista completa de comandos disponibles con sus descripciones.",
@@ -18,6 +19,14 @@ export const commands: Command[] = [
       isExpanded: false,
       popupExpanded: false
   },
+  {
+      id: "history",
+      description: "Muestra el historial de comandos ejecutados en la sesión actual. Opciones: N (últimos N), -p PÁGINA, -s TEXTO (buscar), --prefix TEXTO, -c (borrar).",
+      example: "history -s cd",
+      category: "system",
+      isExpanded: false,
+      popupExpanded: false
+  },
   {
       id: "clear",
       description: "Limpia la pantalla del terminal.",
@@ -27,27 +36,42 @@ export const commands: Command[] = [
       popupExpanded: false
   },
   {
-      id: "history",
-      description: "Muestra el historial de comandos ejecutados en la sesión actual.",
-      example: "history",
+      id: "jobs",
+      description: "Muestra los trabajos lanzados en segundo plano (comando &) con su estado y código de salida. Opciones: --json.",
+      example: "jobs",
       category: "system",
       isExpanded: false,
       popupExpanded: false
   },
-
-  // Comandos de navegación y listado
   {
-      id: "pwd",
-      description: "Muestra la ruta del directorio actual de trabajo.",
-      example: "pwd",
-      category: "navigation",
+      id: "fg",
+      description: "Trae al primer plano un trabajo lanzado con &: muestra su salida y espera a que termine. Sin número, el último trabajo lanzado.",
+      example: "fg 1",
+      category: "system",
       isExpanded: false,
       popupExpanded: false
   },
+  {
+      id: "kill",
+      description: "Termina trabajos lanzados en segundo plano (comando &) y los procesos que hayan iniciado.",
+      example: "kill %1",
+      category: "system",
+      isExpanded: false,
+      popupExpanded: false
+  },
+  // Navegación
   {
       id: "ls",
-      description: "Lista archivos y directorios en el directorio actual.",
-      example: "ls",
+      description: "Lista archivos y directorios. Opciones: -l (detalle), -a (ocultos), -R (recursivo), -S/-t/-X o --sort=name|size|time|extension (orden), -r (invertir), --json.",
+      example: "ls -la",
+      category: "navigation",
+      isExpanded: false,
+      popupExpanded: false
+  },
+  {
+      id: "pwd",
+      description: "Muestra la ruta del directorio actual de trabajo.",
+      example: "pwd",
       category: "navigation",
       isExpanded: false,
       popupExpanded: false
@@ -60,20 +84,19 @@ export const commands: Command[] = [
       isExpanded: false,
       popupExpanded: false
   },
-
-  // Comandos de manipulación de archivos
+  // Archivos
   {
-      id: "cat",
-      description: "Muestra el contenido de un archivo de texto.",
-      example: "cat archivo.txt",
+      id: "echo",
+      description: "Muestra texto en la terminal.",
+      example: "echo \"Hola Mundo\"",
       category: "file",
       isExpanded: false,
       popupExpanded: false
   },
   {
-      id: "echo",
-      description: "Muestra texto en la terminal.",
-      example: 'echo "Hola Mundo"',
+      id: "cat",
+      description: "Muestra el contenido de un archivo de texto. Opciones: --head N (-n N), --tail N, --offset BYTES, --length BYTES, --from TOKEN (continuar una lectura cortada).",
+      example: "cat archivo.txt",
       category: "file",
       isExpanded: false,
       popupExpanded: false
@@ -88,7 +111,7 @@ export const commands: Command[] = [
   },
   {
       id: "rm",
-      description: "Elimina archivos o directorios. Usa -r para directorios y -f para forzar la eliminación.",
+      description: "Elimina archivos o directorios (admite varios y patrones como *.log). Usa -r para directorios y -f para forzar la eliminación.",
       example: "rm archivo.txt | rm -rf directorio",
       category: "file",
       isExpanded: false,
@@ -96,7 +119,7 @@ export const commands: Command[] = [
   },
   {
       id: "mv",
-      description: "Mueve o renombra archivos y directorios.",
+      description: "Mueve o renombra archivos y directorios. Con varios orígenes (o patrones como *.txt) el destino debe ser un directorio; -n no sobrescribe archivos existentes.",
       example: "mv origen.txt destino.txt",
       category: "file",
       isExpanded: false,
@@ -104,43 +127,41 @@ export const commands: Command[] = [
   },
   {
       id: "cp",
-      description: "Copia archivos y directorios. Usa -r para copiar directorios de forma recursiva.",
+      description: "Copia archivos y directorios. Usa -r para copiar directorios de forma recursiva, --progress para ver el avance y --resume para continuar una copia interrumpida (omite los archivos con el mismo tamaño y fecha).",
       example: "cp archivo1.txt archivo2.txt | cp -r dir1 dir2",
       category: "file",
       isExpanded: false,
       popupExpanded: false
   },
-
-  // Comandos de compresión
+  // Compresión
   {
-      id: "zip",
-      description: "Comprime archivos en formato ZIP. Usa -r para comprimir directorios de forma recursiva.",
-      example: "zip archivo.zip archivo.txt | zip -r archivo.zip directorio",
+      id: "unzip",
+      description: "Extrae archivos de un archivo ZIP. Opcionalmente especifica un directorio de destino con -d, los archivos a extraer con patrones (*.txt) o lista el contenido con -l.",
+      example: "unzip archivo.zip -d directorio_destino",
       category: "compression",
       isExpanded: false,
       popupExpanded: false
   },
   {
-      id: "unzip",
-      description: "Extrae archivos de un archivo ZIP. Opcionalmente especifica un directorio de destino con -d.",
-      example: "unzip archivo.zip -d directorio_destino",
+      id: "zip",
+      description: "Comprime archivos en formato ZIP. Usa -r para comprimir directorios de forma recursiva y -0 a -9 para elegir el nivel de compresión.",
+      example: "zip archivo.zip archivo.txt | zip -r9 archivo.zip directorio",
       category: "compression",
       isExpanded: false,
       popupExpanded: false
   },
-
-  // Comandos de red
+  // Red
   {
       id: "ping",
-      description: "Verifica la conectividad con un servidor mediante paquetes ICMP.",
-      example: "ping google.com",
+      description: "Verifica la conectividad con uno o varios servidores a la vez mediante paquetes ICMP y muestra pérdidas y rtt min/avg/max de cada uno según van terminando. Opciones: -c número, -W espera, -i intervalo (segundos), --json.",
+      example: "ping google.com github.com",
       category: "network",
       isExpanded: false,
       popupExpanded: false
   },
   {
       id: "ipconfig",
-      description: "Muestra la configuración de red del sistema (usa 'ip addr' en sistemas Unix).",
+      description: "Muestra las interfaces de red con sus direcciones IPv4/IPv6, MTU, estado y contadores de tráfico. Acepta el nombre de una interfaz y --json.",
       example: "ipconfig",
       category: "network",
       isExpanded: false,
@@ -148,7 +169,7 @@ export const commands: Command[] = [
   },
   {
       id: "netstat",
-      description: "Muestra información de conexiones de red activas y puertos en escucha.",
+      description: "Muestra las conexiones de red activas y los puertos en escucha con el PID y el programa de cada socket. Opciones: -t (TCP), -u (UDP), -l (solo en escucha), -a (todos los estados), --state=ESTADO[,...], --port=N y --json.",
       example: "netstat -an",
       category: "network",
       isExpanded: false,
@@ -156,7 +177,7 @@ export const commands: Command[] = [
   },
   {
       id: "dig",
-      description: "Realiza búsquedas DNS. Soporta diferentes tipos de registros (A, MX, NS, TXT).",
+      description: "Realiza búsquedas DNS. Soporta diferentes tipos de registros (A, AAAA, MX, NS, TXT, SOA), varios dominios y tipos a la vez, @servidor, -p puerto, +tcp, +short y --json.",
       example: "dig google.com A",
       category: "network",
       isExpanded: false,
@@ -171,4 +192,4 @@ export const commandCategories = {
   file: "Archivos",
   compression: "Compresión",
   network: "Red"
-}
\ No newline at end of file
+}
@@ -30,9 +30,11 @@ type Command = {
 }
 
 type TabContent = {
+  id?: string
   command: string
   output: string
   timestamp: string
+  directory?: string
 }
 
 type Tab = {
@@ -52,6 +54,20 @@ type OutputLine = {
   text: string
 }
 
+type LexicalToken = {
+  numero: number;
+  valor: string;
+  tipo: string;
+}
+
+// Eventos de /execute/stream (ver streaming.stream_process_command en el backend)
+type StreamEvent =
+  | { event: 'lexical', data: LexicalToken[] }
+  | { event: 'output', data: string }
+  | { event: 'end', data: { cwd: string } }
+
+const STREAM_EVENTS: ReadonlyArray<StreamEvent['event']> = ['lexical', 'output', 'end']
+
 export function Terminal() {
   const [activeTab, setActiveTab] = React.useState("pruebas")
   const [windowsExpanded, setWindowsExpanded] = React.useState(true)
@@ -103,6 +119,17 @@ export function Terminal() {
 
   const [currentDirectory, setCurrentDirectory] = React.useState("")
 
+  // Cada ventana del navegador tiene su propia sesión en el backend (cwd, historial, entorno)
+  const sessionIdRef = useRef<string>('')
+  const getSessionId = () => {
+    if (!sessionIdRef.current) {
+      sessionIdRef.current = sessionStorage.getItem('sessionId')
+        || `${Date.now().toString(36)}${Math.random().toString(36).slice(2)}`
+      sessionStorage.setItem('sessionId', sessionIdRef.current)
+    }
+    return sessionIdRef.current
+  }
+
   const fetchCurrentDirectory = async () => {
     try {
       const response = await fetch('/execute', {
@@ -110,13 +137,13 @@ export function Terminal() {
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ command: 'pwd' }),
+        body: JSON.stringify({ command: 'pwd', session_id: getSessionId() }),
       })
   
       const data = await response.json()
   
       if (response.ok) {
-        setCurrentDirectory(data.execution_result.trim())
+        setCurrentDirectory(data.cwd)
       } else {
         console.error('Error fetching current directory:', data.error)
       }
@@ -125,112 +152,125 @@ export function Terminal() {
     }
   }
 
+  // Búsqueda inversa en el historial (Ctrl-R): texto buscado y cuántas coincidencias se han recorrido
+  const historySearchRef = useRef<{ query: string; page: number } | null>(null)
+
+  const searchHistory = async () => {
+    const search = historySearchRef.current ?? { query: commandInput, page: 0 }
+    try {
+      const params = new URLSearchParams({
+        session_id: getSessionId(),
+        q: search.query,
+        page: String(search.page),
+        page_size: '1',
+      })
+      const response = await fetch(`/history?${params}`)
+      const data = await response.json()
+      if (response.ok && data.entries.length > 0) {
+        setCommandInput(data.entries[0].command)
+        historySearchRef.current = { query: search.query, page: search.page + 1 }
+      }
+    } catch (error) {
+      console.error('Error searching history:', error)
+    }
+  }
+
   // Agregar este estado al inicio del componente Terminal
-  const [lexicalTokens, setLexicalTokens] = useState<Array<{
-    numero: number;
-    valor: string;
-    tipo: string;
-  }>>([]);
+  const [lexicalTokens, setLexicalTokens] = useState<LexicalToken[]>([]);
+
+  // Lee una respuesta Server-Sent Events y llama a onEvent por cada evento conocido
+  const readEventStream = async (response: Response, onEvent: (event: StreamEvent) => void) => {
+    const reader = response.body!.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+      let boundary = buffer.indexOf('\n\n')
+      while (boundary !== -1) {
+        const rawEvent = buffer.slice(0, boundary)
+        buffer = buffer.slice(boundary + 2)
+        let event = 'message'
+        let data = ''
+        for (const line of rawEvent.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7)
+          else if (line.startsWith('data: ')) data += line.slice(6)
+        }
+        if (data && (STREAM_EVENTS as ReadonlyArray<string>).includes(event)) {
+          onEvent({ event, data: JSON.parse(data) } as StreamEvent)
+        }
+        boundary = buffer.indexOf('\n\n')
+      }
+    }
+  }
+
+  const updateTabContent = (tabId: string, update: (content: TabContent[]) => TabContent[]) => {
+    setTabs(prevTabs =>
+      prevTabs.map(tab =>
+        tab.id === tabId
+          ? { ...tab, content: update(tab.content) }
+          : tab
+      )
+    )
+  }
 
   const addCommand = async (tabId: string, command: string) => {
     const newCommandEntry = { command, output: '', timestamp: new Date().toISOString(), directory: currentDirectory }
+    // La salida llega por fragmentos: se agrega una entrada vacía que se va completando
+    const outputEntryId = `${Date.now()}-${Math.random().toString(36).slice(2)}`
+    const outputEntry = (output: string) => ({
+      id: outputEntryId,
+      command: '',
+      output,
+      timestamp: new Date().toISOString(),
+      directory: currentDirectory
+    })
+    const appendOutput = (text: string) => {
+      updateTabContent(tabId, content =>
+        content.some(entry => entry.id === outputEntryId)
+          ? content.map(entry =>
+              entry.id === outputEntryId
+                ? { ...entry, output: entry.output ? `${entry.output}\n${text}` : text }
+                : entry
+            )
+          : [...content, newCommandEntry, outputEntry(text)]
+      )
+    }
   
     try {
-      const response = await fetch('/execute', {
+      const response = await fetch('/execute/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ command }),
+        body: JSON.stringify({ command, session_id: getSessionId() }),
       })
   
-      const data = await response.json()
-  
       if (response.ok) {
-        const resultOutput = data.execution_result // Cambiado de data.output a data.execution_result
-        // Guardar los tokens del análisis léxico
-        setLexicalTokens(data.lexical_analysis || []);
-        
-        if (resultOutput === "CLEAR_SCREEN") {
-          setTabs(prevTabs =>
-            prevTabs.map(tab =>
-              tab.id === tabId
-                ? { ...tab, content: [] }
-                : tab
-            )
-          )
-        } else {
-          // Asegurarse de que resultOutput sea una cadena antes de usar split
-          const formattedOutput = typeof resultOutput === 'string' 
-            ? resultOutput 
-            : JSON.stringify(resultOutput)
-  
-          setTabs(prevTabs =>
-            prevTabs.map(tab =>
-              tab.id === tabId
-                ? {
-                    ...tab,
-                    content: [
-                      ...tab.content,
-                      newCommandEntry,
-                      { 
-                        command: '', 
-                        output: formattedOutput, 
-                        timestamp: new Date().toISOString(), 
-                        directory: currentDirectory 
-                      }
-                    ],
-                  }
-                : tab
-            )
-          )
-          
-          // Actualizar el directorio actual si el comando es 'cd'
-          if (command.startsWith('cd ')) {
-            await fetchCurrentDirectory()
+        updateTabContent(tabId, content => [...content, newCommandEntry, outputEntry('')])
+        await readEventStream(response, message => {
+          if (message.event === 'lexical') {
+            // Guardar los tokens del análisis léxico
+            setLexicalTokens(message.data)
+          } else if (message.event === 'output') {
+            if (message.data === "CLEAR_SCREEN") {
+              updateTabContent(tabId, () => [])
+            } else {
+              // Asegurarse de que la salida sea una cadena
+              appendOutput(typeof message.data === 'string' ? message.data : JSON.stringify(message.data))
+            }
+          } else if (message.event === 'end') {
+            // El backend informa el cwd al terminar: no hace falta pedir 'pwd' tras un 'cd'
+            if (message.data.cwd) setCurrentDirectory(message.data.cwd)
           }
-        }
+        })
       } else {
-        setTabs(prevTabs =>
-          prevTabs.map(tab =>
-            tab.id === tabId
-              ? {
-                  ...tab,
-                  content: [
-                    ...tab.content,
-                    newCommandEntry,
-                    { 
-                      command: '', 
-                      output: `Error: ${data.error}`, 
-                      timestamp: new Date().toISOString(), 
-                      directory: currentDirectory 
-                    }
-                  ],
-                }
-              : tab
-          )
-        )
+        const data = await response.json()
+        appendOutput(`Error: ${data.error}`)
       }
     } catch (error) {
-      setTabs(prevTabs =>
-        prevTabs.map(tab =>
-          tab.id === tabId
-            ? {
-                ...tab,
-                content: [
-                  ...tab.content,
-                  newCommandEntry,
-                  { 
-                    command: '', 
-                    output: `Error: ${(error as Error).message}`, 
-                    timestamp: new Date().toISOString(), 
-                    directory: currentDirectory 
-                  }
-                ],
-              }
-            : tab
-        )
-      )
+      appendOutput(`Error: ${(error as Error).message}`)
     }
   
     setCommandInput('')
@@ -403,13 +443,21 @@ export function Terminal() {
                 type="text"
                 value={commandInput}
                 onChange={(e) => {
+                  historySearchRef.current = null
                   setCommandInput(e.target.value)
                   setShowSuggestions(e.target.value.length > 0)
                 }}
                 className="flex-1 bg-transparent font-mono outline-none"
                 placeholder="Escribe un comando..."
+                onKeyDown={(e) => {
+                  if (e.ctrlKey && e.key === 'r') {
+                    e.preventDefault()
+                    searchHistory()
+                  }
+                }}
                 onKeyPress={(e) => {
                   if (e.key === 'Enter') {
+                    historySearchRef.current = null
                     addCommand(activeTab, commandInput)
                     setCommandInput('')
                     setShowSuggestions(false)
@@ -9,6 +9,18 @@ const nextConfig = {
           destination: 'http://localhost:5000/execute', // Asume que Flask está corriendo en el puerto 5000
           // destination: '/analyze', // Esto sigue apuntando a la ruta del backend
         },
+        {
+          source: '/execute/:path*',
+          destination: 'http://localhost:5000/execute/:path*', // /execute/stream y demás variantes
+        },
+        {
+          source: '/history',
+          destination: 'http://localhost:5000/history',
+        },
+        {
+          source: '/file',
+          destination: 'http://localhost:5000/file',
+        },
       ]
     },
     // Asegúrate de que el output sea 'standalone' para Vercel